@@ -4,16 +4,55 @@
 Uso: python +KOTA.py [comando] [argumentos]
 """
 
-import json
 import time
-import math
-import random
 import os
 import sys
-from datetime import datetime
+
+# Para la fase "importar" de las trazas (kota/traza.py)
+_INICIO = time.perf_counter()
+
+from kota import motor, perezoso, traza
+
+# Módulos perezosos: se ejecutan al usar el primer atributo, así que los
+# comandos que no tocan el guardado (ayuda, completar) no los pagan
+json = perezoso.modulo("json")
+io = perezoso.modulo("io")
+re = perezoso.modulo("re")
+select = perezoso.modulo("select")
+shlex = perezoso.modulo("shlex")
+shutil = perezoso.modulo("shutil")
+contextlib = perezoso.modulo("contextlib")
+almacen = perezoso.modulo("kota.almacen")
+balance = perezoso.modulo("kota.balance")
+binario = perezoso.modulo("kota.binario")
+cerrojo = perezoso.modulo("kota.cerrojo")
+daemon = perezoso.modulo("kota.daemon")
+dibujo = perezoso.modulo("kota.dibujo")
+estadisticas = perezoso.modulo("kota.estadisticas")
+fusion = perezoso.modulo("kota.fusion")
+historial = perezoso.modulo("kota.historial")
+juegos = perezoso.modulo("kota.juegos")
+monitor = perezoso.modulo("kota.monitor")
+pantalla = perezoso.modulo("kota.pantalla")
+simulacion = perezoso.modulo("kota.simulacion")
+snapshot = perezoso.modulo("kota.snapshot")
+subprocess = perezoso.modulo("subprocess")
+vigilancia = perezoso.modulo("kota.vigilancia")
 
 # --- CONFIGURACIÓN ---
 FILE_DATA = "mascota_savegame.json"
+# "json": reescribe el guardado completo en cada cambio.
+# "diario": añade solo los cambios a mascota_savegame.diario y compacta de vez en cuando.
+# "binario": guardado compacto en mascota_savegame.kota (ver kota/binario.py).
+# "sqlite": mascota_savegame.db, con todo el historial indexado por tiempo.
+# Ver kota/almacen.py.
+ALMACEN = os.environ.get("KOTA_ALMACEN", "json")
+# Modo flota (kota fleet ...): muchas mascotas en un archivo por columnas
+FILE_FLOTA = os.environ.get("KOTA_FLOTA", "mascotas_flota.bin")
+# kota historial: eventos que se listan por serie (el recuento es de todos)
+HISTORIAL_LINEAS = 10
+# kota stats: subidas de nivel que se listan (las últimas)
+STATS_NIVELES = 5
 
 # Colores ANSI
 class Color:
@@ -28,101 +67,122 @@ class Color:
     WHITE = '\033[97m'
     GRAY = '\033[90m'
 
-# --- CATÁLOGO DE TIENDA (MODIFICADO) ---
-TIENDA_ITEMS = {
-    "comidas": {
-        "manzana": {"precio": 5, "hambre": 30, "tipo": "comun", "emoji": "🍎"},
-        "pizza": {"precio": 15, "hambre": 60, "tipo": "chatarra", "emoji": "🍕"},
-        "ensalada": {"precio": 12, "hambre": 45, "tipo": "saludable", "emoji": "🥗"},
-        "sushi": {"precio": 25, "hambre": 80, "tipo": "premium", "emoji": "🍣"},
-        "dulce": {"precio": 8, "hambre": 20, "tipo": "chatarra", "emoji": "🍬"},
-    },
-    "pociones": {
-        "energia_menor": {"precio": 20, "energia": 40, "emoji": "⚡"},
-        "energia_mayor": {"precio": 40, "energia": 80, "emoji": "🔋"},
-        "anti_estres": {"precio": 35, "estres": -50, "emoji": "😌"},
-        # MODIFICADO: full_revive ya no da afecto, solo restaura necesidades físicas
-        "full_revive": {"precio": 100, "hambre": 100, "energia": 100, "estres": -100, "emoji": "💊"},
-        # NUEVO ITEM: Crio-Cápsula
-        "crio_capsula": {"precio": 100, "emoji": "❄️", "desc": "Congela el estado de tu mascota"}
-    },
-    "accesorios": {
-        "sombrero": {"precio": 50, "emoji": "🎩", "tipo": "cabeza"},
-        "gafas": {"precio": 40, "emoji": "🕶️", "tipo": "cara"},
-        "corbata": {"precio": 35, "emoji": "👔", "tipo": "cuello"},
-        "corona": {"precio": 80, "emoji": "👑", "tipo": "cabeza"},
-        "bufanda": {"precio": 45, "emoji": "🧣", "tipo": "cuello"},
-    }
+# Catálogo de la tienda: es parte de las reglas (kota/motor.py)
+TIENDA_ITEMS = motor.TIENDA_ITEMS
+
+# Lo que escribe el usuario -> categoría de TIENDA_ITEMS / inventario
+CATEGORIAS = {
+    "comida": "comidas",
+    "comidas": "comidas",
+    "pocion": "pociones",
+    "pociones": "pociones",
+    "poción": "pociones", # Por si acaso alguien usa tildes
+    "pocíon": "pociones",
+    "accesorio": "accesorios",
+    "accesorios": "accesorios",
 }
 
-class GeoPet:
-    def __init__(self):
-        self.data = {
-            "nombre": "Ente",
-            "hambre": 100.0,
-            "energia": 100.0,
-            "afecto": 50.0,
-            "ultima_conexion": time.time(),
-            "estado_dormido": False,
-            "congelado": False,  # NUEVO ESTADO
-            "maltrato_acumulado": 0,
-            "juegos_stats": {"rps": 0, "tictactoe": 0, "pares": 0, "adivina": 0},
-            "ia_memory": {
-                "rps_history": [],
-                "par_non_bias": 0
-            },
-            "status": "vivo",
-            "personalidad": {
-                "alimentacion_frecuencia": 0,
-                "privacion_sueno": 0,
-                "juego_favorito": "neutral",
-                "hambre_critica_count": 0,
-                "sobrealimentacion": 0,
-                "maltrato_psicologico": 0,
-                "amor_recibido": 0,
-                "estres": 0,
-                "comida_chatarra": 0,
-                "comida_saludable": 0,
-                "comida_premium": 0,
-            },
-            "historial": {
-                "alimentaciones": [],
-                "sesiones_juego": [],
-                "ciclos_sueno": [],
-                "paseos": [] 
-            },
-            "nivel": 1,
-            "exp": 0,
-            "exp_max": 100,
-            "monedas": 100,
-            "inventario": {
-                "comidas": {},
-                "pociones": {},
-                "accesorios": {}
-            },
-            "accesorio_equipado": None,
-            "forma_evolucion": "basico",
-        }
-        
+# Cómo se escribe en la terminal cada suceso del motor (ver kota/motor.py);
+# los que no están aquí no se escriben
+TEXTOS = {
+    "compra": "\n{c.GREEN}✅ ¡Compraste {emoji} {nombre}{veces}!{c.RESET}",
+    "comida": "\n{c.GREEN}¡Comió {emoji} {nombre}{veces}!{c.RESET} (Hambre +{hambre})",
+    "pocion": "\n{c.GREEN}🧪 ¡Usaste {emoji} {nombre}{veces}!{c.RESET}",
+    "congelacion": "{c.CYAN}{c.BOLD}❄️ ¡MASCOTA CONGELADA! ❄️{c.RESET}\n"
+                   "{c.GRAY}El tiempo se ha detenido para ella. Usa 'descongelar' para volver.{c.RESET}",
+    "revive": "{c.YELLOW}¡FULL REVIVE! Salud física restaurada.{c.RESET}\n"
+              "{c.GRAY}(Nota: No afecta el afecto){c.RESET}",
+    "descongelacion": "\n{c.GREEN}🔥 ¡Sistema de descongelación activado!{c.RESET}\n{mascota} ha vuelto a la vida.",
+    "renombre": "{c.GREEN}¡Hecho! Ahora se llama {nombre}.{c.RESET}",
+    "paseo": "\n{c.GREEN}🌲 ¡Paseo exitoso! 🌲{c.RESET}",
+    "duerme": "{c.CYAN}Se ha ido a dormir... 💤{c.RESET}",
+    "despierta": "{c.GREEN}Se ha despertado.{c.RESET}",
+    "partida": "\n{c.CYAN}{c.BOLD}{titulo}{c.RESET}\n",
+    "gana": "¡GANASTE!",
+    "pierde": "Perdiste...",
+    "empate": "¡EMPATE!",
+    "nivel": "\n{c.YELLOW}{c.BOLD}✨ ¡NIVEL SUBIDO! ✨{c.RESET}\n"
+             "{c.GREEN}{mascota} ahora es nivel {nivel}!{c.RESET}\n"
+             "{c.CYAN}+{bonus} monedas de bonificación!{c.RESET}\n",
+    "evolucion": "\n{c.MAGENTA}{c.BOLD}🌟 ¡EVOLUCIÓN! 🌟{c.RESET}\n"
+                 "{c.CYAN}{mascota} ha evolucionado a forma {forma_mayus}!{c.RESET}\n",
+}
+CARICIAS = {
+    "rechaza": "{c.RED}Se aparta. No quiere que lo toques.{c.RESET}",
+    "tolera": "{c.CYAN}Se deja hacer, pero no parece emocionado.{c.RESET}",
+    "encanta": "{c.MAGENTA}¡Le encanta!{c.RESET}",
+}
+RECHAZOS = {
+    "congelado": "\n{c.CYAN}❄️ {mascota} está en criostasis.{c.RESET}\n"
+                 "Usa el comando {c.BOLD}descongelar{c.RESET} para despertarlo.",
+    "dormido": "{c.YELLOW}Shh... está durmiendo.{c.RESET}",
+    "debil": "{c.RED}Está demasiado débil para salir.{c.RESET}",
+    "cansado": "{c.RED}Está demasiado cansado para jugar.{c.RESET}",
+    "desvelado": "{c.YELLOW}Tiene demasiada energía para dormir.{c.RESET}",
+    "sin_monedas": "{c.RED}¡No tienes suficientes monedas!{c.RESET}",
+    "sin_item": "{c.RED}No tienes {nombre}.{c.RESET}",
+    "no_existe": "{c.RED}No hay '{nombre}' en {categoria}.{c.RESET}",
+    "no_congelado": "{c.YELLOW}La mascota no está congelada.{c.RESET}",
+}
+
+class GeoPet(motor.Motor):
+    """La mascota de la terminal: las reglas de Motor, más disco y pantalla."""
+
+    def __init__(self, procesar=True, escritura=True):
+        # Los comandos marcan sus cambios y main() escribe una sola vez al final.
+        # Con escritura=False (comandos de solo lectura) no se prepara la línea
+        # base del almacén (el diff del diario).
+        super().__init__(motor.nuevo())
+        self.escritura = escritura
+        # Estado tal como se cargó (tras aplicar el tiempo); ver guardar_datos
+        self.base = None
         self.cargar_datos()
-        
-        # Si está congelado, actualizamos el tiempo pero no las stats
-        if self.data.get("congelado", False):
-            self.data["ultima_conexion"] = time.time()
-            self.guardar_datos()
+        if procesar:
+            # Si está congelado, el tiempo no cuenta: no hay nada que procesar ni
+            # guardar (descongelar reinicia el reloj)
+            self.avanzar()
+        # Lo que cambie a partir de aquí es lo que aporta este proceso si otro
+        # guarda antes que él (ver guardar_datos)
+        self.base = fusion.copiar(self.data) if escritura else None
+
+    def emitir(self, suceso, **datos):
+        super().emitir(suceso, **datos)
+        if suceso == "rechazo":
+            texto = RECHAZOS[datos["motivo"]]
+        elif suceso == "caricia":
+            texto = CARICIAS[datos["reaccion"]]
         else:
-            self.procesar_tiempo_offline()
-            
-        self.actualizar_personalidad()
+            texto = TEXTOS.get(suceso)
+        if texto is None:
+            return
+        categoria = {"comida": "comidas", "pocion": "pociones"}.get(suceso, datos.get("categoria"))
+        emoji = TIENDA_ITEMS.get(categoria, {}).get(datos.get("nombre"), {}).get("emoji", "")
+        veces = f" x{datos['cantidad']}" if datos.get("cantidad", 1) > 1 else ""
+        print(texto.format(c=Color, mascota=self.data["nombre"], emoji=emoji, veces=veces,
+                           forma_mayus=str(datos.get("forma", "")).upper(), **datos))
+
+    def partida(self):
+        return juegos.Partida(self.data, self.rng, Color, input, print)
+
+    @traza.medir("procesar")
+    def avanzar(self, ahora=None):
+        # El motor no sabe de trazas: la fase se mide aquí
+        super().avanzar(ahora)
 
     # ==========================================================
     # PERSISTENCIA
     # ==========================================================
+    @traza.medir("cargar")
     def cargar_datos(self):
-        if os.path.exists(FILE_DATA):
+        # Cerrojo compartido: nadie está a mitad de guardar mientras se lee. El
+        # backend se busca ya dentro: otro proceso puede estar migrándolo
+        with cerrojo.Cerrojo(FILE_DATA, compartido=True) as c:
+            self.generacion = c.generacion()
+            # Se carga de donde esté el guardado; se guarda con el de KOTA_ALMACEN
+            self.origen = almacen.detectar(FILE_DATA, ALMACEN)
             try:
-                with open(FILE_DATA, 'r') as f:
-                    cargar = json.load(f)
+                self.origen, cargar = almacen.abrir(FILE_DATA, ALMACEN)
+                if cargar is not None:
                     for key in self.data:
                         if key in cargar:
                             if isinstance(self.data[key], dict) and isinstance(cargar[key], dict):
@@ -131,60 +191,67 @@ class GeoPet:
                                 self.data[key] = cargar[key]
             except:
                 print(f"{Color.RED}Error cargando datos. Iniciando nuevo.{Color.RESET}")
+        # Guardados viejos: las listas sin límite pasan al historial acotado
+        migrado = historial.migrar(self.data["historial"])
+        estadisticas.migrar(self.data)
+        if self.origen.nombre == ALMACEN:
+            self.almacen = self.origen
+        else:
+            # Otro backend: el primer guardado lo escribe completo en el nuevo
+            self.almacen = almacen.crear(ALMACEN, FILE_DATA)
+        if self.escritura:
+            self.almacen.preparar(self.data, self.origen.seq, migrado)
 
-    def guardar_datos(self):
-        self.data["ultima_conexion"] = time.time()
-        with open(FILE_DATA, 'w') as f:
-            json.dump(self.data, f, indent=4)
-
-    def procesar_tiempo_offline(self):
-        # Si está congelado, no procesar nada
-        if self.data.get("congelado", False):
-            return
-
-        # --- AJUSTE DE TIEMPO A 24 HORAS ---
-        ahora = time.time()
-        delta = ahora - self.data["ultima_conexion"]
-        horas = delta / 3600
+    def confirmar(self):
+        """Escribe el guardado si el comando cambió algo. Se llama una vez, al final."""
+        if self.cambios:
+            self.guardar_datos()
 
-        if horas < 0.02:
-            return
+    @traza.medir("guardar")
+    def guardar_datos(self):
+        self.cambios = False
+        with cerrojo.Cerrojo(FILE_DATA) as c:
+            if c.generacion() != self.generacion:
+                # Otro proceso guardó desde que cargamos: se fusiona en vez de pisarlo
+                cerrojo.ESTADISTICAS["conflictos"] += 1
+                self.fusionar_disco()
+            self.data["ultima_conexion"] = time.time()
+            self.generacion = c.avanzar()
+            self.escribir_guardado()
+        if self.escritura:
+            self.base = fusion.copiar(self.data)
+        daemon.notificar()
 
-        if self.data["estado_dormido"]:
-            decay_hambre = horas * 0.5
-            self.data["energia"] += horas * 50.0
-            self.data["personalidad"]["privacion_sueno"] -= horas * 5
-        else:
-            decay_hambre = horas * 4.2
-            self.data["energia"] -= horas * 4.2
-            self.data["personalidad"]["privacion_sueno"] += horas * 1
+    def fusionar_disco(self):
+        """Aplica lo que cambió este proceso (desde self.base) sobre el guardado actual."""
+        disco = GeoPet(procesar=False, escritura=False)
+        if self.base is not None:
+            self.data = fusion.fusionar(self.base, self.data, disco.data)
+            self.limitar_valores()
+        # Lo siguiente que se escriba va contra lo que hay en disco
+        self.almacen.marcar(disco.data, disco.origen.seq)
 
-        self.data["hambre"] -= decay_hambre
-        
-        hora_actual = datetime.now().hour
-        if 0 <= hora_actual <= 6 and not self.data["estado_dormido"]:
-            if self.data["energia"] < 15:
-                self.data["afecto"] -= 5
-                self.data["maltrato_acumulado"] += 5
-        
-        self.check_limites()
+    def escribir_guardado(self):
+        self.almacen.guardar(self.data)
+        # El guardado vive en un solo backend
+        almacen.limpiar(self.almacen)
 
-    def check_limites(self):
-        self.data["hambre"] = max(0, min(100, self.data["hambre"]))
-        self.data["energia"] = max(0, min(100, self.data["energia"]))
-        self.data["afecto"] = max(-100, min(100, self.data["afecto"]))
-        
-        for key in ["privacion_sueno", "estres", "maltrato_psicologico"]:
-            if key in self.data["personalidad"]:
-                self.data["personalidad"][key] = max(0, min(100, 
-                    self.data["personalidad"][key]))
+    def eventos(self, serie, desde=None, hasta=None):
+        """Eventos guardados de `serie` con desde <= t < hasta (todos con sqlite)."""
+        return self.origen.eventos(self.data["historial"], serie, desde, hasta)
 
-        if self.data["afecto"] < -90 or self.data["maltrato_acumulado"] > 300:
-            self.escapar()
+    def proyectar(self, ahora=None):
+        """Datos que tendría la mascota en `ahora`, sin tocar self.data ni el disco."""
+        # El decaimiento solo toca escalares y personalidad: no hace falta copiar el historial
+        vista = motor.Motor(dict(self.data))
+        vista.data["personalidad"] = dict(self.data["personalidad"])
+        vista.procesar_tiempo_offline(ahora, simular=True)
+        vista.actualizar_personalidad()
+        return vista.data
 
     def escapar(self):
-        self.data["status"] = "escapado"
-        self.guardar_datos()
+        super().escapar()
+        self.confirmar()
         self.mostrar_abandono()
         sys.exit(1)
 
@@ -196,82 +263,9 @@ class GeoPet:
         print(f"{Color.GRAY} 'No puedo seguir así. Me voy.' - +KOTA{Color.RESET}\n")
         print(f"{Color.CYAN}Usa 'python +KOTA.py reset' para empezar de nuevo.{Color.RESET}\n")
 
-    # ==========================================================
-    # SISTEMA DE NIVELES Y EXPERIENCIA
-    # ==========================================================
-    def ganar_exp(self, cantidad):
-        if self.data.get("congelado", False): return 
-        
-        self.data["exp"] += cantidad
-        while self.data["exp"] >= self.data["exp_max"]:
-            self.data["exp"] -= self.data["exp_max"]
-            self.data["nivel"] += 1
-            self.data["exp_max"] = int(self.data["exp_max"] * 1.5)
-            print(f"\n{Color.YELLOW}{Color.BOLD}✨ ¡NIVEL SUBIDO! ✨{Color.RESET}")
-            print(f"{Color.GREEN}{self.data['nombre']} ahora es nivel {self.data['nivel']}!{Color.RESET}")
-            monedas_bonus = self.data["nivel"] * 20
-            self.data["monedas"] += monedas_bonus
-            print(f"{Color.CYAN}+{monedas_bonus} monedas de bonificación!{Color.RESET}\n")
-            self.data["energia"] = min(100, self.data["energia"] + 20)
-            self.data["hambre"] = min(100, self.data["hambre"] + 20)
-        self.determinar_evolucion()
-
-    def determinar_evolucion(self):
-        # ... (Mantener lógica de evolución igual)
-        p = self.data["personalidad"]
-        puntos = {"atletico": 0, "intelectual": 0, "premium": 0, "rebelde": 0}
-        
-        if len(self.data["historial"].get("paseos", [])) > 10: puntos["atletico"] += 30
-        if p.get("comida_saludable", 0) > 15: puntos["atletico"] += 25
-        if self.data["energia"] > 70: puntos["atletico"] += 15
-        
-        juegos_mentales = self.data["juegos_stats"].get("tictactoe", 0) + self.data["juegos_stats"].get("adivina", 0)
-        if juegos_mentales > 15: puntos["intelectual"] += 40
-        if p.get("comida_chatarra", 0) < 5: puntos["intelectual"] += 20
-        if self.data["afecto"] > 60: puntos["intelectual"] += 15
-        
-        if p.get("comida_premium", 0) > 10: puntos["premium"] += 40
-        if self.data["afecto"] > 80: puntos["premium"] += 25
-        if self.data["accesorio_equipado"]: puntos["premium"] += 20
-        
-        if p.get("comida_chatarra", 0) > 20: puntos["rebelde"] += 35
-        if p.get("privacion_sueno", 0) > 40: puntos["rebelde"] += 25
-        if self.data["afecto"] < 20: puntos["rebelde"] += 30
-        
-        forma_anterior = self.data["forma_evolucion"]
-        
-        if self.data["nivel"] < 5:
-            self.data["forma_evolucion"] = "basico"
-        else:
-            max_puntos = max(puntos.values())
-            if max_puntos > 50:
-                self.data["forma_evolucion"] = max(puntos, key=puntos.get)
-            else:
-                self.data["forma_evolucion"] = "basico"
-        
-        if forma_anterior != self.data["forma_evolucion"] and self.data["nivel"] >= 5:
-            print(f"\n{Color.MAGENTA}{Color.BOLD}🌟 ¡EVOLUCIÓN! 🌟{Color.RESET}")
-            print(f"{Color.CYAN}{self.data['nombre']} ha evolucionado a forma {self.data['forma_evolucion'].upper()}!{Color.RESET}\n")
-
     # ==========================================================
     # VISUALES
     # ==========================================================
-    def actualizar_personalidad(self):
-        p = self.data["personalidad"]
-        estres = 0
-        if self.data["hambre"] < 30: estres += 30
-        if self.data["energia"] < 30: estres += 20
-        if self.data["afecto"] < 0: estres += 30
-        estres += p["privacion_sueno"]
-        estres += p["maltrato_psicologico"] * 5
-        p["estres"] = min(100, estres)
-        
-        stats = self.data["juegos_stats"]
-        if sum(stats.values()) > 5:
-            p["juego_favorito"] = max(stats, key=stats.get)
-        if self.data["hambre"] < 20:
-            p["hambre_critica_count"] += 0.01
-
     def get_forma_ascii(self):
         forma_map = {
             "basico": "circle", "atletico": "triangle",
@@ -310,20 +304,13 @@ class GeoPet:
         else: return "enojado"
 
     def get_cara_ascii(self, expresion):
-        caras = {
-            "dormido": ("─   ─", "Z z z"), "feliz": ("‾ ‾", "^ ^"),
-            "contento": ("‾ ‾", "• •"), "neutral": ("─ ─", "• •"),
-            "triste": ("╲ ╱", "• •"), "enojado": ("╲ ╱", "◉ ◉"),
-            "cansado": ("_ _", "- -"), "hambriento": ("╱ ╲", "O O"),
-            "estresado": ("╲ ╱", "◎ ◎"), "congelado": ("❄️ ❄️", " ─ ") # Cara congelada
-        }
-        return caras.get(expresion, ("─ ─", "• •"))
+        return dibujo.CARAS.get(expresion, dibujo.CARA_NEUTRAL)
 
     def dibujar(self):
-        forma = self.get_forma_ascii()
-        color = self.get_color_ascii()
-        expresion = self.get_expresion()
-        
+        print("\n" + "\n".join(self.sprite()) + "\n")
+
+    def sprite(self):
+        """Líneas de la figura; se construye una vez por combinación (kota/dibujo.py)."""
         accesorio = ""
         if self.data["accesorio_equipado"]:
             item_data = TIENDA_ITEMS["accesorios"].get(self.data["accesorio_equipado"])
@@ -332,30 +319,7 @@ class GeoPet:
         if self.data.get("congelado", False):
             accesorio += " ❄️"
         
-        print(f"\n{color}{Color.BOLD}", end="")
-        if forma == "triangle": self.dibujar_triangulo(expresion, accesorio)
-        elif forma == "square": self.dibujar_cuadrado(expresion, accesorio)
-        elif forma == "pentagon": self.dibujar_pentagono(expresion, accesorio)
-        elif forma == "hexagon": self.dibujar_hexagono(expresion, accesorio)
-        else: self.dibujar_circulo(expresion, accesorio)
-        print(Color.RESET)
-
-    # ... (Métodos de dibujo geométrico se mantienen iguales, omitidos por brevedad)
-    def dibujar_triangulo(self, e, acc):
-        c, o = self.get_cara_ascii(e)
-        print(f"        △ {acc}\n       ╱ ╲\n      ╱{c}╲\n     ╱ {o} ╲\n    ╱       ╲\n   ╱─────────╲")
-    def dibujar_cuadrado(self, e, acc):
-        c, o = self.get_cara_ascii(e)
-        print(f"   ┌─────────┐ {acc}\n   │         │\n   │  {c}  │\n   │  {o}  │\n   │         │\n   └─────────┘")
-    def dibujar_pentagono(self, e, acc):
-        c, o = self.get_cara_ascii(e)
-        print(f"      ╱‾‾‾╲ {acc}\n     ╱     ╲\n    │  {c}  │\n    │  {o}  │\n     ╲     ╱\n      ╲___╱")
-    def dibujar_hexagono(self, e, acc):
-        c, o = self.get_cara_ascii(e)
-        print(f"     ╱‾‾‾‾‾╲ {acc}\n    ╱       ╲\n   │   {c}   │\n   │   {o}   │\n    ╲       ╱\n     ╲_____╱")
-    def dibujar_circulo(self, e, acc):
-        c, o = self.get_cara_ascii(e)
-        print(f"     ╭─────╮ {acc}\n    ╱       ╲\n   │   {c}   │\n   │   {o}   │\n    ╲       ╱\n     ╰─────╯")
+        return dibujo.sprite(self.get_forma_ascii(), self.get_expresion(), accesorio, self.get_color_ascii())
 
     # ==========================================================
     # TIENDA E INVENTARIO
@@ -397,30 +361,29 @@ class GeoPet:
                 if opcion == "0": break
                 idx = int(opcion) - 1
                 if 0 <= idx < len(lista_items):
-                    nombre_item = lista_items[idx]
-                    self.comprar_item(categoria, nombre_item, items[nombre_item])
+                    comprado = self.comprar(categoria, lista_items[idx])
+                    time.sleep(1 if comprado else 2)
             except: pass
 
-    def comprar_item(self, categoria, nombre, item_data):
-        precio = item_data["precio"]
-        if self.data["monedas"] < precio:
-            print(f"{Color.RED}¡No tienes suficientes monedas!{Color.RESET}")
-            time.sleep(2)
-            return
-        
-        self.data["monedas"] -= precio
-        if nombre not in self.data["inventario"][categoria]:
-            self.data["inventario"][categoria][nombre] = 0
-        self.data["inventario"][categoria][nombre] += 1
-        
-        emoji = item_data.get("emoji", "")
-        print(f"\n{Color.GREEN}✅ ¡Compraste {emoji} {nombre}!{Color.RESET}")
-        self.guardar_datos()
-        time.sleep(1)
-
     # ==========================================================
     # USO DE ITEMS
     # ==========================================================
+    def mostrar_inventario(self):
+        """Lo que hay en el inventario, por categoría (sin menús: sirve en el shell y el lote)."""
+        hay = False
+        for categoria, items in self.data["inventario"].items():
+            lista = [(n, c) for n, c in items.items() if c > 0]
+            if not lista:
+                continue
+            hay = True
+            print(f"{Color.CYAN}{categoria.capitalize()}:{Color.RESET}")
+            for nombre, cant in lista:
+                emoji = TIENDA_ITEMS.get(categoria, {}).get(nombre, {}).get("emoji", "?")
+                equipado = " (equipado)" if nombre == self.data["accesorio_equipado"] else ""
+                print(f"  {emoji} {nombre.capitalize()} x{cant}{equipado}")
+        if not hay:
+            print(f"{Color.GRAY}El inventario está vacío. Pasa por la tienda.{Color.RESET}")
+
     def usar_item(self, categoria):
         if self.check_congelado(): return
         if self.data["estado_dormido"]:
@@ -448,116 +411,69 @@ class GeoPet:
             
             if 0 <= idx < len(lista):
                 nombre, _ = lista[idx]
-                item = catalogo_cat[nombre]
-                
-                self.data["inventario"][categoria][nombre] -= 1
-
-                if categoria == "comidas":
-                    self._usar_comida_efecto(nombre, item)
-                elif categoria == "pociones":
-                    self._usar_pocion_efecto(nombre, item)
-
-                if nombre != "crio_capsula": # Congelar no da XP inmediata
-                    self.ganar_exp(15)
-                
-                self.actualizar_personalidad()
-                self.check_limites()
-                self.determinar_evolucion()
-                self.guardar_datos()
+                self._consumir_item(categoria, nombre)
                 self.mostrar_estado()
         except ValueError: pass
 
-    def _usar_comida_efecto(self, nombre, item):
-        self.data["hambre"] += item["hambre"]
-        self.data["afecto"] += 3
-        tipo = item.get("tipo", "comun")
-        if tipo == "chatarra": self.data["personalidad"]["comida_chatarra"] += 1
-        elif tipo == "saludable": self.data["personalidad"]["comida_saludable"] += 1
-        elif tipo == "premium": self.data["personalidad"]["comida_premium"] += 1
-        self.data["historial"]["alimentaciones"].append(time.time())
-        print(f"\n{Color.GREEN}¡Comió {item['emoji']} {nombre}!{Color.RESET} (Hambre +{item['hambre']})")
-
-    def _usar_pocion_efecto(self, nombre, item):
-        msg = f"\n{Color.GREEN}🧪 ¡Usaste {item['emoji']} {nombre}!{Color.RESET}"
-        
-        if nombre == "crio_capsula":
-            self.data["congelado"] = True
-            msg += f"\n{Color.CYAN}{Color.BOLD}❄️ ¡MASCOTA CONGELADA! ❄️{Color.RESET}"
-            msg += f"\n{Color.GRAY}El tiempo se ha detenido para ella. Usa 'descongelar' para volver.{Color.RESET}"
-        
-        elif nombre == "full_revive":
-            self.data["hambre"] = 100
-            self.data["energia"] = 100
-            self.data["personalidad"]["estres"] = 0
-            self.data["personalidad"]["privacion_sueno"] = 0
-            msg += f"\n{Color.YELLOW}¡FULL REVIVE! Salud física restaurada.{Color.RESET}"
-            msg += f"\n{Color.GRAY}(Nota: No afecta el afecto){Color.RESET}"
-            
-        else:
-            if "energia" in item:
-                self.data["energia"] += item["energia"]
-            if "estres" in item:
-                self.data["personalidad"]["estres"] += item["estres"]
-        
-        print(msg)
-
     # ==========================================================
     # FUNCIONES NUEVAS Y UTILIDADES
     # ==========================================================
-    def check_congelado(self):
-        if self.data.get("congelado", False):
-            print(f"\n{Color.CYAN}❄️ {self.data['nombre']} está en criostasis.{Color.RESET}")
-            print(f"Usa el comando {Color.BOLD}descongelar{Color.RESET} para despertarlo.")
-            return True
-        return False
-
-    def descongelar(self):
-        if not self.data.get("congelado", False):
-            print(f"{Color.YELLOW}La mascota no está congelada.{Color.RESET}")
-            return
-        
-        self.data["congelado"] = False
-        self.data["ultima_conexion"] = time.time() # Reiniciar reloj
-        self.guardar_datos()
-        print(f"\n{Color.GREEN}🔥 ¡Sistema de descongelación activado!{Color.RESET}")
-        print(f"{self.data['nombre']} ha vuelto a la vida.")
-        self.mostrar_estado()
+    def descongelar(self, mostrar=True):
+        if super().descongelar() and mostrar: self.mostrar_estado()
 
     # ==========================================================
     # COMANDOS EXISTENTES (Modificados con check_congelado)
     # ==========================================================
+    @traza.medir("pantalla")
     def mostrar_estado(self):
-        self.limpiar_pantalla()
-        print(f"\n{Color.CYAN}{Color.BOLD}╔═══════════════════════════════════════╗{Color.RESET}")
-        print(f"{Color.CYAN}{Color.BOLD}║       +KOTA  - Estado Actual          ║{Color.RESET}")
-        print(f"{Color.CYAN}{Color.BOLD}╚═══════════════════════════════════════╝{Color.RESET}\n")
-        self.dibujar()
+        # Toda la pantalla, borrado incluido, en una sola escritura
+        if os.name == 'nt':
+            self.limpiar_pantalla()
+            inicio = ""
+        else:
+            inicio = pantalla.BORRAR
+        sys.stdout.write(inicio + "\n".join(self.lineas_estado()) + "\n")
+        sys.stdout.flush()
+
+    def lineas_estado(self):
+        """La pantalla de estado, una línea por elemento (el shell la redibuja por filas)."""
         p = self.data["personalidad"]
+        lineas = [
+            "",
+            f"{Color.CYAN}{Color.BOLD}╔═══════════════════════════════════════╗{Color.RESET}",
+            f"{Color.CYAN}{Color.BOLD}║       +KOTA  - Estado Actual          ║{Color.RESET}",
+            f"{Color.CYAN}{Color.BOLD}╚═══════════════════════════════════════╝{Color.RESET}",
+            "",
+            "",
+        ]
+        lineas += self.sprite()
         
         estado_txt = self.get_estado_texto()
         if self.data.get("congelado", False):
             estado_txt = f"{Color.CYAN}❄️ CONGELADO (Pausado){Color.RESET}"
         
-        print(f"\n{Color.BOLD}Nombre:{Color.RESET} {self.data['nombre']}")
-        print(f"{Color.BOLD}Nivel:{Color.RESET} {self.data['nivel']} | {Color.BOLD}Forma:{Color.RESET} {self.data['forma_evolucion'].upper()}")
-        print(f"{Color.YELLOW}💰 {self.data['monedas']} monedas{Color.RESET}")
-        print(f"{Color.BOLD}Estado:{Color.RESET} {estado_txt}\n")
-        
-        self.dibujar_barra("Hambre", self.data["hambre"], Color.GREEN)
-        self.dibujar_barra("Energía", self.data["energia"], Color.CYAN)
         afecto_norm = (self.data["afecto"] + 100) / 2
-        self.dibujar_barra("Afecto", afecto_norm, Color.MAGENTA)
-        print(f"\n{Color.GRAY}Estrés: {int(p['estres'])}% | Privación Sueño: {int(p['privacion_sueno'])}%{Color.RESET}")
-        
-        hora = datetime.now().strftime("%H:%M:%S")
-        print(f"\n{Color.GRAY}[{hora}]{Color.RESET}")
+        hora = time.strftime("%H:%M:%S")
+        lineas += [
+            "",
+            "",
+            f"{Color.BOLD}Nombre:{Color.RESET} {self.data['nombre']}",
+            f"{Color.BOLD}Nivel:{Color.RESET} {self.data['nivel']} | {Color.BOLD}Forma:{Color.RESET} {self.data['forma_evolucion'].upper()}",
+            f"{Color.YELLOW}💰 {self.data['monedas']} monedas{Color.RESET}",
+            f"{Color.BOLD}Estado:{Color.RESET} {estado_txt}",
+            "",
+            dibujo.barra("Hambre", self.data["hambre"], Color.GREEN),
+            dibujo.barra("Energía", self.data["energia"], Color.CYAN),
+            dibujo.barra("Afecto", afecto_norm, Color.MAGENTA),
+            "",
+            f"{Color.GRAY}Estrés: {int(p['estres'])}% | Privación Sueño: {int(p['privacion_sueno'])}%{Color.RESET}",
+            "",
+            f"{Color.GRAY}[{hora}]{Color.RESET}",
+        ]
+        return lineas
 
     def dibujar_barra(self, nombre, valor, color):
-        largo_barra = 20
-        lleno = int((valor / 100) * largo_barra)
-        vacio = largo_barra - lleno
-        barra = f"{'█' * lleno}{'░' * vacio}"
-        print(f"{nombre:8} [{color}{barra}{Color.RESET}] {int(valor):3}%")
+        print(dibujo.barra(nombre, valor, color))
 
     def get_estado_texto(self):
         expr = self.get_expresion()
@@ -570,219 +486,870 @@ class GeoPet:
         }
         return estados.get(expr, "Desconocido")
 
-    def renombrar(self, nuevo_nombre):
-        if self.check_congelado(): return
-        self.data["nombre"] = nuevo_nombre
-        self.guardar_datos()
-        print(f"{Color.GREEN}¡Hecho! Ahora se llama {nuevo_nombre}.{Color.RESET}")
+    def equipar_accesorio(self, nombre, mostrar=True):
+        if super().equipar_accesorio(nombre) and mostrar: self.mostrar_estado()
 
-    def acariciar(self):
-        if self.check_congelado(): return
-        if self.data["estado_dormido"]:
-            print(f"{Color.YELLOW}Shh... está durmiendo.{Color.RESET}")
-            return
-        
-        if self.data["afecto"] < -20:
-            print(f"{Color.RED}Se aparta. No quiere que lo toques.{Color.RESET}")
-            self.data["afecto"] += 0.5
-        elif self.data["afecto"] < 20:
-            print(f"{Color.CYAN}Se deja hacer, pero no parece emocionado.{Color.RESET}")
-            self.data["afecto"] += 2
-            self.data["personalidad"]["estres"] -= 2
+    def desequipar_accesorio(self, mostrar=True):
+        if super().desequipar_accesorio() and mostrar: self.mostrar_estado()
+
+    # ==========================================================
+    # INFORMES
+    # ==========================================================
+    @traza.medir("pantalla")
+    def mostrar_stats(self):
+        """Informe de kota stats: solo lee los agregados (kota/estadisticas.py)."""
+        est = self.data["estadisticas"]
+        r = estadisticas.resumen(est)
+        fecha = lambda t: time.strftime("%d/%m/%Y", time.localtime(t))
+        print(f"\n{Color.CYAN}{Color.BOLD}╔═══════════════════════════════════════╗{Color.RESET}")
+        print(f"{Color.CYAN}{Color.BOLD}║       +KOTA  - Estadísticas           ║{Color.RESET}")
+        print(f"{Color.CYAN}{Color.BOLD}╚═══════════════════════════════════════╝{Color.RESET}")
+        print(f"{Color.GRAY}Desde el {fecha(est['desde'])} ({r['dias']:.0f} días){Color.RESET}\n")
+
+        print(f"{Color.BOLD}🍖 Comidas:{Color.RESET} {r['comidas']}")
+        for nombre, n in sorted(est["comidas"].items(), key=lambda x: -x[1]):
+            emoji = TIENDA_ITEMS["comidas"].get(nombre, {}).get("emoji", " ")
+            print(f"   {emoji} {nombre:14} {n:6}   {r['comidas_por_dia'][nombre]:.1f}/día")
+        if est["tipos_comida"]:
+            tipos = ", ".join(f"{t} {n}" for t, n in sorted(est["tipos_comida"].items(), key=lambda x: -x[1]))
+            print(f"   {Color.GRAY}por tipo: {tipos}{Color.RESET}")
+
+        print(f"\n{Color.BOLD}🎮 Partidas:{Color.RESET} {r['partidas']}")
+        for juego, j in sorted(est["juegos"].items(), key=lambda x: -x[1]["partidas"]):
+            print(f"   {juego:16} {j['partidas']:6}   {j['ganadas']} ganadas, {j['empates']} empates")
+
+        print(f"\n{Color.BOLD}🌲 Paseos:{Color.RESET} {r['paseos']}   "
+              f"racha de {r['racha']} días (la mejor, {r['mejor_racha']})")
+
+        sueno = f"\n{Color.BOLD}💤 Sueño:{Color.RESET} {r['ciclos_sueno']} ciclos"
+        if r["ciclos_sueno"]:
+            sueno += f", {r['sueno_medio_h']:.1f} h de media"
+        if r["durmiendo_desde"] is not None:
+            sueno += f" (durmiendo desde las {time.strftime('%H:%M', time.localtime(r['durmiendo_desde']))})"
+        print(sueno)
+
+        print(f"\n{Color.YELLOW}💰 Monedas:{Color.RESET} +{r['monedas_ganadas']} / -{r['monedas_gastadas']}"
+              f"   (ahora {self.data['monedas']})")
+        for titulo, desglose in (("ganadas", est["monedas"]["ganadas"]), ("gastadas", est["monedas"]["gastadas"])):
+            if desglose:
+                partes = ", ".join(f"{m} {n}" for m, n in sorted(desglose.items(), key=lambda x: -x[1]))
+                print(f"   {Color.GRAY}{titulo}: {partes}{Color.RESET}")
+
+        print(f"\n{Color.BOLD}✨ Nivel:{Color.RESET} {self.data['nivel']}")
+        for nivel, t in est["niveles"][-STATS_NIVELES:]:
+            print(f"   nivel {nivel:<4} {fecha(t)}")
+        print()
+
+    @traza.medir("pantalla")
+    def mostrar_historial(self, serie=None, horas=24):
+        """Eventos de las últimas `horas` (consulta por rango de tiempo al almacén)."""
+        desde = time.time() - horas * 3600
+        for nombre in [serie] if serie else historial.SERIES:
+            eventos = self.eventos(nombre, desde)
+            print(f"\n{Color.BOLD}{nombre}{Color.RESET}: {len(eventos)} en las últimas {horas:g} h")
+            for evento in eventos[-HISTORIAL_LINEAS:]:
+                hora = time.strftime("%d/%m %H:%M", time.localtime(historial.marca_tiempo(evento)))
+                detalle = ""
+                if isinstance(evento, dict):
+                    detalle = " ".join(f"{k}={v}" for k, v in evento.items() if k not in ("t", "inicio"))
+                print(f"  {hora}  {detalle}".rstrip())
+        print()
+
+    def limpiar_pantalla(self):
+        if os.name == 'nt':
+            os.system('cls')
         else:
-            print(f"{Color.MAGENTA}¡Le encanta!{Color.RESET}")
-            self.data["afecto"] += 4
-            self.data["personalidad"]["estres"] -= 5
-            self.data["personalidad"]["amor_recibido"] += 1
-        
-        self.ganar_exp(10)
-        self.actualizar_personalidad()
-        self.check_limites()
-        self.guardar_datos()
+            # La secuencia de `clear`, sin lanzar un proceso
+            sys.stdout.write(pantalla.BORRAR)
+            sys.stdout.flush()
 
-    def pasear(self):
-        if self.check_congelado(): return
-        if self.data["estado_dormido"]:
-            print(f"{Color.YELLOW}Está dormido.{Color.RESET}")
-            return
-        if self.data["energia"] < 10 or self.data["hambre"] < 10:
-            print(f"{Color.RED}Está demasiado débil para salir.{Color.RESET}")
-            return
+    def reset(self):
+        reset()
 
-        self.data["energia"] -= 10
-        self.data["hambre"] -= 5
-        self.data["afecto"] += 15
-        self.data["personalidad"]["estres"] -= 25
-        
-        if "paseos" not in self.data["historial"]: self.data["historial"]["paseos"] = []
-        self.data["historial"]["paseos"].append(time.time())
+# ==========================================================
+# RESET
+# ==========================================================
+def reset():
+    if almacen.existe(FILE_DATA):
+        with cerrojo.Cerrojo(FILE_DATA) as c:
+            # Quien tuviera la mascota cargada fusionará sobre la nueva
+            c.avanzar()
+            almacen.borrar(FILE_DATA)
+        daemon.notificar()
+        print(f"{Color.GREEN}+KOTA reiniciado.{Color.RESET}")
+
+# ==========================================================
+# EXPORTAR / IMPORTAR
+# ==========================================================
+def leer_documento():
+    """El guardado tal cual está en disco (sin procesar tiempo ni migrar)."""
+    with cerrojo.Cerrojo(FILE_DATA, compartido=True):
+        return almacen.abrir(FILE_DATA)[1]
 
-        print(f"\n{Color.GREEN}🌲 ¡Paseo exitoso! 🌲{Color.RESET}")
-        self.ganar_exp(25)
-        self.actualizar_personalidad()
-        self.check_limites()
-        self.guardar_datos()
+def exportar(args):
+    # kota export [--json] [archivo]: JSON es el formato de intercambio
+    args = [a for a in args if a != "--json"]
+    data = leer_documento()
+    if data is None:
+        print(f"{Color.RED}No hay ninguna mascota guardada.{Color.RESET}")
+        return
+    if args:
+        with open(args[0], 'w') as f:
+            json.dump(data, f, indent=4)
+        print(f"{Color.GREEN}Exportado a {args[0]}.{Color.RESET}")
+    else:
+        json.dump(data, sys.stdout, indent=4)
+        print()
 
-    def dormir(self):
-        if self.check_congelado(): return
-        if not self.data["estado_dormido"]:
-            if self.data["energia"] > 80:
-                print(f"{Color.YELLOW}Tiene demasiada energía para dormir.{Color.RESET}")
-                return
-            self.data["estado_dormido"] = True
-            self.data["historial"]["ciclos_sueno"].append({
-                "inicio": time.time(),
-                "energia_inicio": self.data["energia"]
-            })
-            print(f"{Color.CYAN}Se ha ido a dormir... 💤{Color.RESET}")
+def importar(args):
+    if not args:
+        print(f"{Color.RED}Especifica el archivo a importar (JSON o .kota).{Color.RESET}")
+        return
+    with open(args[0], 'rb') as f:
+        bloque = f.read()
+    try:
+        if binario.es_binario(bloque):
+            data = binario.decodificar(bloque)
         else:
-            self.data["estado_dormido"] = False
-            print(f"{Color.GREEN}Se ha despertado.{Color.RESET}")
-        self.guardar_datos()
+            data = json.loads(bloque.decode("utf-8"))
+    except (ValueError, binario.FormatoInvalido) as e:
+        print(f"{Color.RED}No se pudo leer {args[0]}: {e}{Color.RESET}")
+        return
 
-    def equipar_accesorio(self, nombre):
-        if self.check_congelado(): return
-        if nombre not in self.data["inventario"]["accesorios"] or self.data["inventario"]["accesorios"][nombre] == 0:
-            print(f"{Color.RED}No tienes ese accesorio.{Color.RESET}")
+    with cerrojo.Cerrojo(FILE_DATA) as c:
+        c.avanzar()
+        # Sin línea base: cada backend escribe el guardado completo
+        destino = almacen.crear(ALMACEN, FILE_DATA)
+        destino.guardar(data)
+        almacen.limpiar(destino)
+    daemon.notificar()
+    print(f"{Color.GREEN}Importado {args[0]}.{Color.RESET}")
+
+# ==========================================================
+# FLOTA
+# ==========================================================
+def mostrar_filas_flota(filas):
+    print(f"{Color.BOLD}{'Nombre':20} {'Hambre':>7} {'Energía':>8} {'Afecto':>7} {'Estrés':>7}  Estado{Color.RESET}")
+    for f in filas:
+        if f["escapado"]: estado = f"{Color.RED}Escapado{Color.RESET}"
+        elif f["congelado"]: estado = f"{Color.CYAN}Congelado{Color.RESET}"
+        elif f["dormido"]: estado = f"{Color.BLUE}Dormido{Color.RESET}"
+        else: estado = f"{Color.GREEN}Activo{Color.RESET}"
+        print(f"{f['nombre'][:20]:20} {int(f['hambre']):>7} {int(f['energia']):>8} "
+              f"{int(f['afecto']):>7} {int(f['estres']):>7}  {estado}")
+
+def ejecutar_flota(args):
+    from kota.flota import COLUMNAS_REALES, Flota, leer_guardado
+
+    sub = args[0].lower() if args else ""
+    flota = Flota.cargar(FILE_FLOTA)
+
+    if sub == "tick":
+        t0 = time.perf_counter()
+        escapadas = flota.tick()
+        dt = time.perf_counter() - t0
+        flota.guardar(FILE_FLOTA)
+        print(f"{Color.GREEN}{len(flota)} mascotas actualizadas en {dt * 1000:.1f} ms.{Color.RESET}")
+        if escapadas:
+            print(f"{Color.RED}{escapadas} se han ido de casa.{Color.RESET}")
+
+    elif sub == "top":
+        campo = args[1].lower() if len(args) > 1 else "estres"
+        n = int(args[2]) if len(args) > 2 and args[2].isdigit() else 10
+        if campo not in COLUMNAS_REALES:
+            print(f"{Color.RED}Campo no válido. Usa: {', '.join(COLUMNAS_REALES)}{Color.RESET}")
             return
-        self.data["accesorio_equipado"] = nombre
-        self.guardar_datos()
-        self.mostrar_estado()
+        # Para hambre/energía/afecto lo preocupante es lo bajo; para el resto, lo alto
+        mayores = campo not in ("hambre", "energia", "afecto")
+        mostrar_filas_flota(flota.top(campo, n, mayores))
 
-    def desequipar_accesorio(self):
-        if self.check_congelado(): return
-        self.data["accesorio_equipado"] = None
-        self.guardar_datos()
-        self.mostrar_estado()
+    elif sub == "ver":
+        if len(args) < 2:
+            print(f"{Color.RED}Especifica el nombre de la mascota.{Color.RESET}")
+            return
+        fila = flota.buscar(args[1])
+        if fila is None:
+            print(f"{Color.RED}No hay ninguna mascota llamada {args[1]} en la flota.{Color.RESET}")
+        else:
+            mostrar_filas_flota([fila])
 
-    # ==========================================================
-    # JUEGOS
-    # ==========================================================
-    def jugar(self, tipo_juego):
-        if self.check_congelado(): return
-        if self.data["estado_dormido"]:
-            print(f"{Color.YELLOW}Está durmiendo...{Color.RESET}")
+    elif sub == "importar":
+        if len(args) < 2:
+            print(f"{Color.RED}Especifica los guardados a importar.{Color.RESET}")
             return
-        if self.data["energia"] < 5:
-            print(f"{Color.RED}Está demasiado cansado para jugar.{Color.RESET}")
+        for ruta in args[1:]:
+            try:
+                data = leer_guardado(ruta)
+            except (OSError, ValueError) as e:
+                print(f"{Color.RED}No se pudo leer {ruta}: {e}{Color.RESET}")
+                continue
+            nombre = flota.agregar(str(data.get("nombre", "Mascota")), data)
+            print(f"{Color.GREEN}+ {nombre}{Color.RESET}")
+        flota.guardar(FILE_FLOTA)
+
+    else:
+        print(f"{Color.CYAN}Uso: fleet tick | fleet top [campo] [n] | fleet ver <nombre> | fleet importar <guardados...>{Color.RESET}")
+
+# ==========================================================
+# BALANCE (kota balance)
+# ==========================================================
+def ejecutar_balance(args):
+    """
+    kota balance [config.json] [--procesos N]: muchas vidas simuladas por
+    política y punto del barrido (kota/balance.py), resumidas en CSV.
+    """
+    procesos = None
+    if "--procesos" in args:
+        i = args.index("--procesos")
+        if i + 1 >= len(args) or not args[i + 1].isdigit() or int(args[i + 1]) < 1:
+            print(f"{Color.RED}Uso: kota balance [config.json] [--procesos N]{Color.RESET}")
             return
-        
-        if tipo_juego == "rps": self.juego_rps()
-        elif tipo_juego == "pares": self.juego_pares()
-        elif tipo_juego == "adivina": self.juego_adivina()
-        elif tipo_juego == "tictactoe": self.juego_tictactoe()
-        else: print(f"{Color.RED}Juego no reconocido.{Color.RESET}")
-
-    def juego_rps(self):
-        print(f"\n{Color.CYAN}{Color.BOLD}✊ Piedra Papel Tijera{Color.RESET}\n")
-        eleccion = input(f"Elige ({Color.GREEN}R{Color.RESET}, {Color.GREEN}P{Color.RESET}, {Color.GREEN}T{Color.RESET}): ").upper()
-        if not eleccion or eleccion[0] not in ['R', 'P', 'T']: return
-        eleccion = eleccion[0]
-        # (Lógica simplificada para brevedad, usando random si no hay historial)
-        prediccion = random.choice(['R', 'P', 'T'])
-        
-        simbolos = {'R': '✊', 'P': '🖐️', 'T': '✌️'}
-        print(f"\nTú: {simbolos[eleccion]}  VS  CPU: {simbolos[prediccion]}")
-        
-        ganador = "empate"
-        if (eleccion == 'R' and prediccion == 'T') or (eleccion == 'P' and prediccion == 'R') or (eleccion == 'T' and prediccion == 'P'):
-            ganador = "usuario"
-        elif eleccion != prediccion:
-            ganador = "ia"
-
-        if ganador == "empate":
-            print("¡EMPATE!")
-            self.data["monedas"] += 5
-        elif ganador == "usuario":
-            print("¡GANASTE!")
-            self.data["afecto"] += 6
-            self.data["monedas"] += 15
-            self.ganar_exp(20)
+        procesos = int(args[i + 1])
+        args = args[:i] + args[i + 2:]
+    try:
+        config = balance.leer(args[0] if args else None)
+    except ValueError as e:
+        print(f"{Color.RED}{e}{Color.RESET}")
+        return
+
+    n = len(balance.puntos(config)) * len(config["politicas"]) * config["vidas"]
+    print(f"{Color.CYAN}{n} vidas de {config['dias']} días{Color.RESET}")
+    t0 = time.perf_counter()
+    grupos = balance.ejecutar(config, procesos,
+                              lambda hechas, total: print(f"\r  {hechas}/{total} lotes", end="", flush=True))
+    print(f"\r  {time.perf_counter() - t0:.1f} s" + " " * 20)
+    resumen = balance.guardar(config, grupos)
+
+    claves = list(config["barrido"])
+    cabecera = "  ".join(claves + [f"{'política':12}", "escapa", "nivel", f"{'forma más común':18}", "monedas"])
+    print(f"\n{Color.BOLD}{cabecera}{Color.RESET}")
+    for fila in resumen:
+        forma = max(balance.FORMAS, key=lambda f: fila["forma_" + f])
+        columnas = [f"{fila[k]!s:>{len(k)}}" for k in claves] + [
+            f"{fila['politica']:12}", f"{fila['escapes']:6.0%}", f"{fila['nivel_p50']:5}",
+            f"{forma:12} {fila['forma_' + forma]:5.0%}", f"{fila['monedas_final_p50']!s:>7}"]
+        print("  ".join(columnas))
+    print(f"\n{Color.GREEN}Resultados en {config['salida']}{Color.RESET}")
+
+# ==========================================================
+# DAEMON
+# ==========================================================
+def firma_guardado():
+    """(mtime_ns, tamaño) de cada archivo del guardado, para notar cambios de otro proceso."""
+    firma = []
+    for ruta in almacen.archivos(FILE_DATA):
+        try:
+            st = os.stat(ruta)
+            firma.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            firma.append(None)
+    return tuple(firma)
+
+def ejecutar_daemon():
+    estado = {"pet": GeoPet(procesar=False, escritura=False), "firma": None}
+    firma = firma_guardado
+
+    def recargar():
+        estado["pet"] = GeoPet(procesar=False, escritura=False)
+        estado["firma"] = firma()
+
+    def responder(peticion):
+        if peticion == "recargar":
+            recargar()
+            return "ok\n"
+        if peticion == "parar":
+            return "ok\n"
+        # Por si alguien editó el guardado sin pasar por +KOTA.py
+        if firma() != estado["firma"]:
+            recargar()
+        # Sin ningún archivo del guardado no hay mascota que mostrar
+        if all(f is None for f in estado["firma"]):
+            return ""
+        return monitor.linea_estado(snapshot.campos(estado["pet"].proyectar())) + "\n\n"
+
+    recargar()
+    print(f"{Color.CYAN}+KOTA daemon escuchando en {daemon.ruta_socket()}{Color.RESET}")
+    daemon.servir(responder)
+
+# ==========================================================
+# VIGILAR (kota vigilar)
+# ==========================================================
+NOMBRES_AVISO = {"hambre": "El hambre", "energia": "La energía"}
+# Un aviso ya dado se rearma solo si el cruce vuelve a quedar al menos esto
+# por delante: guardar reinicia el reloj y un cruce recién pasado puede
+# volver a quedar unos segundos en el futuro
+REARMAR = 600
+
+def texto_aviso(nombre, clave, umbral):
+    if clave == "fuga":
+        return f"{nombre} está a punto de irse de casa"
+    return f"{NOMBRES_AVISO[clave]} de {nombre} bajó de {umbral}%"
+
+def cruces_guardado():
+    """(nombre, cruces) según el guardado en disco; sin mascota viva no hay cruces."""
+    if not almacen.existe(FILE_DATA):
+        return None, []
+    d = GeoPet(procesar=False, escritura=False).data
+    if d["status"] != "vivo":
+        return d["nombre"], []
+    return d["nombre"], simulacion.cruces(d, d["ultima_conexion"])
+
+def avisar(mensaje, clave, umbral, hook):
+    print(f"{Color.GRAY}[{time.strftime('%H:%M')}]{Color.RESET} {Color.YELLOW}{mensaje}{Color.RESET}\a",
+          flush=True)
+    if hook:
+        entorno = dict(os.environ, KOTA_AVISO=clave, KOTA_UMBRAL=str(umbral or ""), KOTA_MENSAJE=mensaje)
+        subprocess.run(hook, shell=True, env=entorno)
+
+def ejecutar_vigilar(args):
+    """
+    kota vigilar [--lista] [--hook CMD]: avisa cuando el hambre o la energía
+    bajan de 30/20/10 y cuando está por irse de casa. Los cruces salen del
+    modelo de decaimiento (simulacion.cruces); entre aviso y aviso duerme, y
+    solo recalcula si cambia el guardado.
+    """
+    hook = None
+    if "--hook" in args:
+        i = args.index("--hook")
+        if i + 1 >= len(args):
+            print(f"{Color.RED}Uso: kota vigilar [--lista] [--hook comando]{Color.RESET}")
+            return
+        hook = args[i + 1]
+    nombre, cruces = cruces_guardado()
+    if "--lista" in args:
+        ahora = time.time()
+        for t, clave, umbral in cruces:
+            cuando = "ya" if t <= ahora else time.strftime("%d/%m %H:%M", time.localtime(t))
+            print(f"  {cuando:>11}  {texto_aviso(nombre, clave, umbral)}")
+        if not cruces:
+            print(f"{Color.GRAY}Sin avisos por delante (congelada, escapada o sin guardado).{Color.RESET}")
+        return
+
+    rutas = almacen.archivos(FILE_DATA)
+    observador = vigilancia.Observador(os.path.dirname(os.path.abspath(FILE_DATA)),
+                                       [os.path.basename(r) for r in rutas])
+    firma = firma_guardado()
+    avisados = set()
+    print(f"{Color.CYAN}Vigilando a {nombre or 'la mascota (aún sin guardado)'}{Color.RESET} (Ctrl+C para salir)")
+    try:
+        while True:
+            ahora = time.time()
+            pasados = [(clave, umbral) for t, clave, umbral in cruces if t <= ahora]
+            # Si la atendieron y el cruce vuelve a quedar por delante, se avisará de nuevo
+            avisados &= {(clave, umbral) for t, clave, umbral in cruces if t <= ahora + REARMAR}
+            nuevos = [c for c in pasados if c not in avisados]
+            # De varios umbrales ya cruzados de golpe, solo el más bajo
+            ultimo = {clave: umbral for clave, umbral in nuevos}
+            for clave, umbral in ultimo.items():
+                avisar(texto_aviso(nombre, clave, umbral), clave, umbral, hook)
+            avisados.update(nuevos)
+
+            futuros = [t for t, _, _ in cruces if t > ahora]
+            espera = min(futuros) - ahora if futuros else None
+            if observador.esperar(espera) and firma_guardado() != firma:
+                firma = firma_guardado()
+                nombre, cruces = cruces_guardado()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        observador.cerrar()
+
+# ==========================================================
+# MODO LOTE (kota batch)
+# ==========================================================
+_ANSI = r"\x1b\[[0-9;?]*[A-Za-z]"
+# Comandos del lote que solo consultan: cuentan como ok aunque no cambien nada
+LOTE_LECTURA = ("estado", "stats", "inventario")
+
+def ejecutar_en_lote(pet, comando, args):
+    """
+    Un comando del lote, sin menús ni pantalla. Devuelve datos extra para el
+    resultado (o None); los errores de uso se lanzan como ValueError.
+    """
+    if comando == "stats":
+        return {"stats": estadisticas.resumen(pet.data["estadisticas"])}
+    if comando == "inventario":
+        pet.mostrar_inventario()
+        return {"inventario": pet.data["inventario"]}
+    if comando in LOTE_LECTURA:
+        return None
+    if comando in ("alimentar", "usar"):
+        if comando == "alimentar":
+            categoria, resto = "comidas", args
         else:
-            print("Perdiste...")
-            self.data["afecto"] -= 1
-            self.data["monedas"] += 3
-            self.ganar_exp(5)
-            
-        self.data["hambre"] -= 1
-        self.data["energia"] -= 2
-        self.guardar_datos()
+            categoria, resto = (CATEGORIAS.get(args[0].lower()) if args else None), args[1:]
+        if categoria not in ("comidas", "pociones") or not resto:
+            raise ValueError("uso: usar <comida|pocion> <item> [cantidad] / alimentar <comida> [cantidad]")
+        return {"usados": pet.usar(categoria, resto[0].lower(), _cantidad(resto[1:]))}
+    elif comando == "comprar":
+        categoria = CATEGORIAS.get(args[0].lower()) if args else None
+        if categoria is None or len(args) < 2:
+            raise ValueError("uso: comprar <comida|pocion|accesorio> <item> [cantidad]")
+        return {"comprados": pet.comprar(categoria, args[1].lower(), _cantidad(args[2:]))}
+    elif comando == "jugar":
+        juego = args[0].lower() if args else None
+        if not juegos.sin_preguntar(juego) or len(args) < 2:
+            usos = " / ".join(f"jugar {n} {a}" for n, (_, a, _) in juegos.JUEGOS.items() if a)
+            raise ValueError(f"uso: {usos} (los demás juegos son interactivos)")
+        pet.jugar(juego, " ".join(args[1:]))
+    elif comando == "equipar":
+        if not args:
+            raise ValueError("uso: equipar <accesorio>")
+        pet.equipar_accesorio(args[0].lower(), mostrar=False)
+    elif comando == "renombrar":
+        if not args:
+            raise ValueError("uso: renombrar <nombre>")
+        pet.renombrar(" ".join(args))
+    elif comando == "desequipar": pet.desequipar_accesorio(mostrar=False)
+    elif comando == "descongelar": pet.descongelar(mostrar=False)
+    elif comando == "acariciar": pet.acariciar()
+    elif comando == "pasear": pet.pasear()
+    elif comando == "dormir": pet.dormir()
+    else:
+        raise ValueError(f"comando no disponible aquí: {comando}")
+    return None
 
-    def juego_pares(self): pass # Omitido por brevedad (usar el original)
-    def juego_adivina(self): pass # Omitido por brevedad (usar el original)
-    def juego_tictactoe(self): pass # Omitido por brevedad (usar el original)
+def _cantidad(args):
+    """La cantidad opcional de comprar/usar/alimentar (1 si no se da)."""
+    if not args:
+        return 1
+    if not args[0].isdigit() or int(args[0]) < 1:
+        raise ValueError("la cantidad debe ser un número mayor que 0")
+    return int(args[0])
 
-    def mostrar_stats(self):
-        if self.check_congelado(): return
-        # ... (Mantener original)
-        self.mostrar_estado() # Simple fallback
+def _resultado_lote(pet, n, linea, salida, ok, error=None, extra=None):
+    resultado = {"n": n, "comando": linea, "ok": ok}
+    if error:
+        resultado["error"] = error
+    if extra:
+        resultado.update(extra)
+    resultado["salida"] = [l for l in (re.sub(_ANSI, "", x).strip() for x in salida.splitlines()) if l]
+    resultado["estado"] = {k: pet.data[k] for k in ("hambre", "energia", "afecto", "monedas",
+                                                      "nivel", "estado_dormido", "status")}
+    resultado["estado"]["estres"] = pet.data["personalidad"]["estres"]
+    print(json.dumps(resultado), flush=True)
 
-    def limpiar_pantalla(self):
-        os.system('clear' if os.name != 'nt' else 'cls')
+def ejecutar_lote(args):
+    """
+    kota batch [archivo|-]: ejecuta un comando por línea contra una sola carga
+    del guardado, escribe una línea JSON por comando y guarda una vez al final.
+    """
+    origen = args[0] if args else "-"
+    try:
+        entrada = sys.stdin if origen == "-" else open(origen, 'r', encoding="utf-8")
+    except OSError as e:
+        print(f"{Color.RED}No se pudo leer {origen}: {e}{Color.RESET}")
+        sys.exit(1)
 
-    def reset(self):
-        if os.path.exists(FILE_DATA):
-            os.remove(FILE_DATA)
-            print(f"{Color.GREEN}+KOTA reiniciado.{Color.RESET}")
+    # Lo que GeoPet imprime al cargar (errores, abandono) no debe romper el JSON
+    salida = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(salida):
+            pet = GeoPet()
+    except SystemExit:
+        print(json.dumps({"n": 0, "comando": "", "ok": False, "error": "escapó",
+                          "salida": [re.sub(_ANSI, "", l).strip() for l in salida.getvalue().splitlines() if l.strip()]}))
+        raise
+
+    escapo = False
+    try:
+        for n, linea in enumerate(entrada, 1):
+            linea = linea.strip()
+            try:
+                partes = shlex.split(linea, comments=True)
+            except ValueError as e:
+                _resultado_lote(pet, n, linea, "", False, str(e))
+                continue
+            if not partes:
+                continue
+
+            comando = partes[0].lower()
+            antes = pet.n_cambios
+            salida = io.StringIO()
+            error = extra = None
+            try:
+                with contextlib.redirect_stdout(salida):
+                    extra = ejecutar_en_lote(pet, comando, partes[1:])
+            except ValueError as e:
+                error = str(e)
+            except SystemExit:
+                # escapar() ya guardó: no tiene sentido seguir
+                error, escapo = "escapó", True
+            ok = error is None and (pet.n_cambios > antes or comando in LOTE_LECTURA)
+            _resultado_lote(pet, n, linea, salida.getvalue(), ok, error, extra)
+            if escapo:
+                break
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        pet.confirmar()
+    if escapo:
+        sys.exit(1)
+
+# ==========================================================
+# MODO SHELL (kota shell)
+# ==========================================================
+PROMPT_SHELL = f"{Color.CYAN}kota>{Color.RESET} "
+AYUDA_SHELL = [
+    f"{Color.BOLD}Comandos:{Color.RESET} alimentar [comida], usar [tipo] [item], comprar <tipo> <item> [n],",
+    "acariciar, pasear, dormir, jugar <juego>, tienda, equipar <acc>, desequipar,",
+    "renombrar <nombre>, descongelar, salir",
+]
+
+def _necesita_menu(comando, args):
+    """Comandos que preguntan con input(): en el shell se ejecutan a pantalla completa."""
+    if comando == "tienda": return True
+    if comando == "alimentar": return not args
+    if comando == "usar": return len(args) < 2
+    if comando == "jugar": return not (len(args) >= 2 and juegos.sin_preguntar(args[0].lower()))
+    return False
+
+def _cuadro_shell(pet, mensajes):
+    # Sin líneas en blanco repetidas, para que quepa en una terminal de 24 filas
+    filas = []
+    for linea in pet.lineas_estado():
+        if linea or (filas and filas[-1]):
+            filas.append(linea)
+    # Debajo van el prompt y la fila a la que baja el Enter: si el prompt
+    # estuviera en la última, la terminal haría scroll y descuadraría todo
+    alto = shutil.get_terminal_size().lines - 2
+    if mensajes:
+        filas += [""] + mensajes[-max(1, alto // 3):]
+    # Si no cabe, se pierde lo de arriba (la cabecera) antes que los mensajes
+    return filas[-alto:]
+
+def _leer_shell(estado, vista, mensajes):
+    """Espera una línea; mientras tanto aplica el decaimiento y refresca la pantalla."""
+    vista.dibujar(_cuadro_shell(estado["pet"], mensajes), PROMPT_SHELL)
+    en_vivo = os.name != 'nt' and sys.stdin.isatty()
+    while en_vivo and not select.select([sys.stdin], [], [], 1.0)[0]:
+        vista.refrescar(_cuadro_shell(_en_vivo(estado), mensajes))
+    return sys.stdin.readline()
+
+def _al_dia(estado):
+    """Recarga si otro proceso tocó el guardado; si no, aplica el tiempo transcurrido."""
+    if firma_guardado() != estado["firma"]:
+        estado["pet"] = GeoPet()
+        estado["firma"] = firma_guardado()
+    else:
+        estado["pet"].avanzar()
+
+def _en_vivo(estado):
+    """
+    La mascota como estaría ahora, para redibujar cada segundo. Solo se
+    proyecta (como el daemon): el tiempo se aplica de verdad al ejecutar un
+    comando, no en cada refresco.
+    """
+    if firma_guardado() != estado["firma"]:
+        estado["pet"] = GeoPet()
+        estado["firma"] = firma_guardado()
+    pet = estado["pet"]
+    vista = object.__new__(GeoPet)
+    vista.__dict__.update(pet.__dict__, data=pet.proyectar())
+    return vista
+
+def _comando_shell(pet, vista, comando, args):
+    if comando in ("ayuda", "help"):
+        return AYUDA_SHELL
+    if _necesita_menu(comando, args):
+        vista.escribir(pantalla.LIMPIAR)
+        ejecutar_comando(pet, comando, args)
+        vista.invalidar()
+        return []
+    salida = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(salida):
+            ejecutar_en_lote(pet, comando, args)
+    except ValueError as e:
+        return [f"{Color.RED}{e}{Color.RESET}"]
+    return [l for l in salida.getvalue().splitlines() if l.strip()]
+
+def ejecutar_shell():
+    """
+    kota shell: la mascota queda cargada entre comandos, el decaimiento se
+    aplica en vivo y la pantalla se redibuja por filas (kota/pantalla.py).
+    Cada comando que cambia algo se guarda al terminar, como fuera del shell.
+    """
+    estado = {"pet": GeoPet(), "firma": firma_guardado()}
+    vista = pantalla.Pantalla(sys.stdout.fileno())
+    mensajes = list(AYUDA_SHELL)
+    vista.escribir(pantalla.ENTRAR)
+    try:
+        while True:
+            linea = _leer_shell(estado, vista, mensajes)
+            if not linea:
+                break
+            try:
+                partes = shlex.split(linea, comments=True)
+            except ValueError as e:
+                mensajes = [f"{Color.RED}{e}{Color.RESET}"]
+                continue
+            if not partes:
+                continue
+            comando, args = partes[0].lower(), partes[1:]
+            if comando in ("salir", "exit", "quit"):
+                break
+            _al_dia(estado)
+            mensajes = _comando_shell(estado["pet"], vista, comando, args)
+            estado["pet"].confirmar()
+            estado["firma"] = firma_guardado()
+    except SystemExit:
+        # escapar() ya guardó; su nota quedó en la pantalla alternativa
+        vista.escribir(pantalla.SALIR)
+        estado["pet"].mostrar_abandono()
+        raise
+    except KeyboardInterrupt:
+        pass
+    vista.escribir(pantalla.SALIR)
+    estado["pet"].confirmar()
+
+# ==========================================================
+# TABLA DE COMANDOS, AYUDA Y COMPLETADO
+# ==========================================================
+# Qué necesita cada comando antes de ejecutarse:
+#   NADA       no carga la mascota (o la gestiona por su cuenta)
+#   LECTURA    carga y aplica el tiempo; solo guarda si escapa
+#   ESCRITURA  carga, ejecuta y guarda una vez si cambió algo
+NADA, LECTURA, ESCRITURA = "nada", "lectura", "escritura"
+
+# comando: (necesita, argumentos, descripción); sin descripción no sale en la ayuda
+COMANDOS = {
+    "estado":      (LECTURA, "", "Ver estado completo con gráfico ASCII"),
+    "alimentar":   (ESCRITURA, "[comida] [n]", "Dar comida (+25-35 hambre, +3 afecto)"),
+    "usar":        (ESCRITURA, "[tipo] [item] [n]", "Usar una comida o poción"),
+    "acariciar":   (ESCRITURA, "", "Reducir estrés (-5) y aumentar afecto (+4)"),
+    "pasear":      (ESCRITURA, "", "Salir a caminar (-25 energía, +10 afecto, -15 estrés)"),
+    "dormir":      (ESCRITURA, "", "Poner a dormir o despertar"),
+    "tienda":      (ESCRITURA, "", "Comprar comida, pociones y accesorios"),
+    "comprar":     (ESCRITURA, "<tipo> <item> [n]", "Comprar sin pasar por la tienda"),
+    "equipar":     (ESCRITURA, "[accesorio]", "Ponerle un accesorio"),
+    "desequipar":  (ESCRITURA, "", "Quitarle el accesorio"),
+    "renombrar":   (ESCRITURA, "[nombre]", "Cambiar el nombre de tu mascota"),
+    "jugar":       (ESCRITURA, "[tipo]", "Jugar minijuegos (rps, pares, adivina, tictactoe)"),
+    "descongelar": (ESCRITURA, "", "Sacarla de la criostasis"),
+    "stats":       (LECTURA, "", "Ver estadísticas detalladas"),
+    "historial":   (LECTURA, "[serie] [horas]", "Eventos recientes (todos con KOTA_ALMACEN=sqlite)"),
+    "inventario":  (LECTURA, "", "Ver comidas, pociones y accesorios que tienes"),
+    "shell":       (NADA, "", "Sesión interactiva con la mascota siempre en pantalla"),
+    "batch":       (NADA, "[archivo]", "Ejecutar varios comandos de una vez"),
+    "daemon":      (NADA, "[parar]", "Daemon residente para el monitor"),
+    "export":      (NADA, "[--json] [f]", "Exportar el guardado a JSON"),
+    "import":      (NADA, "[archivo]", "Importar un guardado JSON o .kota"),
+    "fleet":       (NADA, "[subcomando]", "Modo flota (tick, top, ver, importar)"),
+    "vigilar":     (NADA, "[opciones]", "Avisar cuando tenga hambre, sueño o vaya a irse"),
+    "trace":       (NADA, "[summary]", "Resumen de las trazas (KOTA_TRACE=1 o --trace)"),
+    "balance":     (NADA, "[config.json]", "Simular muchas vidas para ajustar precios y tasas"),
+    "reset":       (NADA, "", "Reiniciar mascota (borra todo)"),
+    "ayuda":       (NADA, "", "Esta lista"),
+    "completar":   (NADA, "", None),
+    "help":        (NADA, "", None),
+    "-h":          (NADA, "", None),
+    "--help":      (NADA, "", None),
+}
+
+def mostrar_ayuda(args=None):
+    print(f"\n{Color.CYAN}{Color.BOLD}+KOTA v2.0 (Cryo Update){Color.RESET}")
+    print(f"Uso: kota [comando] [argumentos]\n")
+    for nombre, (_, argumentos, descripcion) in COMANDOS.items():
+        if descripcion:
+            print(f"  {(nombre + ' ' + argumentos).strip():24} {descripcion}")
+    print()
+
+def completar(args):
+    """
+    kota completar <palabras...>: posibles valores para la última palabra,
+    uno por línea. Sale del catálogo, sin leer el guardado.
+    """
+    palabras = args or [""]
+    parcial = palabras[-1].lower()
+    previas = [p.lower() for p in palabras[:-1]]
+    if not previas:
+        opciones = [n for n, (_, _, d) in COMANDOS.items() if d]
+    elif previas[0] == "alimentar" and len(previas) == 1:
+        opciones = list(TIENDA_ITEMS["comidas"])
+    elif previas[0] == "usar" and len(previas) == 1:
+        opciones = ["comida", "pocion"]
+    elif previas[0] == "usar" and len(previas) == 2:
+        opciones = list(TIENDA_ITEMS.get(CATEGORIAS.get(previas[1]), {}))
+    elif previas[0] == "comprar" and len(previas) == 1:
+        opciones = ["comida", "pocion", "accesorio"]
+    elif previas[0] == "comprar" and len(previas) == 2:
+        opciones = list(TIENDA_ITEMS.get(CATEGORIAS.get(previas[1]), {}))
+    elif previas[0] == "equipar" and len(previas) == 1:
+        opciones = list(TIENDA_ITEMS["accesorios"])
+    elif previas[0] == "jugar" and len(previas) == 1:
+        opciones = list(juegos.JUEGOS)
+    elif previas[0] == "daemon" and len(previas) == 1:
+        opciones = ["parar"]
+    elif previas[0] == "fleet" and len(previas) == 1:
+        opciones = ["tick", "top", "ver", "importar"]
+    elif previas[0] == "vigilar":
+        opciones = ["--lista", "--hook"]
+    elif previas[0] == "historial" and len(previas) == 1:
+        opciones = list(historial.SERIES)
+    elif previas[0] == "trace" and len(previas) == 1:
+        opciones = ["summary"]
+    else:
+        opciones = []
+    for opcion in opciones:
+        if opcion.startswith(parcial):
+            print(opcion)
+
+def comando_daemon(args):
+    if args and args[0].lower() == "parar":
+        if daemon.consultar("parar") is None:
+            print(f"{Color.YELLOW}No hay ningún daemon corriendo.{Color.RESET}")
+    else:
+        ejecutar_daemon()
+
+def tamano_guardado():
+    """Bytes en disco del guardado: JSON + diario, el binario o la base SQLite."""
+    total = 0
+    for ruta in almacen.archivos(FILE_DATA):
+        try:
+            total += os.path.getsize(ruta)
+        except OSError:
+            pass
+    return total
+
+def mostrar_trazas(args):
+    """kota trace summary [archivo]: percentiles por comando y por fase."""
+    if args and args[0].lower() not in ("summary", "resumen"):
+        print(f"{Color.RED}Uso: kota trace summary [archivo]{Color.RESET}")
+        return
+    ruta = args[1] if len(args) > 1 else (traza.ruta_env() or traza.ARCHIVO)
+    if not os.path.exists(ruta):
+        print(f"{Color.YELLOW}No hay trazas en {ruta}. Actívalas con KOTA_TRACE=1 "
+              f"o kota --trace <comando>.{Color.RESET}")
+        return
+    p = traza.percentil
+    resumen = traza.resumir(traza.leer(ruta))
+    for comando, c in sorted(resumen.items(), key=lambda item: -item[1]["n"]):
+        total = sorted(c["total"])
+        print(f"\n{Color.BOLD}{comando}{Color.RESET}  ({c['n']} ejecuciones)  total p50 {p(total, 0.5):.1f} ms"
+              f"  p90 {p(total, 0.9):.1f} ms  p99 {p(total, 0.99):.1f} ms")
+        print(f"  {'fase':10} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+              f"{'leídos':>10} {'escritos':>10} {'guardado':>10}")
+        for nombre in traza.orden_fases(c["fases"]):
+            f = c["fases"][nombre]
+            ms = sorted(f["ms"])
+            # Bytes: la mediana de cada columna
+            b = [str(p(sorted(f[k]), 0.5)) if f[k] else "-" for k in ("leidos", "escritos", "guardado")]
+            print(f"  {nombre:10} {p(ms, 0.5):9.2f} {p(ms, 0.9):9.2f} {p(ms, 0.99):9.2f} "
+                  f"{b[0]:>10} {b[1]:>10} {b[2]:>10}")
+    print()
+
+# Manejadores de los comandos que no necesitan la mascota cargada
+SIN_ESTADO = {
+    "shell": lambda args: ejecutar_shell(),
+    "batch": ejecutar_lote,
+    "daemon": comando_daemon,
+    "export": exportar,
+    "import": importar,
+    "fleet": ejecutar_flota,
+    "trace": mostrar_trazas,
+    "balance": ejecutar_balance,
+    "vigilar": ejecutar_vigilar,
+    "reset": lambda args: reset(),
+    "ayuda": mostrar_ayuda,
+    "help": mostrar_ayuda,
+    "-h": mostrar_ayuda,
+    "--help": mostrar_ayuda,
+    "completar": completar,
+}
 
 # ==========================================================
 # MAIN
 # ==========================================================
 def main():
-    if len(sys.argv) < 2:
-        print(f"\n{Color.CYAN}{Color.BOLD}+KOTA v2.0 (Cryo Update){Color.RESET}")
-        print(f"Comandos: estado, usar [item], tienda, descongelar, ...")
+    argv = sys.argv[1:]
+    ruta_traza = traza.ruta_env()
+    if argv[:1] == ["--trace"]:
+        argv = argv[1:]
+        ruta_traza = ruta_traza or traza.ARCHIVO
+    if not argv:
+        mostrar_ayuda()
         return
 
-    comando = sys.argv[1].lower()
-    pet = GeoPet()
+    comando = argv[0].lower()
+    args = argv[1:]
+    if comando not in COMANDOS:
+        print(f"{Color.RED}Comando no reconocido.{Color.RESET} Usa 'kota ayuda' para ver la lista.")
+        return
+    if ruta_traza and comando != "trace":
+        traza.activar(comando, _INICIO, ruta_traza, tamano_guardado)
+    try:
+        despachar(comando, args)
+    except TimeoutError as e:
+        print(f"{Color.RED}Otro proceso tiene ocupado el guardado: {e}{Color.RESET}")
+        sys.exit(1)
+    finally:
+        traza.cerrar(ALMACEN)
 
+def despachar(comando, args):
+    necesita = COMANDOS[comando][0]
+    if necesita == NADA:
+        with traza.fase("comando"):
+            SIN_ESTADO[comando](args)
+        return
+
+    pet = GeoPet(escritura=necesita == ESCRITURA)
+    try:
+        with traza.fase("comando"):
+            ejecutar_comando(pet, comando, args)
+    finally:
+        # Como mucho una escritura por comando, y ninguna si solo se consultó
+        pet.confirmar()
+
+def _sin_menu(pet, comando, args):
+    """comprar/usar/alimentar con todo en la línea de comandos, como en el lote."""
+    try:
+        ejecutar_en_lote(pet, comando, args)
+    except ValueError as e:
+        print(f"{Color.RED}{e}{Color.RESET}")
+
+def ejecutar_comando(pet, comando, args):
     if comando == "estado": pet.mostrar_estado()
     elif comando == "usar":
-        if len(sys.argv) < 3: 
+        if not args: 
             print(f"{Color.RED}Falta tipo. Ejemplo: usar pocion{Color.RESET}")
         else:
-            # --- CORRECCIÓN AQUÍ ---
             # Mapeamos lo que escribe el usuario a las claves correctas del diccionario
-            tipo_input = sys.argv[2].lower()
-            
-            # Diccionario de traducción de entradas
-            mapeo_categorias = {
-                "comida": "comidas",
-                "comidas": "comidas",
-                "pocion": "pociones",
-                "pociones": "pociones",
-                "poción": "pociones", # Por si acaso alguien usa tildes
-                "pocíon": "pociones"
-            }
-            
-            categoria_real = mapeo_categorias.get(tipo_input)
+            tipo_input = args[0].lower()
+            categoria_real = CATEGORIAS.get(tipo_input)
             
-            if categoria_real:
-                pet.usar_item(categoria_real)
+            if categoria_real in ("comidas", "pociones"):
+                # Con el item en la línea de comandos no hay menú
+                if len(args) > 1: _sin_menu(pet, comando, args)
+                else: pet.usar_item(categoria_real)
             else:
                 print(f"{Color.RED}Categoría '{tipo_input}' no válida. Usa 'comida' o 'pocion'.{Color.RESET}")
-            # -----------------------
 
-    elif comando == "alimentar": pet.usar_item("comidas") 
+    elif comando == "alimentar":
+        if args: _sin_menu(pet, comando, args)
+        else: pet.usar_item("comidas")
+    elif comando == "comprar": _sin_menu(pet, comando, args)
     elif comando == "acariciar": pet.acariciar()
     elif comando == "pasear": pet.pasear()
     elif comando == "dormir": pet.dormir()
     elif comando == "tienda": pet.mostrar_tienda()
     elif comando == "inventario": pet.mostrar_inventario() 
     elif comando == "equipar": 
-        if len(sys.argv) < 3: print(f"{Color.RED}Especifica el nombre del accesorio.{Color.RESET}")
-        else: pet.equipar_accesorio(sys.argv[2].lower())
+        if not args: print(f"{Color.RED}Especifica el nombre del accesorio.{Color.RESET}")
+        else: pet.equipar_accesorio(args[0].lower())
     elif comando == "desequipar": pet.desequipar_accesorio()
     elif comando == "renombrar": 
-        if len(sys.argv) < 3: print(f"{Color.RED}Especifica el nuevo nombre.{Color.RESET}")
-        else: pet.renombrar(sys.argv[2])
+        if not args: print(f"{Color.RED}Especifica el nuevo nombre.{Color.RESET}")
+        else: pet.renombrar(args[0])
     elif comando == "jugar": 
-        if len(sys.argv) < 3: print(f"{Color.RED}Especifica el juego (rps, pares, adivina, tictactoe).{Color.RESET}")
-        else: pet.jugar(sys.argv[2].lower())
+        if not args: print(f"{Color.RED}Especifica el juego ({', '.join(juegos.JUEGOS)}).{Color.RESET}")
+        else: pet.jugar(args[0].lower(), " ".join(args[1:]) or None)
     elif comando == "descongelar": pet.descongelar()
-    elif comando == "reset": pet.reset()
     elif comando == "stats": pet.mostrar_stats()
+    elif comando == "historial":
+        serie = next((a.lower() for a in args if a.lower() in historial.SERIES), None)
+        horas = next((float(a) for a in args if a.replace(".", "", 1).isdigit()), 24)
+        pet.mostrar_historial(serie, horas)
     else: print(f"{Color.RED}Comando no reconocido.{Color.RESET}")
 
 if __name__ == "__main__":
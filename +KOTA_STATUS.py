@@ -1,102 +1,73 @@
 #!/usr/bin/env python3
-import json
 import os
 import sys
 import time
 
+from kota import simulacion, snapshot
+from kota.monitor import linea_estado
+
 # Ajusta la ruta si es necesario
 JSON_PATH = os.path.expanduser("~/mascota_savegame.json")
 
-# Colores ANSI
-C_RESET = '\033[0m'
-C_CYAN = '\033[96m'
-C_GREEN = '\033[92m'
-C_YELLOW = '\033[93m'
-C_RED = '\033[91m'
-C_MAGENTA = '\033[95m'
-C_BOLD = '\033[1m'
-
-def get_color(valor, es_inverso=False):
-    if es_inverso:
-        if valor < 30: return C_GREEN
-        if valor < 60: return C_YELLOW
-        return C_RED
-    else:
-        if valor > 70: return C_GREEN
-        if valor > 30: return C_YELLOW
-        return C_RED
+def cargar_estado():
+    # Camino rápido: la instantánea de tamaño fijo que escribe +KOTA.py
+    data = snapshot.leer(JSON_PATH)
+    if data is not None:
+        return data
 
-def main():
-    try:
-        if not os.path.exists(JSON_PATH):
-            sys.exit(0)
+    # Guardado binario: basta con su cabecera de tamaño fijo
+    from kota import binario
+    data = binario.leer_cabecera(binario.ruta_binario(JSON_PATH))
+    if data is not None:
+        return data
 
-        with open(JSON_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    # Guardado SQLite: la instantánea va ligada al .db; si no, su tabla de estado
+    from kota import almacen
+    sqlite = almacen.Sqlite(JSON_PATH)
+    if sqlite.existe():
+        data = snapshot.leer(sqlite.ruta)
+        if data is not None:
+            return data
+        data = sqlite.cargar()
+        return None if data is None else snapshot.campos(data)
 
-        # Chequear congelamiento
-        if data.get("congelado", False):
-            nombre = data.get("nombre", "Mascota")
-            print(f"   ❄️  {C_BOLD}{nombre}{C_RESET}  ::  {C_CYAN}[CONGELADO EN CRIOSTASIS]{C_RESET}")
-            print("")
-            return
+    # Sin instantánea (o desactualizada): leer el guardado completo
+    from kota import diario
+    data = diario.cargar(JSON_PATH)
+    if data is None:
+        return None
+    return snapshot.campos(data)
 
-        # --- LÓGICA DE SIMULACIÓN (Igual que antes) ---
-        ultima_conexion = float(data.get("ultima_conexion", time.time()))
-        hambre = float(data.get("hambre", 100))
-        energia = float(data.get("energia", 100))
-        dormido = data.get("estado_dormido", False)
-        
-        ahora = time.time()
-        horas_pasadas = (ahora - ultima_conexion) / 3600
+def consultar_daemon():
+    # Con --socket se pregunta primero al daemon (kota daemon); si no está
+    # corriendo, se sigue por el camino normal.
+    from kota import daemon
+    return daemon.consultar("estado")
 
-        if horas_pasadas > 0.02:
-            if dormido:
-                hambre -= horas_pasadas * 0.5
-                energia += horas_pasadas * 50.0
-            else:
-                hambre -= horas_pasadas * 4.2
-                energia -= horas_pasadas * 4.2
+def main():
+    try:
+        if "--socket" in sys.argv[1:]:
+            respuesta = consultar_daemon()
+            if respuesta is not None:
+                sys.stdout.write(respuesta)
+                return
 
-        hambre = max(0, min(100, hambre))
-        energia = max(0, min(100, energia))
-        
-        nombre = data.get("nombre", "Mascota")
-        afecto_raw = float(data.get("afecto", 0))
-        afecto = (afecto_raw + 100) / 2
-        status = data.get("status", "vivo")
-        p = data.get("personalidad", {})
-        estres = float(p.get("estres", 0))
+        data = cargar_estado()
+        if data is None:
+            sys.exit(0)
 
-        estres_simulado = estres
-        if hambre < 30: estres_simulado += 10
-        if energia < 30: estres_simulado += 10
-        estres_simulado = min(100, estres_simulado)
+        # Mismo modelo que +KOTA.py (kota/simulacion.py), incluido el estrés
+        if not data["congelado"]:
+            ultima_conexion = data["ultima_conexion"] or time.time()
+            data = simulacion.avanzar(data, ultima_conexion, time.time())
+            data["estres"] = simulacion.estres(data["hambre"], data["energia"], data["afecto"],
+                                               data["privacion_sueno"], data["maltrato_psicologico"])
 
-        if status != "vivo":
-            estado_icon = "💀"
-            estado_txt = f"{C_RED}Muerto{C_RESET}"
-        elif dormido:
-            estado_icon = "💤"
-            estado_txt = f"{C_CYAN}Dormido{C_RESET}"
-        else:
-            estado_icon = "●"
-            estado_txt = f"{C_GREEN}Activo{C_RESET}"
-        
-        out = (
-            f"   {estado_icon} {C_BOLD}{nombre}{C_RESET}  ::  "
-            f"🍖 {get_color(hambre)}{int(hambre)}%{C_RESET}  "
-            f"⚡ {get_color(energia)}{int(energia)}%{C_RESET}  "
-            f"🧠 {get_color(estres_simulado, True)}{int(estres_simulado)}%{C_RESET}  "
-            f"❤️  {C_MAGENTA}{int(afecto)}%{C_RESET}  "
-            f"[{estado_txt}]"
-        )
-        
-        print(out)
+        print(linea_estado(data))
         print("")
 
     except Exception:
         pass
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
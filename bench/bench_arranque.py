@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Arranque de +KOTA.py por comando: tiempo total del proceso frente a un
+intérprete vacío, y cuántos módulos importa además de los del intérprete
+(los perezosos que nadie tocó no llegan a importarse).
+
+También muestra cuánto cuesta compilar +KOTA.py: al ejecutarse como script
+no se guarda en .pyc, así que ese coste se paga en cada comando.
+
+Los comandos sin estado (ayuda, completar) no deben cargar json, sockets ni
+los módulos del guardado: si lo hacen, el script termina con código 1 para
+que la regresión se note.
+
+Uso: python3 bench/bench_arranque.py [repeticiones]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from comun import RAIZ, generar_guardado, mediana_ms
+
+SCRIPT = os.path.join(RAIZ, "+KOTA.py")
+
+COMANDOS = [
+    ["ayuda"],
+    ["completar", "usar", "pocion", ""],
+    ["volar"],
+    ["estado"],
+    ["acariciar"],
+]
+SIN_ESTADO = ("ayuda", "completar", "volar")
+PROHIBIDOS = ("json", "socket", "random", "kota.diario", "kota.binario", "kota.daemon")
+
+# Ejecuta un script y lista los módulos cargados al terminar. La línea base
+# ejecuta un script vacío, para descontar lo que importa el propio runpy.
+SONDA = """
+import os, runpy, sys
+sys.argv = [{script!r}] + {args!r}
+sys.path.insert(0, os.path.dirname({script!r}))
+try:
+    runpy.run_path({script!r}, run_name="__main__")
+except SystemExit:
+    pass
+sys.stderr.write("\\n".join(sys.modules))
+"""
+
+
+def modulos(args, cwd, script=SCRIPT):
+    codigo = SONDA.format(script=script, args=args)
+    r = subprocess.run([sys.executable, "-c", codigo], cwd=cwd, capture_output=True, text=True)
+    if r.returncode:
+        raise RuntimeError(r.stderr)
+    return set(r.stderr.split("\n"))
+
+
+def medir(cmd, cwd, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, capture_output=True)
+        tiempos.append(time.perf_counter() - t0)
+    return mediana_ms(tiempos)
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    regresion = False
+    with tempfile.TemporaryDirectory() as tmp:
+        generar_guardado(os.path.join(tmp, "mascota_savegame.json"), 1000)
+        base_ms = medir([sys.executable, "-c", "pass"], tmp, repeticiones)
+        vacio = os.path.join(tmp, "vacio.py")
+        open(vacio, "w").close()
+        base_mod = modulos([], tmp, vacio)
+        print(f"{'comando':28} {'ms':>7} {'+ms':>7} {'módulos':>8}")
+        print(f"{'(python -c pass)':28} {base_ms:7.1f} {0:7.1f} {len(base_mod):8}")
+        for args in COMANDOS:
+            ms = medir([sys.executable, SCRIPT, *args], tmp, repeticiones)
+            cargados = modulos(args, tmp)
+            extra = cargados - base_mod
+            print(f"{' '.join(args):28} {ms:7.1f} {ms - base_ms:7.1f} {len(extra):8}")
+            if args[0] in SIN_ESTADO:
+                malos = sorted(m for m in PROHIBIDOS if m in cargados)
+                if malos:
+                    regresion = True
+                    print(f"  REGRESIÓN: '{args[0]}' carga {', '.join(malos)}")
+    with open(SCRIPT, encoding="utf-8") as f:
+        fuente = f.read()
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        compile(fuente, SCRIPT, "exec")
+        tiempos.append(time.perf_counter() - t0)
+    print(f"\ncompilar +KOTA.py: {mediana_ms(tiempos):.1f} ms por arranque")
+    sys.exit(1 if regresion else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Guardado JSON (indent=4, como guardar_datos) frente al formato binario:
+tamaño en disco, tiempo de guardado, de carga completa y de lectura de
+solo lo que necesita el monitor.
+
+Uso: python3 bench/bench_binario.py [repeticiones]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from comun import datos_sinteticos, mediana_ms
+from kota import binario, historial
+
+TAMANOS = [0, 100, 10_000]
+
+
+def cronometrar(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - t0)
+    return mediana_ms(tiempos)
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{'eventos':>8} {'formato':>8} {'tamaño':>9} {'guardar':>10} {'cargar':>10} {'monitor':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta_json = os.path.join(tmp, "mascota_savegame.json")
+        ruta_bin = binario.ruta_binario(ruta_json)
+        for eventos in TAMANOS:
+            data = datos_sinteticos(eventos)
+            historial.migrar(data["historial"])
+
+            def guardar_json():
+                with open(ruta_json, 'w') as f:
+                    json.dump(data, f, indent=4)
+
+            def cargar_json():
+                with open(ruta_json, 'r') as f:
+                    return json.load(f)
+
+            g = cronometrar(guardar_json, repeticiones)
+            c = cronometrar(cargar_json, repeticiones)
+            print(f"{eventos:>8} {'json':>8} {os.path.getsize(ruta_json):>7} B "
+                  f"{g:>8.3f}ms {c:>8.3f}ms {c:>8.3f}ms")
+
+            g = cronometrar(lambda: binario.guardar(ruta_bin, data), repeticiones)
+            c = cronometrar(lambda: binario.cargar(ruta_bin), repeticiones)
+            m = cronometrar(lambda: binario.leer_cabecera(ruta_bin), repeticiones)
+            print(f"{eventos:>8} {'binario':>8} {os.path.getsize(ruta_bin):>7} B "
+                  f"{g:>8.3f}ms {c:>8.3f}ms {m:>8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Prueba de estrés: N procesos escriben a la vez sobre el mismo guardado.
+
+Cada escritor repite M veces el ciclo completo de un comando (GeoPet() ->
+cambiar -> confirmar()): compra una manzana (-5 monedas, +1 en el
+inventario), suma una partida a juegos_stats y registra la sesión en el
+historial. Al final las cuentas tienen que cuadrar exactamente; si alguna
+actualización se perdió el script termina con código 1.
+
+Con --sin-fusion se desactiva la fusión (el último en guardar pisa a los
+demás) para ver que la prueba detecta las pérdidas.
+
+Uso: python3 bench/bench_concurrencia.py [escritores] [operaciones] [--almacen json|diario|binario|sqlite] [--sin-fusion]
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from comun import cargar_script, datos_sinteticos
+
+MONEDAS = 1000000
+PRECIO = 5  # manzana en TIENDA_ITEMS
+
+
+def escritor(operaciones, almacen, sin_fusion, salida, arranque):
+    os.environ["KOTA_ALMACEN"] = almacen
+    kota = cargar_script("+KOTA.py")
+    if sin_fusion:
+        kota.GeoPet.fusionar_disco = lambda self: None
+    latencias = []
+    # Los imports perezosos se pagan antes de la salida, no en el primer ciclo
+    with redirect_stdout(io.StringIO()):
+        kota.GeoPet(escritura=False)
+    arranque.wait()
+    with redirect_stdout(io.StringIO()):
+        for _ in range(operaciones):
+            t0 = time.perf_counter()
+            pet = kota.GeoPet()
+            kota.ejecutar_en_lote(pet, "comprar", ["comidas", "manzana", "1"])
+            pet.data["juegos_stats"]["rps"] += 1
+            kota.historial.registrar(pet.data["historial"], "sesiones_juego",
+                                     {"t": time.time(), "juego": "rps"})
+            pet.marcar_cambios()
+            pet.confirmar()
+            latencias.append(time.perf_counter() - t0)
+    salida.put((latencias, dict(kota.cerrojo.ESTADISTICAS)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("escritores", type=int, nargs="?", default=8)
+    parser.add_argument("operaciones", type=int, nargs="?", default=25)
+    parser.add_argument("--almacen", choices=("json", "diario", "binario", "sqlite"), default="json")
+    parser.add_argument("--sin-fusion", action="store_true")
+    args = parser.parse_args()
+    total = args.escritores * args.operaciones
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        data = datos_sinteticos(0)
+        data["monedas"] = MONEDAS
+        with open("mascota_savegame.json", "w") as f:
+            json.dump(data, f)
+
+        contexto = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+        salida = contexto.Queue()
+        arranque = contexto.Event()
+        procesos = [contexto.Process(target=escritor, args=(args.operaciones, args.almacen,
+                                                            args.sin_fusion, salida, arranque))
+                    for _ in range(args.escritores)]
+        for p in procesos:
+            p.start()
+        inicio = time.perf_counter()
+        arranque.set()
+        latencias, cerrojo = [], {}
+        for _ in procesos:
+            propias, estadisticas = salida.get()
+            latencias.extend(propias)
+            for clave, valor in estadisticas.items():
+                cerrojo[clave] = cerrojo.get(clave, 0) + valor
+        for p in procesos:
+            p.join()
+        duracion = time.perf_counter() - inicio
+
+        os.environ["KOTA_ALMACEN"] = args.almacen
+        kota = cargar_script("+KOTA.py")
+        final = kota.GeoPet(procesar=False, escritura=False).data
+        os.chdir("/")
+
+    esperado = {
+        "monedas": MONEDAS - PRECIO * total,
+        "manzanas": total,
+        "juegos_stats.rps": total,
+        "sesiones_juego": total,
+    }
+    obtenido = {
+        "monedas": final["monedas"],
+        "manzanas": final["inventario"]["comidas"].get("manzana", 0),
+        "juegos_stats.rps": final["juegos_stats"]["rps"],
+        "sesiones_juego": kota.historial.total(final["historial"], "sesiones_juego"),
+    }
+    latencias.sort()
+    print(f"{args.escritores} escritores x {args.operaciones} ciclos ({args.almacen}"
+          f"{', sin fusión' if args.sin_fusion else ''}): {total / duracion:.0f} ciclos/s")
+    print(f"  latencia por ciclo: p50 {latencias[len(latencias) // 2] * 1000:.1f} ms"
+          f"  p99 {latencias[int(len(latencias) * 0.99)] * 1000:.1f} ms"
+          f"  max {latencias[-1] * 1000:.1f} ms")
+    print(f"  cerrojo: {cerrojo['conflictos']} fusiones, {cerrojo['reintentos']} reintentos,"
+          f" {cerrojo['espera_s'] * 1000:.0f} ms esperando en total")
+    fallos = 0
+    for clave, valor in esperado.items():
+        ok = obtenido[clave] == valor
+        fallos += not ok
+        print(f"  {clave:18} esperado {valor:8}  obtenido {obtenido[clave]:8}  {'ok' if ok else 'PERDIDAS'}")
+    sys.exit(1 if fallos else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Coste de guardar_datos() tras una acción pequeña (un paseo) según el tamaño
+del historial: volcado JSON completo frente al diario de cambios.
+
+Uso: python3 bench/bench_diario.py [guardados_por_tamaño]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from comun import cargar_script, generar_guardado, mediana_ms
+from kota import diario, historial
+
+TAMANOS = [0, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def medir(kota, almacen, guardados):
+    kota.ALMACEN = almacen
+    with redirect_stdout(io.StringIO()):
+        pet = kota.GeoPet()
+        # El primer guardado tras migrar un historial viejo es un checkpoint completo
+        pet.guardar_datos()
+    tiempos = []
+    total = 0.0
+    for _ in range(guardados):
+        historial.registrar(pet.data["historial"], "paseos", time.time())
+        pet.data["hambre"] -= 0.1
+        t0 = time.perf_counter()
+        pet.guardar_datos()
+        dt = time.perf_counter() - t0
+        tiempos.append(dt)
+        total += dt
+    return mediana_ms(tiempos), total / guardados * 1000
+
+
+def main():
+    guardados = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    kota = cargar_script("+KOTA.py")
+
+    print(f"{'eventos':>10} {'json p50':>10} {'json media':>11} {'diario p50':>11} {'diario media':>13}")
+    anterior = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for eventos in TAMANOS:
+                generar_guardado(kota.FILE_DATA, eventos)
+                json_p50, json_media = medir(kota, "json", guardados)
+
+                generar_guardado(kota.FILE_DATA, eventos)
+                diario.descartar(kota.FILE_DATA)
+                diario_p50, diario_media = medir(kota, "diario", guardados)
+
+                print(f"{eventos:>10} {json_p50:>8.3f}ms {json_media:>9.3f}ms "
+                      f"{diario_p50:>9.3f}ms {diario_media:>11.3f}ms")
+        finally:
+            os.chdir(anterior)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Escrituras por comando. "pedidas" son las veces que el comando marcó cambios
+(antes, cada una era una reescritura completa del guardado); "guardados" las
+que hace ahora confirmar(). Cada guardado escribe dos archivos (el guardado y
+la instantánea del monitor). syscw/wchar salen de /proc/self/io cuando existe.
+
+Uso: python3 bench/bench_escrituras.py
+"""
+
+import builtins
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from comun import cargar_script
+from kota import archivo
+
+# (comando, respuestas para input())
+COMANDOS = [
+    (["estado"], []),
+    (["acariciar"], []),
+    (["pasear"], []),
+    (["tienda"], ["1", "1", "1", "2", "0", "2", "1", "0", "0"]),
+    (["alimentar"], ["1"]),
+    (["jugar", "rps"], ["R"]),
+    (["estado"], []),
+]
+
+
+def io_proceso():
+    try:
+        with open("/proc/self/io") as f:
+            campos = dict(linea.split(": ") for linea in f.read().splitlines())
+        return int(campos["syscw"]), int(campos["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def main():
+    kota = cargar_script("+KOTA.py")
+    cuenta = {"pedidas": 0, "guardados": 0}
+    marcar_original = kota.GeoPet.marcar_cambios
+    guardar_original = kota.GeoPet.guardar_datos
+
+    def marcar_contando(self):
+        cuenta["pedidas"] += 1
+        marcar_original(self)
+
+    def guardar_contando(self):
+        cuenta["guardados"] += 1
+        guardar_original(self)
+
+    kota.GeoPet.marcar_cambios = marcar_contando
+    kota.GeoPet.guardar_datos = guardar_contando
+    kota.GeoPet.limpiar_pantalla = lambda self: None
+    time.sleep = lambda s: None
+
+    print(f"{'comando':<16} {'pedidas':>8} {'guardados':>10} {'archivos':>9} {'bytes':>8} {'syscw':>7} {'wchar':>8}")
+    anterior = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.environ["KOTA_SOCKET"] = os.path.join(tmp, "sin-daemon.sock")
+        try:
+            for argv, respuestas in COMANDOS:
+                entradas = iter(respuestas)
+                builtins.input = lambda prompt="": next(entradas, "0")
+                sys.argv = ["+KOTA.py"] + argv
+                cuenta["pedidas"] = cuenta["guardados"] = 0
+                antes = dict(archivo.ESTADISTICAS)
+                io_antes = io_proceso()
+                with redirect_stdout(io.StringIO()):
+                    kota.main()
+                io_despues = io_proceso()
+                escrituras = archivo.ESTADISTICAS["escrituras"] - antes["escrituras"]
+                bytes_ = archivo.ESTADISTICAS["bytes"] - antes["bytes"]
+                if io_antes and io_despues:
+                    syscw = io_despues[0] - io_antes[0]
+                    wchar = io_despues[1] - io_antes[1]
+                else:
+                    syscw = wchar = "-"
+                print(f"{' '.join(argv):<16} {cuenta['pedidas']:>8} {cuenta['guardados']:>10} "
+                      f"{escrituras:>9} {bytes_:>8} {syscw:>7} {wchar:>8}")
+        finally:
+            os.chdir(anterior)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Modo flota: tick de N mascotas en una pasada por columnas, más carga/guardado
+del archivo, top y búsqueda por nombre.
+
+Uso: python3 bench/bench_flota.py [mascotas]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+import comun  # noqa: F401  (añade la raíz del repo a sys.path)
+from kota.flota import Flota
+
+
+def generar(n, ahora):
+    rnd = random.Random(42)
+    flota = Flota()
+    for i in range(n):
+        flota.agregar(f"mascota{i}", {
+            "hambre": rnd.uniform(0, 100), "energia": rnd.uniform(0, 100),
+            "afecto": rnd.uniform(-50, 100), "estado_dormido": rnd.random() < 0.3,
+            "congelado": rnd.random() < 0.02, "maltrato_acumulado": rnd.uniform(0, 100),
+            "ultima_conexion": ahora - rnd.uniform(0, 3 * 86400),
+            "personalidad": {"privacion_sueno": rnd.uniform(0, 40), "maltrato_psicologico": 0},
+        })
+    return flota
+
+
+def cronometrar(nombre, funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    print(f"{nombre:>22}: {(time.perf_counter() - t0) * 1000:9.1f} ms")
+    return resultado
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    ahora = time.time()
+    flota = generar(n, ahora)
+    print(f"{n} mascotas")
+    cronometrar("tick", lambda: flota.tick(ahora))
+    cronometrar("tick (sin cambios)", lambda: flota.tick(ahora))
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "flota.bin")
+        cronometrar("guardar", lambda: flota.guardar(ruta))
+        cargada = cronometrar("cargar", lambda: Flota.cargar(ruta))
+        print(f"{'tamaño':>22}: {os.path.getsize(ruta) / 1024:9.1f} KB")
+    cronometrar("top 10 estrés", lambda: cargada.top("estres", 10))
+    cronometrar("buscar (1ª, índice)", lambda: cargada.buscar(f"mascota{n // 2}"))
+    cronometrar("buscar (2ª)", lambda: cargada.buscar(f"mascota{n // 3}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Historial acotado: tamaño del guardado y coste de la comprobación de
+evolución según cuántos eventos acumuló la mascota (migrando desde el
+formato viejo de listas sin límite).
+
+Uso: python3 bench/bench_historial.py
+"""
+
+import json
+import time
+
+from comun import datos_sinteticos
+from kota import historial
+
+TAMANOS = [0, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def main():
+    print(f"{'eventos':>10} {'json viejo':>11} {'json acotado':>13} {'migrar':>10} {'total()':>10}")
+    for eventos in TAMANOS:
+        data = datos_sinteticos(eventos)
+        viejo = len(json.dumps(data, indent=4))
+
+        t0 = time.perf_counter()
+        historial.migrar(data["historial"])
+        migrar = time.perf_counter() - t0
+        acotado = len(json.dumps(data, indent=4))
+
+        t0 = time.perf_counter()
+        for _ in range(10_000):
+            historial.total(data["historial"], "paseos")
+        consulta = (time.perf_counter() - t0) / 10_000
+
+        print(f"{eventos:>10} {viejo // 1024:>8} KB {acotado // 1024:>10} KB "
+              f"{migrar * 1000:>8.1f}ms {consulta * 1e9:>8.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
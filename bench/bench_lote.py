@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Un guion de comandos ejecutado como N procesos `+KOTA.py <comando>` contra
+uno solo `+KOTA.py batch`. Cada proceso paga el arranque del intérprete, la
+carga, el procesado offline y un guardado; el lote los paga una vez.
+
+Uso: python3 bench/bench_lote.py [repeticiones]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from comun import RAIZ, generar_guardado, mediana_ms
+
+# Se compra antes de medir: "comprar" solo existe en el lote
+PREPARAR = "comprar comidas manzana 2\n"
+GUION = [
+    "alimentar manzana",
+    "acariciar",
+    "pasear",
+    "alimentar manzana",
+    "acariciar",
+    "renombrar Bench",
+    "jugar rps P",
+]
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    script = os.path.join(RAIZ, "+KOTA.py")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def preparar():
+            generar_guardado(os.path.join(tmp, "mascota_savegame.json"), 1000)
+            subprocess.run([sys.executable, script, "batch"], input=PREPARAR,
+                           cwd=tmp, text=True, capture_output=True, check=True)
+
+        por_proceso, en_lote = [], []
+        for _ in range(repeticiones):
+            preparar()
+            inicio = time.perf_counter()
+            for linea in GUION:
+                subprocess.run([sys.executable, script, *linea.split()], cwd=tmp,
+                               capture_output=True, check=True)
+            por_proceso.append(time.perf_counter() - inicio)
+
+            preparar()
+            inicio = time.perf_counter()
+            subprocess.run([sys.executable, script, "batch"], input="\n".join(GUION) + "\n",
+                           cwd=tmp, text=True, capture_output=True, check=True)
+            en_lote.append(time.perf_counter() - inicio)
+
+    print(f"{len(GUION)} comandos, {repeticiones} repeticiones (mediana)")
+    print(f"  un proceso por comando  {mediana_ms(por_proceso):9.1f} ms")
+    print(f"  kota batch              {mediana_ms(en_lote):9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Motor sin terminal (kota/motor.py): cuántas acciones por minuto simula
+motor.simular() con reloj simulado, sin esperas, preguntas ni disco, con y
+sin traza de sucesos, y que la misma semilla da el mismo resultado.
+
+El cuidador reacciona al estado (come si tiene hambre, duerme si está
+cansada, compra lo que falta) y juega partidas de todos los juegos que se
+pueden jugar sin preguntar.
+
+Uso: python3 bench/bench_motor.py [acciones] [--semilla N]
+"""
+
+import argparse
+import random
+import time
+
+import comun  # noqa: F401  (pone la raíz del repo en sys.path)
+from kota import motor
+
+INICIO = 1_700_000_000.0
+
+
+def cuidador(semilla):
+    rng = random.Random(semilla)
+
+    def siguiente(m):
+        d = m.data
+        espera = rng.uniform(300, 3600)
+        if d["estado_dormido"]:
+            return (espera, "dormir") if d["energia"] > 90 else (espera * 4, "dormir")
+        if d["energia"] < 30:
+            return espera, "dormir"
+        if d["hambre"] < 50:
+            if d["inventario"]["comidas"].get("manzana", 0) <= 0:
+                return espera, "comprar", "comidas", "manzana", 3
+            return espera, "alimentar", "manzana"
+        r = rng.random()
+        if r < 0.25:
+            return espera, "jugar", "rps", rng.choice("RPT")
+        if r < 0.35:
+            return espera, "jugar", "tictactoe", "".join(rng.sample("123456789", 5))
+        if r < 0.5:
+            return espera, "jugar", "pares", f"{rng.choice('PN')} {rng.randint(0, 5)}"
+        if r < 0.75:
+            return espera, "pasear"
+        return espera, "acariciar"
+
+    return siguiente
+
+
+def medir(acciones, semilla, trazar):
+    t0 = time.perf_counter()
+    m = motor.simular(cuidador(semilla), inicio=INICIO, semilla=semilla, trazar=trazar,
+                      limite=acciones)
+    return m, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("acciones", type=int, nargs="?", default=200_000)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'traza':>6} {'acciones':>9} {'segundos':>9} {'M/min':>7} {'sucesos':>9} "
+          f"{'días':>6} {'nivel':>6} {'estado':>9}")
+    for trazar in (False, True):
+        m, segundos = medir(args.acciones, args.semilla, trazar)
+        dias = (m.reloj() - INICIO) / 86400
+        sucesos = len(m.sucesos) if m.sucesos is not None else 0
+        print(f"{'sí' if trazar else 'no':>6} {m.pasos:>9} {segundos:>9.2f} "
+              f"{m.pasos / segundos * 60 / 1e6:>7.1f} {sucesos:>9} {dias:>6.0f} "
+              f"{m.data['nivel']:>6} {m.data['status']:>9}")
+
+    a, _ = medir(5000, args.semilla, True)
+    b, _ = medir(5000, args.semilla, True)
+    print(f"\nmisma semilla, mismo resultado: {a.data == b.data and a.sucesos == b.sucesos}")
+
+
+if __name__ == "__main__":
+    main()
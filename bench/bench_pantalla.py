@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Coste de redibujar la pantalla de estado: mostrar_estado() (limpia y
+reescribe todo) frente al cuadro incremental de `kota shell`
+(kota/pantalla.py), con un cambio pequeño entre cuadros como en el shell.
+También mide armar la pantalla (lineas_estado) con el mismo estado una y
+otra vez, que es lo que hace el shell mientras espera.
+
+Uso: python3 bench/bench_pantalla.py [cuadros]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from comun import cargar_script, generar_guardado, mediana_ms
+from kota import dibujo
+from kota.pantalla import Pantalla
+
+
+def main():
+    cuadros = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    kota = cargar_script("+KOTA.py")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        generar_guardado(kota.FILE_DATA, 1000)
+        pet = kota.GeoPet()
+
+        completo, bytes_completo = [], 0
+        for i in range(cuadros):
+            pet.data["hambre"] = 50 + i % 10
+            salida = io.StringIO()
+            t0 = time.perf_counter()
+            with redirect_stdout(salida):
+                pet.mostrar_estado()
+            completo.append(time.perf_counter() - t0)
+            bytes_completo += len(salida.getvalue().encode("utf-8"))
+
+        with open(os.devnull, "wb") as nulo:
+            pantalla = Pantalla(nulo.fileno())
+            escribir = pantalla.escribir
+            escrito = [0]
+
+            def escribir_contando(texto):
+                escrito[0] += len(texto.encode("utf-8"))
+                escribir(texto)
+
+            pantalla.escribir = escribir_contando
+            incremental = []
+            for i in range(cuadros):
+                pet.data["hambre"] = 50 + i % 10
+                t0 = time.perf_counter()
+                pantalla.dibujar(pet.lineas_estado(), kota.PROMPT_SHELL)
+                incremental.append(time.perf_counter() - t0)
+
+        repetido = []
+        for _ in range(cuadros):
+            t0 = time.perf_counter()
+            pet.lineas_estado()
+            repetido.append(time.perf_counter() - t0)
+
+    print(f"{cuadros} cuadros (mediana por cuadro)")
+    print(f"  mostrar_estado   {mediana_ms(completo):8.3f} ms  {bytes_completo // cuadros:6} bytes/cuadro")
+    print(f"  incremental      {mediana_ms(incremental):8.3f} ms  {escrito[0] // cuadros:6} bytes/cuadro"
+          f"  {pantalla.escrituras / cuadros:.1f} write/cuadro")
+    print(f"  lineas_estado    {mediana_ms(repetido):8.3f} ms  (mismo estado)")
+    figuras = dibujo.sprite.cache_info()
+    print(f"  caché de figuras: {figuras.hits} aciertos, {figuras.misses} construidas")
+
+
+if __name__ == "__main__":
+    main()
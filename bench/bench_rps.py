@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Rival adaptativo de piedra, papel o tijera (kota/juegos/rps.py) contra jugadores
+con costumbres: cuántas rondas gana el rival frente a elegir al azar (lo que
+hacía juego_rps antes), cuánto tarda cada ronda y cuánto ocupa su memoria
+después de muchas rondas.
+
+Uso: python3 bench/bench_rps.py [rondas] [--semilla N]
+"""
+
+import argparse
+import json
+import random
+import time
+
+import comun  # noqa: F401  (pone la raíz del repo en sys.path)
+from kota.juegos import rps
+
+JUGADAS = rps.JUGADAS
+PIERDE_CON = {v: k for k, v in rps.GANA_A.items()}
+
+
+# Cada jugador recibe (rng, sus jugadas, las del rival, ronda) y devuelve la suya
+def sesgado(rng, mias, suyas, n):
+    return rng.choices(JUGADAS, weights=(50, 25, 25))[0]
+
+
+def ciclo(rng, mias, suyas, n):
+    return JUGADAS[n % 3]
+
+
+def repite(rng, mias, suyas, n):
+    # Repite su última jugada el 70% de las veces
+    if mias and rng.random() < 0.7:
+        return mias[-1]
+    return rng.choice(JUGADAS)
+
+
+def gana_al_anterior(rng, mias, suyas, n):
+    # Costumbre humana típica: sacar lo que le habría ganado al rival
+    return rps.GANA_A[suyas[-1]] if suyas and rng.random() < 0.8 else rng.choice(JUGADAS)
+
+
+def cambia_al_perder(rng, mias, suyas, n):
+    # Si pierde pasa a la que le habría ganado; si gana o empata, repite
+    if not mias:
+        return rng.choice(JUGADAS)
+    if rps.GANA_A[mias[-1]] == suyas[-1]:
+        return rps.GANA_A[suyas[-1]]
+    return mias[-1]
+
+
+def cambia_de_estrategia(rng, mias, suyas, n):
+    # Cada 200 rondas pasa de un patrón a otro
+    return (ciclo, repite, gana_al_anterior)[n // 200 % 3](rng, mias, suyas, n)
+
+
+def aleatorio(rng, mias, suyas, n):
+    return rng.choice(JUGADAS)
+
+
+JUGADORES = (sesgado, ciclo, repite, gana_al_anterior, cambia_al_perder,
+             cambia_de_estrategia, aleatorio)
+
+
+def partida(jugador, rondas, semilla, adaptativo):
+    rng_jugador, rng_rival = random.Random(semilla), random.Random(semilla + 1)
+    ia = {"rps_history": []}
+    mias, suyas = [], []
+    gana = empata = 0
+    inicio = time.perf_counter()
+    for n in range(rondas):
+        if adaptativo:
+            rival = rps.elegir(ia, rng_rival)
+        else:
+            rival = rng_rival.choice(JUGADAS)
+        jugada = jugador(rng_jugador, mias, suyas, n)
+        if adaptativo:
+            rps.aprender(ia, jugada, rival)
+        mias.append(jugada)
+        suyas.append(rival)
+        gana += PIERDE_CON[rival] == jugada
+        empata += rival == jugada
+    segundos = time.perf_counter() - inicio
+    return gana / rondas, empata / rondas, segundos / rondas, len(json.dumps(ia))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rondas", type=int, nargs="?", default=3000)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.rondas} rondas por jugador (% de rondas que gana el rival)")
+    print(f"{'jugador':22} {'azar':>7} {'adaptativo':>11} {'empates':>8} {'µs/ronda':>9} {'memoria':>8}")
+    for jugador in JUGADORES:
+        azar, _, _, _ = partida(jugador, args.rondas, args.semilla, False)
+        gana, empata, por_ronda, memoria = partida(jugador, args.rondas, args.semilla, True)
+        print(f"{jugador.__name__:22} {azar * 100:6.1f}% {gana * 100:10.1f}% {empata * 100:7.1f}% "
+              f"{por_ronda * 1e6:9.1f} {memoria:6} B")
+
+    # Coste y tamaño no dependen de cuántas rondas se hayan jugado
+    print(f"\n{'rondas':>9} {'µs/ronda':>9} {'memoria':>8}")
+    for rondas in (100, 10_000, 100_000):
+        _, _, por_ronda, memoria = partida(repite, rondas, args.semilla, True)
+        print(f"{rondas:9} {por_ronda * 1e6:9.1f} {memoria:6} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Coste de simulacion.avanzar() según la duración de la ausencia: al ser forma
+cerrada debe ser el mismo para un minuto que para un año.
+
+Uso: python3 bench/bench_simulacion.py [repeticiones]
+"""
+
+import sys
+import time
+
+import comun  # noqa: F401  (añade la raíz del repo a sys.path)
+from kota import simulacion
+
+AUSENCIAS = [("1 minuto", 60), ("1 hora", 3600), ("1 día", 86400),
+             ("1 mes", 30 * 86400), ("1 año", 365 * 86400)]
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    estado = {"hambre": 90.0, "energia": 60.0, "afecto": 50.0, "privacion_sueno": 0,
+              "maltrato_acumulado": 0, "estado_dormido": False}
+    inicio = time.time()
+
+    print(f"{'ausencia':>10} {'µs/llamada':>11} {'noches':>7} {'afecto':>7} {'maltrato':>9}")
+    for nombre, segundos in AUSENCIAS:
+        fin = inicio + segundos
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            resultado = simulacion.avanzar(estado, inicio, fin)
+        us = (time.perf_counter() - t0) / repeticiones * 1e6
+        noches = resultado["maltrato_acumulado"] // simulacion.PENALIZACION_NOCTURNA
+        print(f"{nombre:>10} {us:>11.2f} {noches:>7} {resultado['afecto']:>7.0f} "
+              f"{resultado['maltrato_acumulado']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Mide la latencia de +KOTA_STATUS.py según el tamaño del historial,
+leyendo la instantánea (camino rápido) frente al guardado JSON completo.
+
+Uso: python3 bench/bench_status.py [repeticiones]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from comun import cargar_script, generar_guardado, mediana_ms
+from kota import snapshot
+
+TAMANOS = [0, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def medir(status, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            status.main()
+        tiempos.append(time.perf_counter() - t0)
+    return mediana_ms(tiempos)
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    status = cargar_script("+KOTA_STATUS.py")
+
+    print(f"{'eventos':>10} {'guardado':>12} {'snapshot ms':>12} {'json ms':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "mascota_savegame.json")
+        status.JSON_PATH = ruta
+        for eventos in TAMANOS:
+            data = generar_guardado(ruta, eventos)
+            tamano = os.path.getsize(ruta)
+
+            snapshot.escribir(ruta, data)
+            rapido = medir(status, repeticiones)
+
+            snapshot.borrar(ruta)
+            lento = medir(status, max(3, repeticiones // 10))
+
+            print(f"{eventos:>10} {tamano // 1024:>9} KB {rapido:>12.3f} {lento:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
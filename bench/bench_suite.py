@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Suite de rendimiento de +KOTA según la edad de la mascota.
+
+Para cada tamaño de historial (número de eventos) genera un guardado
+sintético y mide, dentro de un mismo proceso:
+
+    status       +KOTA_STATUS.main() con la instantánea que deja un guardado
+    status_frio  +KOTA_STATUS.main() sin instantánea (lee el guardado entero)
+    cargar       GeoPet(): carga + procesar_tiempo_offline
+    guardar      guardar_datos() tras un cambio pequeño
+    estado       mostrar_estado()
+    guion        GUION completo como en `kota batch`, desde el guardado generado
+
+De cada operación informa min/p50/p90/p99/max y el pico de memoria
+(tracemalloc, en una pasada aparte para no inflar los tiempos). Con
+--salida escribe todo en JSON para comparar versiones:
+
+    python3 bench/bench_suite.py --salida antes.json
+    python3 bench/bench_suite.py --salida despues.json
+    python3 bench/bench_suite.py comparar antes.json despues.json
+
+Solo generar un guardado (para probar a mano):
+
+    python3 bench/bench_suite.py generar 1000000 mascota_savegame.json --formato listas
+
+El backend es el de KOTA_ALMACEN (o --almacen).
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from comun import RAIZ, cargar_script, guardado_envejecido
+
+OPERACIONES = ("status", "status_frio", "cargar", "guardar", "estado", "guion")
+TAMANOS = (0, 1000, 10000, 100000, 1000000)
+FORMATOS = ("acotado", "listas")
+GUION = [
+    "comprar comidas manzana 2",
+    "alimentar manzana",
+    "acariciar",
+    "pasear",
+    "jugar rps P",
+    "alimentar manzana",
+    "renombrar Bench",
+]
+# Aunque se acabe el presupuesto de tiempo, cada operación se mide al menos esto
+MIN_REPETICIONES = 3
+
+
+def percentil(orden, q):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    i = max(0, min(len(orden) - 1, math.ceil(q * len(orden)) - 1))
+    return orden[i]
+
+
+def resumen(tiempos):
+    orden = sorted(tiempos)
+    ms = lambda s: round(s * 1000, 4)
+    return {
+        "n": len(orden), "min": ms(orden[0]), "p50": ms(percentil(orden, 0.5)),
+        "p90": ms(percentil(orden, 0.9)), "p99": ms(percentil(orden, 0.99)),
+        "max": ms(orden[-1]), "media": ms(sum(orden) / len(orden)),
+    }
+
+
+def medir(funcion, repeticiones, presupuesto, preparar=None):
+    """
+    Tiempos de `funcion` (preparar() va antes de cada llamada y no se mide)
+    y, aparte, su pico de memoria en una llamada más.
+    """
+    tiempos = []
+    inicio = time.perf_counter()
+    while len(tiempos) < repeticiones:
+        if len(tiempos) >= MIN_REPETICIONES and time.perf_counter() - inicio > presupuesto:
+            break
+        if preparar:
+            preparar()
+        t0 = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - t0)
+    if preparar:
+        preparar()
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    resultado = resumen(tiempos)
+    resultado["pico_kb"] = pico // 1024
+    return resultado
+
+
+def callado(funcion):
+    def envuelta():
+        with redirect_stdout(io.StringIO()):
+            return funcion()
+    return envuelta
+
+
+def medir_tamano(kota, status, eventos, formato, args):
+    """Todas las operaciones sobre un guardado de `eventos` eventos."""
+    ruta = os.path.abspath(kota.FILE_DATA)
+    contenido = json.dumps(guardado_envejecido(eventos, formato, semilla=args.semilla), indent=4)
+    tamano = len(contenido.encode("utf-8"))
+
+    def restaurar():
+        # El guardado generado, sin nada de lo que dejan los guardados anteriores
+        kota.almacen.borrar(ruta)
+        with open(ruta, "w") as f:
+            f.write(contenido)
+
+    def guion():
+        pet = kota.GeoPet()
+        for linea in GUION:
+            comando, *resto = linea.split()
+            kota.ejecutar_en_lote(pet, comando, resto)
+        pet.confirmar()
+
+    resultados = {}
+    medida = lambda funcion, preparar=None: medir(callado(funcion), args.repeticiones,
+                                                  args.presupuesto, preparar)
+
+    restaurar()
+    resultados["status_frio"] = medida(status.main)
+    resultados["cargar"] = medida(kota.GeoPet)
+    resultados["guion"] = medida(guion, restaurar)
+
+    # Mascota ya cargada; el primer guardado (migración, checkpoint) no cuenta
+    restaurar()
+    pet = callado(kota.GeoPet)()
+    pet.guardar_datos()
+
+    def cambio_y_guardado():
+        pet.data["hambre"] = max(0.0, pet.data["hambre"] - 0.01)
+        kota.historial.registrar(pet.data["historial"], "paseos", time.time())
+        pet.guardar_datos()
+
+    resultados["guardar"] = medida(cambio_y_guardado)
+    resultados["estado"] = medida(pet.mostrar_estado)
+    resultados["status"] = medida(status.main)
+
+    return [dict(formato=formato, eventos=eventos, bytes=tamano, operacion=op, **resultados[op])
+            for op in OPERACIONES]
+
+
+def version():
+    try:
+        r = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                           capture_output=True, text=True)
+        return r.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def pico_proceso_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def imprimir(resultados, encabezado=True):
+    if encabezado:
+        print(f"{'formato':8} {'eventos':>8} {'bytes':>10} {'operación':12} {'n':>3} "
+              f"{'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'pico KB':>8}")
+    for r in resultados:
+        print(f"{r['formato']:8} {r['eventos']:8} {r['bytes']:10} {r['operacion']:12} {r['n']:3} "
+              f"{r['p50']:9.3f} {r['p90']:9.3f} {r['p99']:9.3f} {r['max']:9.3f} {r['pico_kb']:8}")
+
+
+def correr(args):
+    if args.almacen:
+        os.environ["KOTA_ALMACEN"] = args.almacen
+    tamanos = [int(t) for t in args.tamanos.split(",")]
+    formatos = FORMATOS if args.formato == "ambos" else (args.formato,)
+    salida = os.path.abspath(args.salida) if args.salida else None
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        # Se cargan ya dentro del directorio temporal: FILE_DATA es relativo
+        kota = cargar_script("+KOTA.py")
+        status = cargar_script("+KOTA_STATUS.py")
+        status.JSON_PATH = os.path.abspath(kota.FILE_DATA)
+        for formato in formatos:
+            for eventos in tamanos:
+                filas = medir_tamano(kota, status, eventos, formato, args)
+                imprimir(filas, encabezado=not resultados)
+                resultados.extend(filas)
+        os.chdir(RAIZ)
+
+    informe = {
+        "meta": {
+            "version": version(), "python": platform.python_version(),
+            "plataforma": platform.platform(), "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "almacen": kota.ALMACEN, "repeticiones": args.repeticiones,
+            "presupuesto_s": args.presupuesto, "semilla": args.semilla, "guion": GUION,
+            "pico_proceso_kb": pico_proceso_kb(),
+        },
+        "resultados": resultados,
+    }
+    print(f"\npico del proceso: {informe['meta']['pico_proceso_kb']} KB")
+    if salida:
+        with open(salida, "w") as f:
+            json.dump(informe, f, indent=2)
+        print(f"resultados en {salida}")
+
+
+def comparar(args):
+    with open(args.antes) as f:
+        antes = json.load(f)
+    with open(args.despues) as f:
+        despues = json.load(f)
+    clave = lambda r: (r["formato"], r["eventos"], r["operacion"])
+    previos = {clave(r): r for r in antes["resultados"]}
+    print(f"antes: {antes['meta']['version']}  después: {despues['meta']['version']}")
+    print(f"{'formato':8} {'eventos':>8} {'operación':12} {'p50 antes':>10} {'p50 después':>12} "
+          f"{'x':>7} {'pico KB':>15}")
+    for r in despues["resultados"]:
+        a = previos.get(clave(r))
+        if a is None:
+            continue
+        razon = r["p50"] / a["p50"] if a["p50"] else float("inf")
+        print(f"{r['formato']:8} {r['eventos']:8} {r['operacion']:12} {a['p50']:10.3f} "
+              f"{r['p50']:12.3f} {razon:7.2f} {a['pico_kb']:7}->{r['pico_kb']:<7}")
+
+
+def generar(args):
+    data = guardado_envejecido(args.eventos, args.formato, semilla=args.semilla)
+    with open(args.ruta, "w") as f:
+        json.dump(data, f, indent=4)
+    print(f"{args.ruta}: {args.eventos} eventos ({args.formato}), {os.path.getsize(args.ruta)} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de rendimiento de +KOTA")
+    parser.add_argument("--tamanos", default=",".join(map(str, TAMANOS)),
+                        help="eventos de historial, separados por comas")
+    parser.add_argument("--formato", choices=FORMATOS + ("ambos",), default="ambos")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--presupuesto", type=float, default=3.0,
+                        help="segundos máximos por operación (mínimo %d repeticiones)" % MIN_REPETICIONES)
+    parser.add_argument("--almacen", choices=("json", "diario", "binario", "sqlite"))
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo JSON con los resultados")
+    parser.set_defaults(accion=correr)
+    sub = parser.add_subparsers()
+
+    p = sub.add_parser("comparar", help="compara dos archivos de --salida")
+    p.add_argument("antes")
+    p.add_argument("despues")
+    p.set_defaults(accion=comparar)
+
+    p = sub.add_parser("generar", help="solo escribe un guardado sintético")
+    p.add_argument("eventos", type=int)
+    p.add_argument("ruta")
+    p.add_argument("--formato", choices=FORMATOS, default="acotado")
+    p.add_argument("--semilla", type=int, default=0)
+    p.set_defaults(accion=generar)
+
+    args = parser.parse_args()
+    args.accion(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Utilidades compartidas por los benchmarks de bench/.
+"""
+
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+
+def cargar_script(nombre):
+    """Importa +KOTA.py / +KOTA_STATUS.py (el '+' impide un import normal)."""
+    spec = importlib.util.spec_from_file_location(nombre.replace("+", "_").replace(".py", ""),
+                                                  os.path.join(RAIZ, nombre))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def datos_sinteticos(eventos, ahora=None):
+    """Guardado con `eventos` entradas repartidas entre alimentaciones y paseos."""
+    ahora = time.time() if ahora is None else ahora
+    return {
+        "nombre": "Bench", "hambre": 80.0, "energia": 70.0, "afecto": 40.0,
+        "ultima_conexion": ahora, "estado_dormido": False, "congelado": False,
+        "status": "vivo", "personalidad": {"estres": 12},
+        "historial": {
+            "alimentaciones": [ahora - i for i in range(eventos // 2)],
+            "paseos": [ahora - i for i in range(eventos - eventos // 2)],
+            "ciclos_sueno": [], "sesiones_juego": [],
+        },
+    }
+
+
+# Cómo se reparten los eventos de una mascota vieja entre las series
+REPARTO = (("alimentaciones", 0.4), ("paseos", 0.25), ("sesiones_juego", 0.2), ("ciclos_sueno", 0.15))
+EVENTOS_POR_DIA = 20
+
+
+def guardado_envejecido(eventos, formato="acotado", ahora=None, semilla=0):
+    """
+    Guardado de una mascota que vivió lo suficiente para acumular `eventos`
+    (unos EVENTOS_POR_DIA por día), repartidos entre las cuatro series.
+    formato "listas" es el guardado de antes del historial acotado (las
+    listas crecen sin límite); "acotado" es lo que escribe la versión actual.
+    """
+    from kota import historial
+
+    rng = random.Random(semilla)
+    ahora = time.time() if ahora is None else ahora
+    dias = max(1.0, eventos / EVENTOS_POR_DIA)
+    inicio = ahora - dias * 86400
+    data = datos_sinteticos(0, ahora)
+    series = {nombre: [] for nombre, _ in REPARTO}
+    for i in range(eventos):
+        t = inicio + (i + rng.random()) * (ahora - inicio) / eventos
+        r = rng.random()
+        for nombre, peso in REPARTO:
+            r -= peso
+            if r < 0:
+                break
+        if nombre == "ciclos_sueno":
+            evento = {"inicio": t, "energia_inicio": round(rng.uniform(5, 80), 1)}
+        elif nombre == "sesiones_juego":
+            evento = {"t": t, "juego": rng.choice(("rps", "adivina", "pares")),
+                      "gano": rng.random() < 0.5}
+        else:
+            evento = t
+        series[nombre].append(evento)
+    data["historial"] = series
+    if formato == "acotado":
+        historial.migrar(data["historial"])
+    elif formato != "listas":
+        raise ValueError(f"formato desconocido: {formato}")
+    # Lo demás que crece con la edad (contadores, no listas)
+    juegos = len(series["sesiones_juego"])
+    data.update(nivel=1 + int(dias ** 0.5), monedas=100 + int(dias) * 3,
+                juegos_stats={"rps": juegos // 2, "tictactoe": 0, "pares": juegos // 4,
+                              "adivina": juegos - juegos // 2 - juegos // 4})
+    return data
+
+
+def generar_guardado(ruta, eventos):
+    data = datos_sinteticos(eventos)
+    with open(ruta, "w") as f:
+        json.dump(data, f, indent=4)
+    return data
+
+
+def mediana_ms(tiempos):
+    tiempos = sorted(tiempos)
+    return tiempos[len(tiempos) // 2] * 1000
@@ -0,0 +1,3 @@
+"""
+Módulos compartidos por +KOTA.py y +KOTA_STATUS.py.
+"""
@@ -0,0 +1,371 @@
+"""
+Backends del guardado de +KOTA (KOTA_ALMACEN).
+
+GeoPet no sabe dónde vive el guardado: carga con abrir() y guarda con el
+backend de KOTA_ALMACEN. Todos tienen la misma forma:
+
+    cargar()                dict guardado, o None si no hay guardado
+    preparar(data, seq, migrado)
+                            línea base para guardar solo lo que cambie
+    marcar(data, seq)       nueva línea base (tras fusionar con el disco)
+    guardar(data)           escribe; sin línea base, el guardado completo
+    eventos(historial, serie, desde, hasta)
+                            eventos de una serie en un rango de tiempo
+    archivos()              rutas que ocupa en disco
+
+  json     mascota_savegame.json completo en cada guardado
+  diario   el JSON como checkpoint + líneas con los cambios (kota/diario.py)
+  binario  mascota_savegame.kota (kota/binario.py)
+  sqlite   mascota_savegame.db: una fila por clave de primer nivel y todos
+           los eventos del historial en una tabla indexada por tiempo
+
+El guardado vive en un solo backend: después de guardar se borran los
+archivos de los demás, así que cambiar KOTA_ALMACEN migra en el siguiente
+guardado. Al cargar se busca SQLite, luego binario, luego JSON + diario.
+"""
+
+import json
+import os
+
+from kota import archivo, perezoso
+from kota import historial as hist
+
+binario = perezoso.modulo("kota.binario")
+diario = perezoso.modulo("kota.diario")
+snapshot = perezoso.modulo("kota.snapshot")
+sqlite3 = perezoso.modulo("sqlite3")
+
+
+def _instantanea(ruta, data):
+    # Sidecar para el monitor: si falla, el monitor lee el guardado completo
+    try:
+        snapshot.escribir(ruta, data)
+    except OSError:
+        pass
+
+
+def _filtrar(eventos, desde, hasta):
+    return [e for e in eventos
+            if (desde is None or hist.marca_tiempo(e) >= desde)
+            and (hasta is None or hist.marca_tiempo(e) < hasta)]
+
+
+class Json:
+    nombre = "json"
+
+    def __init__(self, ruta_guardado):
+        self.ruta_guardado = ruta_guardado
+        self.seq = 0
+
+    def archivos(self):
+        return (self.ruta_guardado, diario.ruta_diario(self.ruta_guardado))
+
+    def existe(self):
+        return any(os.path.exists(ruta) for ruta in self.archivos())
+
+    def cargar(self):
+        # Checkpoint + diario de cambios, si lo hay
+        data = diario.cargar(self.ruta_guardado)
+        if data is not None:
+            self.seq = data.pop(diario.CLAVE_SEQ, 0)
+        return data
+
+    def preparar(self, data, seq=0, migrado=False):
+        self.seq = seq
+
+    def marcar(self, data, seq=0):
+        self.seq = seq
+
+    def guardar(self, data):
+        archivo.escribir_atomico(self.ruta_guardado, json.dumps(data, indent=4))
+        # El guardado completo ya incluye lo que hubiera en el diario
+        diario.descartar(self.ruta_guardado)
+        _instantanea(self.ruta_guardado, data)
+
+    def eventos(self, historial, serie, desde=None, hasta=None):
+        """Sin índice: solo los últimos eventos, los que guarda el historial acotado."""
+        return _filtrar(hist.recientes(historial, serie), desde, hasta)
+
+
+class Diario(Json):
+    nombre = "diario"
+
+    def __init__(self, ruta_guardado):
+        super().__init__(ruta_guardado)
+        self.diario = None
+
+    def preparar(self, data, seq=0, migrado=False):
+        self.seq = seq
+        self.diario = diario.Diario(self.ruta_guardado, data, seq)
+        # Tras migrar un guardado viejo, checkpoint nuevo en el próximo guardado
+        self.diario.compactar_pronto = migrado
+
+    def marcar(self, data, seq=0):
+        self.seq = seq
+        if self.diario is not None:
+            # El diff del diario va contra lo que hay en disco, con su secuencia
+            self.diario.seq = seq
+            self.diario.marcar(data)
+
+    def guardar(self, data):
+        if self.diario is None:
+            # Cargado para leer (p. ej. escapó al procesar el tiempo): sin
+            # línea base para el diff, se escribe un checkpoint completo
+            self.diario = diario.Diario(self.ruta_guardado, data, self.seq)
+            self.diario.compactar(data)
+        else:
+            self.diario.registrar(data)
+        self.seq = self.diario.seq
+        _instantanea(self.ruta_guardado, data)
+
+
+class Binario(Json):
+    nombre = "binario"
+
+    def __init__(self, ruta_guardado):
+        super().__init__(ruta_guardado)
+        # = binario.ruta_binario(): detectar() no necesita importar el formato
+        self.ruta = os.path.splitext(ruta_guardado)[0] + ".kota"
+
+    def archivos(self):
+        return (self.ruta,)
+
+    def cargar(self):
+        if not os.path.exists(self.ruta):
+            return None
+        return binario.cargar(self.ruta)
+
+    def guardar(self, data):
+        binario.guardar(self.ruta, data)
+        # El monitor lee la cabecera del binario
+        snapshot.borrar(self.ruta_guardado)
+
+
+# ==========================================================
+# SQLITE
+# ==========================================================
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS estado (clave TEXT PRIMARY KEY, valor TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS eventos (
+    id INTEGER PRIMARY KEY,
+    serie TEXT NOT NULL,
+    t REAL NOT NULL,
+    datos TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS eventos_serie_t ON eventos (serie, t);
+"""
+# Cada serie del historial acotado es su propia fila de `estado`
+PREFIJO_SERIE = "historial."
+
+
+def ruta_sqlite(ruta_guardado):
+    return os.path.splitext(ruta_guardado)[0] + ".db"
+
+
+def _texto(valor):
+    return json.dumps(valor, separators=(",", ":"))
+
+
+class Sqlite:
+    """
+    `estado` guarda cada clave de primer nivel como JSON compacto; un guardado
+    reescribe solo las filas cuyo texto cambió (hambre, monedas...) y añade a
+    `eventos` los eventos nuevos del historial. La línea base son los textos
+    leídos al cargar, así que no cuesta una copia de `data`.
+    """
+
+    nombre = "sqlite"
+
+    def __init__(self, ruta_guardado):
+        self.ruta_guardado = ruta_guardado
+        self.ruta = ruta_sqlite(ruta_guardado)
+        self.seq = 0
+        # {clave: texto} de lo que hay en disco y total de cada serie; None:
+        # no hay línea base y el próximo guardado reescribe todo
+        self._base = None
+        self._totales = {}
+
+    def archivos(self):
+        return (self.ruta,)
+
+    def existe(self):
+        return os.path.exists(self.ruta)
+
+    def _conectar(self):
+        return sqlite3.connect(self.ruta)
+
+    def _filas(self, data):
+        filas = {}
+        for clave, valor in data.items():
+            if clave == "historial" and isinstance(valor, dict):
+                for serie, eventos in valor.items():
+                    filas[PREFIJO_SERIE + serie] = _texto(eventos)
+            else:
+                filas[clave] = _texto(valor)
+        return filas
+
+    def cargar(self):
+        if not self.existe():
+            return None
+        con = self._conectar()
+        try:
+            filas = dict(con.execute("SELECT clave, valor FROM estado"))
+        except sqlite3.OperationalError:
+            # Base creada sin llegar a guardar nada (corte a mitad)
+            return None
+        finally:
+            con.close()
+        if not filas:
+            return None
+
+        data = {}
+        for clave, texto in filas.items():
+            if clave.startswith(PREFIJO_SERIE):
+                data.setdefault("historial", {})[clave[len(PREFIJO_SERIE):]] = json.loads(texto)
+            else:
+                data[clave] = json.loads(texto)
+        self._base = filas
+        self._totales = {s: hist.total(data["historial"], s) for s in data.get("historial", {})}
+        return data
+
+    def preparar(self, data, seq=0, migrado=False):
+        # La línea base ya es lo leído en cargar()
+        pass
+
+    def marcar(self, data, seq=0):
+        if self._base is None:
+            # Aún no hay base en disco: el próximo guardado la escribe entera
+            return
+        self._base = self._filas(data)
+        historial = data.get("historial", {})
+        self._totales = {s: hist.total(historial, s) for s in historial}
+
+    def _eventos_nuevos(self, historial):
+        """[(serie, t, datos)] a insertar y series que hay que vaciar antes."""
+        nuevos, reiniciadas = [], []
+        for serie in historial:
+            actual = hist.total(historial, serie)
+            previo = self._totales.get(serie, 0) if self._base is not None else 0
+            if actual == previo:
+                continue
+            recientes = hist.recientes(historial, serie)
+            if previo < actual:
+                # Si entraron más de los que caben en el buffer, los que se
+                # salieron ya no se pueden recuperar
+                recientes = recientes[max(0, len(recientes) - (actual - previo)):]
+            else:
+                reiniciadas.append(serie)
+            nuevos.extend((serie, hist.marca_tiempo(e), _texto(e)) for e in recientes)
+        return nuevos, reiniciadas
+
+    def guardar(self, data):
+        filas = self._filas(data)
+        historial = data.get("historial", {})
+        if not isinstance(historial, dict):
+            historial = {}
+        nuevos, reiniciadas = self._eventos_nuevos(historial)
+
+        con = self._conectar()
+        try:
+            con.executescript(ESQUEMA)
+            with con:
+                if self._base is None:
+                    # Guardado completo (otro backend, importar...): la mascota
+                    # es otra, sus eventos empiezan por los del buffer
+                    con.execute("DELETE FROM estado")
+                    con.execute("DELETE FROM eventos")
+                    cambios = filas
+                    borradas = []
+                else:
+                    cambios = {k: v for k, v in filas.items() if self._base.get(k) != v}
+                    borradas = [(k,) for k in self._base if k not in filas]
+                con.executemany("INSERT OR REPLACE INTO estado (clave, valor) VALUES (?, ?)",
+                                cambios.items())
+                con.executemany("DELETE FROM estado WHERE clave = ?", borradas)
+                con.executemany("DELETE FROM eventos WHERE serie = ?", [(s,) for s in reiniciadas])
+                con.executemany("INSERT INTO eventos (serie, t, datos) VALUES (?, ?, ?)", nuevos)
+        finally:
+            con.close()
+        self._base = filas
+        self._totales = {s: hist.total(historial, s) for s in historial}
+        # La instantánea va ligada al .db (mtime y tamaño cambian en cada commit)
+        _instantanea(self.ruta, data)
+
+    def eventos(self, historial, serie, desde=None, hasta=None):
+        """Todos los eventos guardados de `serie` con desde <= t < hasta, por el índice."""
+        if not self.existe():
+            return Json.eventos(self, historial, serie, desde, hasta)
+        consulta = "SELECT datos FROM eventos WHERE serie = ? AND t >= ? AND t < ? ORDER BY t, id"
+        con = self._conectar()
+        try:
+            filas = con.execute(consulta, (serie, -1e300 if desde is None else desde,
+                                           1e300 if hasta is None else hasta)).fetchall()
+        except sqlite3.OperationalError:
+            filas = []
+        finally:
+            con.close()
+        return [json.loads(datos) for datos, in filas]
+
+
+ALMACENES = {"json": Json, "diario": Diario, "binario": Binario, "sqlite": Sqlite}
+
+
+def crear(nombre, ruta_guardado):
+    """Backend `nombre` (uno de ALMACENES); uno desconocido cuenta como json."""
+    return ALMACENES.get(nombre, Json)(ruta_guardado)
+
+
+def detectar(ruta_guardado, nombre="json"):
+    """
+    Backend que tiene el guardado en disco. JSON y diario comparten archivos:
+    entre los dos se elige `nombre` (el de KOTA_ALMACEN) para poder guardar
+    con la misma instancia.
+    """
+    for clase in (Sqlite, Binario):
+        backend = clase(ruta_guardado)
+        if backend.existe():
+            return backend
+    return Diario(ruta_guardado) if nombre == "diario" else Json(ruta_guardado)
+
+
+def abrir(ruta_guardado, nombre="json"):
+    """
+    (backend, dict guardado) con el cerrojo ya tomado: el primer backend en
+    el orden de detectar() que tenga archivos y algo que cargar. Un backend a
+    medias (p. ej. una base SQLite vacía) no tapa el guardado de otro; solo
+    si ninguno tiene nada es (detectar(), None), una mascota nueva.
+    """
+    for backend in (Sqlite(ruta_guardado), Binario(ruta_guardado),
+                    Diario(ruta_guardado) if nombre == "diario" else Json(ruta_guardado)):
+        if backend.existe():
+            data = backend.cargar()
+            if data is not None:
+                return backend, data
+    return detectar(ruta_guardado, nombre), None
+
+
+def archivos(ruta_guardado):
+    """Todas las rutas que puede ocupar el guardado, de cualquier backend."""
+    rutas = []
+    for clase in (Json, Binario, Sqlite):
+        rutas.extend(clase(ruta_guardado).archivos())
+    return rutas
+
+
+def limpiar(backend):
+    """Borra los archivos de los demás backends: el guardado está en `backend`."""
+    propios = set(backend.archivos())
+    for ruta in archivos(backend.ruta_guardado):
+        if ruta not in propios and os.path.exists(ruta):
+            os.remove(ruta)
+
+
+def borrar(ruta_guardado):
+    for ruta in archivos(ruta_guardado):
+        if os.path.exists(ruta):
+            os.remove(ruta)
+    snapshot.borrar(ruta_guardado)
+
+
+def existe(ruta_guardado):
+    return any(os.path.exists(ruta) for ruta in archivos(ruta_guardado))
@@ -0,0 +1,55 @@
+"""
+Escritura segura de los archivos del guardado.
+
+Todo se escribe en un temporal, se sincroniza a disco y se renombra encima
+del original: un corte a mitad deja el guardado anterior intacto, nunca uno
+a medias. ESTADISTICAS cuenta escrituras y bytes para los benchmarks.
+"""
+
+import os
+
+ESTADISTICAS = {"escrituras": 0, "bytes": 0, "fsync": 0}
+
+
+def _contar(contenido, sincronizar):
+    ESTADISTICAS["escrituras"] += 1
+    ESTADISTICAS["bytes"] += len(contenido)
+    if sincronizar:
+        ESTADISTICAS["fsync"] += 1
+
+
+def escribir_atomico(ruta, contenido, sincronizar=True):
+    """Reemplaza `ruta` con `contenido` (str o bytes) de forma atómica."""
+    if isinstance(contenido, str):
+        contenido = contenido.encode("utf-8")
+    tmp = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(contenido)
+            if sincronizar:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, ruta)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    _contar(contenido, sincronizar)
+
+
+def anadir(ruta, contenido, sincronizar=True):
+    """Añade `contenido` al final de `ruta` en una sola escritura. Devuelve el tamaño final."""
+    if isinstance(contenido, str):
+        contenido = contenido.encode("utf-8")
+    fd = os.open(ruta, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, contenido)
+        if sincronizar:
+            os.fsync(fd)
+        tamano = os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+    _contar(contenido, sincronizar)
+    return tamano
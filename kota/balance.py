@@ -0,0 +1,399 @@
+"""
+Balance por Monte Carlo (kota balance).
+
+Juega muchas vidas de mascota con motor.simular() y jugadores simulados
+(POLITICAS), repartidas entre todos los núcleos con un pool de procesos, y
+resume por cada combinación de parámetros y política: formas de evolución al
+final, días hasta cada nivel, monedas día a día y cuántas se van de casa.
+
+Configuración (JSON; todo es opcional):
+
+    {
+      "vidas": 100,              por política y punto del barrido
+      "dias": 30,                duración de cada vida
+      "semilla": 0,              la vida i usa la semilla semilla + i en todos
+                                 los puntos, así las diferencias son del cambio
+      "politicas": ["atento", "gloton"],
+                                 o {"nombre": {cambios sobre POLITICAS/POLITICA_BASE}}
+      "parametros": {"simulacion.HAMBRE_DESPIERTO": 5},
+      "barrido": {"tienda.comidas.pizza.precio": [10, 15, 20]},
+                                 se prueban todas las combinaciones
+      "salida": "balance.csv"    y la serie de monedas en balance_monedas.csv
+    }
+
+Parámetros: "tienda.<categoría>.<item>.<campo>" (precio, hambre, energía...
+de TIENDA_ITEMS), "simulacion.<CONSTANTE>" (tasas de kota/simulacion.py),
+"reglas.<grupo>.<i>.<umbral|puntos>" (el término i, desde 0, de un grupo de
+reglas.EVOLUCION o reglas.ESTRES: "reglas.atletico.0.umbral") y
+"reglas.<CONSTANTE>" (EVOLUCION_NIVEL, EVOLUCION_PUNTOS, ESTRES_MAXIMO).
+"""
+
+import csv
+import itertools
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from kota import motor, reglas, simulacion, traza
+
+INICIO = 1_700_000_000.0
+FORMAS = ("basico", "atletico", "intelectual", "premium", "rebelde")
+
+POLITICA_BASE = {
+    "horas": [1, 4],            # entre una visita y la siguiente
+    "acciones": [1, 3],         # por visita
+    "dormir": 25,               # la acuesta con menos energía que esto
+    "comer": 50,                # le da de comer con menos hambre que esto
+    "comidas": ["manzana"],     # lo que compra y le da, por orden
+    "compra": 3,                # unidades por compra
+    "juegos": ["rps", "pares"],
+    "jugar": 1,                 # pesos de jugar, pasear y acariciar en cada visita
+    "pasear": 1,
+    "acariciar": 1,
+    "accesorio": None,          # lo compra y se lo pone
+    "reserva": 50,              # monedas que no gasta en el accesorio
+}
+
+POLITICAS = {
+    "atento": {"horas": [0.5, 3], "comidas": ["manzana", "ensalada"],
+               "juegos": ["rps", "pares", "tictactoe"]},
+    "descuidado": {"horas": [6, 30], "acciones": [1, 2], "comer": 30},
+    "gloton": {"comidas": ["pizza", "dulce"], "comer": 70},
+    "deportista": {"comidas": ["ensalada"], "pasear": 3},
+    "estudioso": {"juegos": ["tictactoe", "adivina"], "jugar": 3},
+    "mimado": {"horas": [0.5, 2], "comidas": ["sushi"], "accesorio": "corona", "acariciar": 3},
+}
+
+_CLAVES = {"vidas", "dias", "semilla", "politicas", "parametros", "barrido", "salida"}
+
+
+# ==========================================================
+# JUGADOR SIMULADO
+# ==========================================================
+class Jugador:
+    """
+    Política para motor.simular(): visita a la mascota cada tantas horas,
+    hace unas pocas cosas según el estado y apunta las monedas al empezar
+    cada día (monedas[k], con monedas[dias] al final).
+    """
+
+    def __init__(self, politica, semilla, dias, inicio=INICIO):
+        self.p = politica
+        self.rng = random.Random(f"jugador{semilla}")
+        self.inicio = inicio
+        self.dias = dias
+        self.quedan = 0
+        self.monedas = []
+
+    def __call__(self, m):
+        d, p, rng = m.data, self.p, self.rng
+        transcurrido = m.reloj() - self.inicio
+        while len(self.monedas) <= self.dias and len(self.monedas) * 86400 <= transcurrido:
+            self.monedas.append(d["monedas"])
+        if transcurrido >= self.dias * 86400:
+            return None
+
+        if self.quedan:
+            self.quedan -= 1
+            espera = 0
+        else:
+            self.quedan = rng.randint(*p["acciones"]) - 1
+            espera = rng.uniform(*p["horas"]) * 3600
+
+        if d["estado_dormido"]:
+            # La despierta cuando ha recuperado la energía
+            self.quedan = 0
+            descanso = (100 - d["energia"]) / simulacion.ENERGIA_DORMIDO * 3600
+            return max(espera, descanso), "dormir"
+        if d["energia"] < p["dormir"]:
+            self.quedan = 0
+            return espera, "dormir"
+        if d["hambre"] < p["comer"]:
+            accion = self.comer(d)
+            if accion:
+                return (espera,) + accion
+        if p["accesorio"] and d["accesorio_equipado"] != p["accesorio"]:
+            accion = self.arreglar(d)
+            if accion:
+                return (espera,) + accion
+
+        r = rng.random() * (p["jugar"] + p["pasear"] + p["acariciar"])
+        if r < p["jugar"]:
+            juego = rng.choice(p["juegos"])
+            return espera, "jugar", juego, self.jugada(m, juego)
+        if r < p["jugar"] + p["pasear"]:
+            return espera, "pasear"
+        return espera, "acariciar"
+
+    def comer(self, d):
+        comidas = d["inventario"]["comidas"]
+        for comida in self.p["comidas"]:
+            if comidas.get(comida, 0) > 0:
+                return "alimentar", comida
+        comida = self.p["comidas"][0]
+        precio = motor.TIENDA_ITEMS["comidas"][comida]["precio"]
+        if d["monedas"] < precio:
+            return None
+        return "comprar", "comidas", comida, min(self.p["compra"], d["monedas"] // precio)
+
+    def arreglar(self, d):
+        nombre = self.p["accesorio"]
+        if d["inventario"]["accesorios"].get(nombre, 0) > 0:
+            return "equipar", nombre
+        if d["monedas"] >= motor.TIENDA_ITEMS["accesorios"][nombre]["precio"] + self.p["reserva"]:
+            return "comprar", "accesorios", nombre
+        return None
+
+    def jugada(self, m, juego):
+        """Lo que se escribiría tras `kota jugar <juego>`; en los demás, contesta al azar."""
+        rng = self.rng
+        if juego == "rps":
+            return rng.choice("RPT")
+        if juego == "pares":
+            return f"{rng.choice('PN')} {rng.randint(0, 5)}"
+        # Tres en raya vuelve a preguntar si la casilla está ocupada
+        maximo = 9 if juego == "tictactoe" else 100
+        m.preguntar = lambda pregunta: str(rng.randint(1, maximo))
+        return None
+
+
+def vida(politica, semilla, dias):
+    """Cifras de una vida simulada con el jugador `politica` (ya completa)."""
+    jugador = Jugador(politica, semilla, dias)
+    m = motor.simular(jugador, inicio=INICIO, semilla=semilla, trazar=False)
+    d = m.data
+    return {
+        "forma": d["forma_evolucion"],
+        "escapo": d["status"] != "vivo",
+        "dias": (m.reloj() - INICIO) / 86400,
+        "nivel": d["nivel"],
+        # Cada nivel, en días desde el principio (estadisticas.nivel)
+        "niveles": {n: (t - INICIO) / 86400 for n, t in d["estadisticas"]["niveles"]},
+        "monedas": jugador.monedas,
+        "acciones": m.pasos,
+    }
+
+
+# ==========================================================
+# PARÁMETROS
+# ==========================================================
+class _Termino:
+    """Un término de unas reglas.Reglas visto como dict (umbral, puntos) para aplicar()."""
+
+    def __init__(self, compiladas, grupo, i):
+        self.reglas, self.grupo, self.i = compiladas, grupo, i
+
+    def __getitem__(self, campo):
+        return self.reglas.termino(self.grupo, self.i)[campo]
+
+    def __setitem__(self, campo, valor):
+        self.reglas.cambiar(self.grupo, self.i, campo, valor)
+
+
+def _destino(clave):
+    """(dict, campo) donde vive el parámetro `clave`; ValueError si no existe."""
+    partes = clave.split(".")
+    if partes[0] == "reglas" and len(partes) == 4 and partes[2].isdigit():
+        for r in (reglas.REGLAS_EVOLUCION, reglas.REGLAS_ESTRES):
+            if partes[1] in r.grupos:
+                sitio = _Termino(r, partes[1], int(partes[2]))
+                try:
+                    if isinstance(sitio[partes[3]], (int, float)):
+                        return sitio, partes[3]
+                except (KeyError, ValueError):
+                    pass
+    elif partes[0] == "reglas" and len(partes) == 2 and partes[1].isupper():
+        if isinstance(getattr(reglas, partes[1], None), (int, float)):
+            return vars(reglas), partes[1]
+    if partes[0] == "tienda" and len(partes) == 4:
+        item = motor.TIENDA_ITEMS.get(partes[1], {}).get(partes[2])
+        if item is not None and isinstance(item.get(partes[3]), (int, float)):
+            return item, partes[3]
+    elif partes[0] == "simulacion" and len(partes) == 2 and partes[1].isupper():
+        if isinstance(getattr(simulacion, partes[1], None), (int, float)):
+            return vars(simulacion), partes[1]
+    raise ValueError(f"parámetro desconocido: {clave}")
+
+
+def aplicar(parametros):
+    """Pone los valores de `parametros` y devuelve los que había (para deshacer)."""
+    anteriores = {}
+    for clave, valor in parametros.items():
+        sitio, campo = _destino(clave)
+        anteriores[clave] = sitio[campo]
+        sitio[campo] = valor
+        if sitio is vars(simulacion):
+            # motor lee simulacion y reglas con un sustituto perezoso que guarda copia
+            setattr(motor.simulacion, campo, valor)
+        elif sitio is vars(reglas):
+            setattr(motor.reglas, campo, valor)
+    return anteriores
+
+
+def _lote(tarea):
+    # En el proceso del pool: unas cuantas vidas de un punto y una política
+    parametros, politica, semillas, dias = tarea
+    anteriores = aplicar(parametros)
+    try:
+        return [vida(politica, s, dias) for s in semillas]
+    finally:
+        aplicar(anteriores)
+
+
+# ==========================================================
+# CONFIGURACIÓN Y EJECUCIÓN
+# ==========================================================
+def leer(ruta=None):
+    """Configuración de `ruta` (JSON) con los valores por defecto; ValueError si no vale."""
+    config = {}
+    if ruta is not None:
+        try:
+            with open(ruta, encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"no se pudo leer {ruta}: {e}") from None
+        if not isinstance(config, dict):
+            raise ValueError(f"{ruta}: se esperaba un objeto JSON")
+    desconocidas = set(config) - _CLAVES
+    if desconocidas:
+        raise ValueError(f"claves desconocidas: {', '.join(sorted(desconocidas))}")
+
+    config = {"vidas": 100, "dias": 30, "semilla": 0, "politicas": list(POLITICAS),
+              "parametros": {}, "barrido": {}, "salida": "balance.csv", **config}
+    for clave in ("vidas", "dias"):
+        if not isinstance(config[clave], int) or config[clave] < 1:
+            raise ValueError(f"{clave} debe ser un entero mayor que 0")
+    politicas = config["politicas"]
+    if isinstance(politicas, list):
+        politicas = {nombre: {} for nombre in politicas}
+    config["politicas"] = {nombre: politica(nombre, cambios) for nombre, cambios in politicas.items()}
+    for clave, valores in config["barrido"].items():
+        if not isinstance(valores, list) or not valores:
+            raise ValueError(f"barrido de {clave}: se esperaba una lista de valores")
+    for clave in itertools.chain(config["parametros"], config["barrido"]):
+        _destino(clave)
+    return config
+
+
+def politica(nombre, cambios=None):
+    """POLITICA_BASE con los cambios de POLITICAS[nombre] y luego los de `cambios`."""
+    if nombre not in POLITICAS and not cambios:
+        raise ValueError(f"política desconocida: {nombre} (hay {', '.join(POLITICAS)})")
+    p = {**POLITICA_BASE, **POLITICAS.get(nombre, {}), **(cambios or {})}
+    desconocidas = set(p) - set(POLITICA_BASE)
+    if desconocidas:
+        raise ValueError(f"política {nombre}: claves desconocidas: {', '.join(sorted(desconocidas))}")
+    for comida in p["comidas"]:
+        if comida not in motor.TIENDA_ITEMS["comidas"]:
+            raise ValueError(f"política {nombre}: no hay {comida} en la tienda")
+    if p["accesorio"] and p["accesorio"] not in motor.TIENDA_ITEMS["accesorios"]:
+        raise ValueError(f"política {nombre}: no hay {p['accesorio']} en la tienda")
+    return p
+
+
+def puntos(config):
+    """Cada combinación del barrido, con los parámetros fijos: [{clave: valor}]."""
+    claves = list(config["barrido"])
+    return [{**config["parametros"], **dict(zip(claves, valores))}
+            for valores in itertools.product(*config["barrido"].values())]
+
+
+def ejecutar(config, procesos=None, avance=None):
+    """
+    Juega todas las vidas de `config` (de leer()) en `procesos` procesos (por
+    defecto, uno por núcleo; con 1, en este). avance(hechas, total) se llama
+    tras cada lote. Devuelve [(punto, política, [cifras de cada vida])].
+    """
+    procesos = procesos or os.cpu_count() or 1
+    vidas = config["vidas"]
+    lote = max(1, math.ceil(vidas / procesos))
+    grupos, tareas = [], []
+    for punto in puntos(config):
+        for nombre, p in config["politicas"].items():
+            grupos.append((punto, nombre, []))
+            for i in range(0, vidas, lote):
+                semillas = range(config["semilla"] + i, config["semilla"] + min(vidas, i + lote))
+                tareas.append((len(grupos) - 1, (punto, p, semillas, config["dias"])))
+
+    if procesos == 1:
+        resultados = map(_lote, (t for _, t in tareas))
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(procesos)
+        resultados = pool.map(_lote, [t for _, t in tareas])
+    try:
+        for hechas, ((grupo, _), cifras) in enumerate(zip(tareas, resultados), 1):
+            grupos[grupo][2].extend(cifras)
+            if avance:
+                avance(hechas, len(tareas))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return grupos
+
+
+# ==========================================================
+# RESUMEN
+# ==========================================================
+def _p(valores, q):
+    return round(traza.percentil(sorted(valores), q), 2) if valores else ""
+
+
+def resumir(cifras, dias):
+    """Una fila del resumen para las vidas `cifras` de un mismo punto y política."""
+    n = len(cifras)
+    escapes = [c["dias"] for c in cifras if c["escapo"]]
+    fila = {
+        "vidas": n,
+        "escapes": round(len(escapes) / n, 4),
+        "dias_escape_p50": _p(escapes, 0.5),
+        "nivel_p50": _p([c["nivel"] for c in cifras], 0.5),
+        "nivel_p90": _p([c["nivel"] for c in cifras], 0.9),
+        "acciones_dia": round(sum(c["acciones"] for c in cifras) / sum(c["dias"] for c in cifras), 1),
+    }
+    for forma in FORMAS:
+        fila[f"forma_{forma}"] = round(sum(c["forma"] == forma for c in cifras) / n, 4)
+    finales = [c["monedas"][-1] for c in cifras if not c["escapo"] and len(c["monedas"]) > dias]
+    fila["monedas_final_p50"] = _p(finales, 0.5)
+    # Días hasta cada nivel, entre las vidas que llegaron
+    for nivel in range(2, max(c["nivel"] for c in cifras) + 1):
+        llegadas = [c["niveles"][nivel] for c in cifras if nivel in c["niveles"]]
+        fila[f"dias_nivel_{nivel}"] = _p(llegadas, 0.5)
+    return fila
+
+
+def serie_monedas(cifras, dias):
+    """Monedas al empezar cada día (p10, p50, p90) entre las vidas que siguen en casa."""
+    filas = []
+    for dia in range(dias + 1):
+        valores = [c["monedas"][dia] for c in cifras if len(c["monedas"]) > dia]
+        if not valores:
+            break
+        filas.append({"dia": dia, "vivas": len(valores), "monedas_p10": _p(valores, 0.1),
+                      "monedas_p50": _p(valores, 0.5), "monedas_p90": _p(valores, 0.9)})
+    return filas
+
+
+def escribir(ruta, filas):
+    """CSV con las columnas de todas las filas, en el orden en que aparecen."""
+    columnas = list(dict.fromkeys(k for fila in filas for k in fila))
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, columnas, restval="")
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def guardar(config, grupos):
+    """Escribe el resumen en config["salida"] y la serie de monedas al lado. Devuelve el resumen."""
+    dias = config["dias"]
+    resumen, serie = [], []
+    for punto, nombre, cifras in grupos:
+        cabecera = {**punto, "politica": nombre}
+        resumen.append({**cabecera, **resumir(cifras, dias)})
+        serie.extend({**cabecera, **fila} for fila in serie_monedas(cifras, dias))
+    base, extension = os.path.splitext(config["salida"])
+    escribir(config["salida"], resumen)
+    escribir(f"{base}_monedas{extension or '.csv'}", serie)
+    return resumen
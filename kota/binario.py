@@ -0,0 +1,233 @@
+"""
+Formato binario del guardado (mascota_savegame.kota, KOTA_ALMACEN=binario).
+
+    cabecera fija   magic, versión, tamaño de cabecera, máscaras y los
+                    escalares de la mascota (los que usa el monitor incluidos)
+    secciones       etiqueta (4 bytes) + largo (uint32) + JSON compacto:
+                    PERS personalidad, INVE inventario, HIST historial,
+                    REST el resto de claves
+
+El monitor solo necesita leer la cabecera (leer_cabecera). La conversión es
+sin pérdidas: un valor que no cabe en su campo de la cabecera (texto largo,
+tipo inesperado) viaja en REST, y las máscaras recuerdan qué números eran
+enteros, qué claves existían y cuáles valían None.
+"""
+
+import json
+import os
+import struct
+
+from kota import archivo
+
+# v2: la cabecera añade privacion_sueno y maltrato_psicologico para el monitor
+VERSION = 2
+MAGIC = b"KOTA"
+
+_NUMEROS = ("hambre", "energia", "afecto", "ultima_conexion", "maltrato_acumulado",
+            "nivel", "exp", "exp_max", "monedas")
+_BOOLEANOS = ("estado_dormido", "congelado")
+_TEXTOS = (("status", 16), ("nombre", 64), ("forma_evolucion", 16), ("accesorio_equipado", 32))
+_CLAVES_CABECERA = _NUMEROS + _BOOLEANOS + tuple(n for n, _ in _TEXTOS)
+
+# magic, versión, tamaño de cabecera, presentes, enteros, nulos, booleanos,
+# copias de personalidad para el monitor (estres, privacion_sueno,
+# maltrato_psicologico), números, textos
+_COPIAS = ("estres", "privacion_sueno", "maltrato_psicologico")
+_TEXTOS_FMT = "".join(f"{t}s" for _, t in _TEXTOS)
+_CABECERAS = {
+    1: struct.Struct("<4sHHHHBB" + "d" + "d" * len(_NUMEROS) + _TEXTOS_FMT),
+    2: struct.Struct("<4sHHHHBB" + "d" * len(_COPIAS) + "d" * len(_NUMEROS) + _TEXTOS_FMT),
+}
+_CABECERA = _CABECERAS[VERSION]
+TAMANO_CABECERA = _CABECERA.size
+
+_SECCIONES = ((b"PERS", "personalidad"), (b"INVE", "inventario"), (b"HIST", "historial"))
+_RESTO = b"REST"
+_SECCION = struct.Struct("<4sI")
+
+
+class FormatoInvalido(ValueError):
+    pass
+
+
+def ruta_binario(ruta_guardado):
+    return os.path.splitext(ruta_guardado)[0] + ".kota"
+
+
+def es_binario(bloque):
+    return bloque[:4] == MAGIC
+
+
+def _json(valor):
+    return json.dumps(valor, separators=(",", ":")).encode("utf-8")
+
+
+def codificar(data):
+    presentes = enteros = nulos = booleanos = 0
+    resto = {}
+    numeros = []
+    for i, clave in enumerate(_NUMEROS):
+        valor = data.get(clave)
+        if (clave in data and isinstance(valor, (int, float)) and not isinstance(valor, bool)
+                and (isinstance(valor, float) or abs(valor) < 2 ** 53)):
+            presentes |= 1 << i
+            if isinstance(valor, int):
+                enteros |= 1 << i
+            numeros.append(float(valor))
+        else:
+            numeros.append(0.0)
+            if clave in data:
+                resto[clave] = valor
+
+    base = len(_NUMEROS)
+    for i, clave in enumerate(_BOOLEANOS):
+        valor = data.get(clave)
+        if isinstance(valor, bool):
+            presentes |= 1 << (base + i)
+            if valor:
+                booleanos |= 1 << i
+        elif clave in data:
+            resto[clave] = valor
+
+    base += len(_BOOLEANOS)
+    textos = []
+    for i, (clave, largo) in enumerate(_TEXTOS):
+        valor = data.get(clave)
+        crudo = b""
+        if clave in data and valor is None:
+            presentes |= 1 << (base + i)
+            nulos |= 1 << i
+        elif isinstance(valor, str):
+            crudo = valor.encode("utf-8")
+            if len(crudo) <= largo and b"\0" not in crudo:
+                presentes |= 1 << (base + i)
+            else:
+                # No cabe: el valor completo va en REST y la cabecera lleva
+                # una versión recortada solo para mostrar
+                resto[clave] = valor
+                crudo = crudo[:largo].decode("utf-8", "ignore").encode("utf-8").replace(b"\0", b"")
+        elif clave in data:
+            resto[clave] = valor
+        textos.append(crudo)
+
+    personalidad = data.get("personalidad")
+    copias = []
+    for clave in _COPIAS:
+        valor = personalidad.get(clave, 0) if isinstance(personalidad, dict) else 0
+        copias.append(float(valor) if isinstance(valor, (int, float)) else 0.0)
+
+    partes = [_CABECERA.pack(MAGIC, VERSION, TAMANO_CABECERA, presentes, enteros, nulos,
+                             booleanos, *copias, *numeros, *textos)]
+    for etiqueta, clave in _SECCIONES:
+        if clave in data:
+            carga = _json(data[clave])
+            partes.append(_SECCION.pack(etiqueta, len(carga)))
+            partes.append(carga)
+
+    conocidas = set(_CLAVES_CABECERA) | {clave for _, clave in _SECCIONES}
+    for clave, valor in data.items():
+        if clave not in conocidas:
+            resto[clave] = valor
+    carga = _json(resto)
+    partes.append(_SECCION.pack(_RESTO, len(carga)))
+    partes.append(carga)
+    return b"".join(partes)
+
+
+def _decodificar_cabecera(bloque):
+    if len(bloque) < 8 or not es_binario(bloque):
+        raise FormatoInvalido("No es un guardado binario de +KOTA")
+    version, tamano = struct.unpack_from("<HH", bloque, 4)
+    if version not in _CABECERAS:
+        raise FormatoInvalido(f"Guardado binario v{version}: actualiza +KOTA para leerlo")
+    cabecera = _CABECERAS[version]
+    if len(bloque) < cabecera.size:
+        raise FormatoInvalido("Cabecera incompleta")
+
+    campos = cabecera.unpack_from(bloque)
+    _, _, _, presentes, enteros, nulos, booleanos = campos[:7]
+    n_copias = 1 if version == 1 else len(_COPIAS)
+    copias = dict(zip(_COPIAS, campos[7:7 + n_copias]))
+    numeros = campos[7 + n_copias:7 + n_copias + len(_NUMEROS)]
+    textos = campos[7 + n_copias + len(_NUMEROS):]
+
+    data = {}
+    for i, clave in enumerate(_NUMEROS):
+        if presentes & (1 << i):
+            data[clave] = int(numeros[i]) if enteros & (1 << i) else numeros[i]
+    base = len(_NUMEROS)
+    for i, clave in enumerate(_BOOLEANOS):
+        if presentes & (1 << (base + i)):
+            data[clave] = bool(booleanos & (1 << i))
+    base += len(_BOOLEANOS)
+    recortados = {}
+    for i, (clave, _) in enumerate(_TEXTOS):
+        texto = textos[i].rstrip(b"\0").decode("utf-8", "replace")
+        if presentes & (1 << (base + i)):
+            data[clave] = None if nulos & (1 << i) else texto
+        else:
+            recortados[clave] = texto
+    return data, recortados, copias, tamano
+
+
+def decodificar(bloque):
+    """Documento completo, tal como se pasó a codificar()."""
+    data, _, _, pos = _decodificar_cabecera(bloque)
+    resto = {}
+    while pos < len(bloque):
+        if pos + _SECCION.size > len(bloque):
+            raise FormatoInvalido("Sección truncada")
+        etiqueta, largo = _SECCION.unpack_from(bloque, pos)
+        pos += _SECCION.size
+        carga = bloque[pos:pos + largo]
+        if len(carga) != largo:
+            raise FormatoInvalido("Sección truncada")
+        pos += largo
+        valor = json.loads(carga.decode("utf-8"))
+        if etiqueta == _RESTO:
+            resto = valor
+        else:
+            for etiqueta_conocida, clave in _SECCIONES:
+                if etiqueta == etiqueta_conocida:
+                    data[clave] = valor
+            # Secciones desconocidas (de versiones futuras) se ignoran
+    data.update(resto)
+    return data
+
+
+def cargar(ruta):
+    with open(ruta, 'rb') as f:
+        return decodificar(f.read())
+
+
+def guardar(ruta, data):
+    archivo.escribir_atomico(ruta, codificar(data))
+
+
+def leer_cabecera(ruta):
+    """
+    Campos del monitor (como snapshot.campos) leyendo solo la cabecera,
+    o None si no hay guardado binario válido.
+    """
+    try:
+        with open(ruta, 'rb') as f:
+            bloque = f.read(TAMANO_CABECERA)
+        data, recortados, copias, _ = _decodificar_cabecera(bloque)
+    except (OSError, FormatoInvalido, struct.error):
+        return None
+    nombre = data.get("nombre")
+    if not isinstance(nombre, str):
+        nombre = recortados.get("nombre") or "Mascota"
+    return {
+        "nombre": nombre,
+        "hambre": float(data.get("hambre", 100)),
+        "energia": float(data.get("energia", 100)),
+        "afecto": float(data.get("afecto", 0)),
+        "estres": copias.get("estres", 0.0),
+        "privacion_sueno": copias.get("privacion_sueno", 0.0),
+        "maltrato_psicologico": copias.get("maltrato_psicologico", 0.0),
+        "status": data.get("status") or recortados.get("status") or "vivo",
+        "estado_dormido": data.get("estado_dormido", False),
+        "congelado": data.get("congelado", False),
+        "ultima_conexion": float(data.get("ultima_conexion", 0)),
+    }
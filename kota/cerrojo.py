@@ -0,0 +1,102 @@
+"""
+Cerrojo del guardado para terminales simultáneas.
+
+mascota_savegame.lock guarda un número de generación que sube con cada
+guardado. GeoPet lo lee al cargar (cerrojo compartido) y al guardar toma el
+cerrojo exclusivo: si la generación ya no es la que leyó, otro proceso guardó
+entretanto y hay que fusionar (kota/fusion.py) antes de escribir. El cerrojo
+solo se tiene mientras se lee o se escribe, nunca mientras el usuario elige
+en un menú.
+
+flock() se pide sin bloquear y se reintenta con esperas cortas; si en ESPERA
+segundos no se consigue se lanza TimeoutError. Sin fcntl (Windows) el
+cerrojo no bloquea nada, pero la generación sigue detectando conflictos.
+ESTADISTICAS cuenta esperas y conflictos para los benchmarks.
+"""
+
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+ESPERA = 10.0
+REINTENTO_MIN = 0.0005
+REINTENTO_MAX = 0.005
+
+ESTADISTICAS = {"reintentos": 0, "espera_s": 0.0, "conflictos": 0}
+
+# Cerrojo que ya tiene este proceso: los anidados (releer el disco mientras
+# se guarda) lo reutilizan en vez de esperarse a sí mismos
+_actual = None
+
+
+def ruta_cerrojo(ruta_guardado):
+    return os.path.splitext(ruta_guardado)[0] + ".lock"
+
+
+class Cerrojo:
+    """with Cerrojo(FILE_DATA) as c: c.generacion(); c.avanzar()"""
+
+    def __init__(self, ruta_guardado, compartido=False, espera=ESPERA):
+        self.ruta = ruta_cerrojo(ruta_guardado)
+        self.compartido = compartido
+        self.espera = espera
+        self.fd = None
+        self.reintentos = 0
+        self.anidado = False
+
+    def __enter__(self):
+        global _actual
+        if _actual is not None:
+            self.fd, self.anidado = _actual.fd, True
+            return self
+        self.fd = os.open(self.ruta, os.O_RDWR | os.O_CREAT, 0o644)
+        _actual = self
+        if fcntl is None:
+            return self
+        modo = (fcntl.LOCK_SH if self.compartido else fcntl.LOCK_EX) | fcntl.LOCK_NB
+        inicio = time.monotonic()
+        limite = inicio + self.espera
+        pausa = REINTENTO_MIN
+        while True:
+            try:
+                fcntl.flock(self.fd, modo)
+                if self.reintentos:
+                    ESTADISTICAS["espera_s"] += time.monotonic() - inicio
+                return self
+            except BlockingIOError:
+                if time.monotonic() > limite:
+                    os.close(self.fd)
+                    self.fd = _actual = None
+                    raise TimeoutError(f"el guardado sigue bloqueado ({self.ruta})")
+                self.reintentos += 1
+                ESTADISTICAS["reintentos"] += 1
+                time.sleep(pausa)
+                pausa = min(REINTENTO_MAX, pausa * 2)
+
+    def __exit__(self, *exc):
+        global _actual
+        if not self.anidado:
+            # Cerrar el descriptor suelta el flock
+            os.close(self.fd)
+            _actual = None
+        self.fd = None
+
+    def generacion(self):
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        try:
+            return int(os.read(self.fd, 32) or 0)
+        except ValueError:
+            return 0
+
+    def avanzar(self):
+        """Sube la generación (solo con el cerrojo exclusivo). Devuelve la nueva."""
+        nueva = self.generacion() + 1
+        datos = str(nueva).encode()
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        os.write(self.fd, datos)
+        os.ftruncate(self.fd, len(datos))
+        return nueva
@@ -0,0 +1,109 @@
+"""
+Daemon residente de +KOTA (`kota daemon`).
+
+Mantiene la mascota cargada en memoria y responde por un socket Unix local,
+para que la línea de estado de cada terminal nueva no tenga que arrancar un
+intérprete ni leer el guardado. Protocolo: una línea de texto por conexión.
+
+    estado     -> línea del monitor (lo mismo que imprime +KOTA_STATUS.py)
+    recargar   -> vuelve a leer el guardado; responde "ok"
+    parar      -> apaga el daemon; responde "ok"
+
+Una conexión sin petición (EOF) equivale a "estado", así que desde el prompt
+basta con `nc -U "$KOTA_SOCKET" </dev/null` o `socat - UNIX-CONNECT:...`.
+"""
+
+import os
+
+# socket y socketserver se importan al usarlos: notificar() corre en cada
+# guardado y casi nunca hay daemon escuchando
+TIMEOUT_CLIENTE = 0.5
+
+
+def ruta_socket():
+    if os.environ.get("KOTA_SOCKET"):
+        return os.environ["KOTA_SOCKET"]
+    # Sin tempfile.gettempdir(): importa medio stdlib y esto corre en cada guardado
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(base, f"kota-{os.getuid()}.sock")
+
+
+def consultar(peticion, timeout=TIMEOUT_CLIENTE):
+    """Envía una petición al daemon. Devuelve la respuesta o None si no está corriendo."""
+    ruta = ruta_socket()
+    if not os.path.exists(ruta):
+        return None
+    import socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(timeout)
+            s.connect(ruta)
+            s.sendall(peticion.encode("utf-8") + b"\n")
+            s.shutdown(socket.SHUT_WR)
+            partes = []
+            while True:
+                bloque = s.recv(4096)
+                if not bloque:
+                    break
+                partes.append(bloque)
+        return b"".join(partes).decode("utf-8")
+    except OSError:
+        return None
+
+
+def notificar():
+    """Avisa al daemon (si existe) de que el guardado cambió."""
+    consultar("recargar", timeout=0.1)
+
+
+def _crear_servidor(ruta, responder):
+    import socketserver
+
+    class Manejador(socketserver.StreamRequestHandler):
+        timeout = TIMEOUT_CLIENTE
+
+        def handle(self):
+            try:
+                peticion = self.rfile.readline().decode("utf-8").strip() or "estado"
+            except (OSError, UnicodeDecodeError):
+                return
+            respuesta = self.server.responder(peticion)
+            if peticion == "parar":
+                self.server.parar = True
+            self.wfile.write(respuesta.encode("utf-8"))
+
+    servidor = socketserver.UnixStreamServer(ruta, Manejador)
+    servidor.responder = responder
+    servidor.parar = False
+    return servidor
+
+
+def _liberar_socket_huerfano(ruta):
+    if not os.path.exists(ruta):
+        return
+    if consultar("estado") is not None:
+        raise RuntimeError(f"Ya hay un daemon escuchando en {ruta}")
+    os.remove(ruta)
+
+
+def servir(responder):
+    """
+    Atiende peticiones hasta recibir "parar" o Ctrl+C.
+    `responder(peticion) -> str` lo aporta +KOTA.py con la mascota cargada.
+    """
+    ruta = ruta_socket()
+    _liberar_socket_huerfano(ruta)
+    servidor = _crear_servidor(ruta, responder)
+    os.chmod(ruta, 0o600)
+    try:
+        # Sin hilos ni sondeo: se bloquea en accept() hasta la siguiente petición
+        while not servidor.parar:
+            servidor.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
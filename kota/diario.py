@@ -0,0 +1,157 @@
+"""
+Diario de cambios (journal) para el guardado de +KOTA.
+
+En vez de reescribir todo el JSON en cada acción, cada guardado añade una
+línea compacta con solo lo que cambió desde el anterior:
+
+    {"n": 12, "s": {"hambre": 80.0, ...}, "h": {"paseos": [1712345678.9]}}
+
+  n   número de secuencia
+  s   claves de primer nivel que cambiaron (valor completo; son pequeñas)
+  h   eventos nuevos de cada serie de `historial` (se re-registran al cargar)
+  hr  series de `historial` que hay que reemplazar enteras
+
+Al cargar se lee el checkpoint (el JSON de siempre) y se re-aplican encima las
+líneas con `n` mayor que su "_diario_seq". Cuando el diario pasa de
+UMBRAL_COMPACTACION bytes se vuelca todo a un checkpoint nuevo y se borra.
+"""
+
+import copy
+import json
+import os
+
+from kota import archivo
+from kota import historial as hist
+
+UMBRAL_COMPACTACION = 256 * 1024
+CLAVE_SEQ = "_diario_seq"
+
+
+def ruta_diario(ruta_guardado):
+    return os.path.splitext(ruta_guardado)[0] + ".diario"
+
+
+def _aplicar(data, registro):
+    for clave, valor in registro.get("s", {}).items():
+        data[clave] = valor
+    historial = data.setdefault("historial", {})
+    for clave, valor in registro.get("hr", {}).items():
+        historial[clave] = valor
+    for clave, eventos in registro.get("h", {}).items():
+        serie = historial.setdefault(clave, [])
+        if isinstance(serie, list):
+            # Diario escrito antes del historial acotado
+            serie.extend(eventos)
+        else:
+            for evento in eventos:
+                hist.registrar(historial, clave, evento)
+
+
+def cargar(ruta_guardado):
+    """Checkpoint + diario. Devuelve el dict guardado, o None si no hay guardado."""
+    data = None
+    if os.path.exists(ruta_guardado):
+        with open(ruta_guardado, 'r') as f:
+            data = json.load(f)
+
+    ruta = ruta_diario(ruta_guardado)
+    if not os.path.exists(ruta):
+        return data
+
+    if data is None:
+        data = {}
+    seq = data.get(CLAVE_SEQ, 0)
+    with open(ruta, 'r') as f:
+        for linea in f:
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                # Línea a medio escribir (corte de luz, kill -9...): se ignora
+                continue
+            if registro.get("n", 0) <= seq:
+                continue
+            _aplicar(data, registro)
+            seq = registro["n"]
+    data[CLAVE_SEQ] = seq
+    return data
+
+
+def descartar(ruta_guardado):
+    try:
+        os.remove(ruta_diario(ruta_guardado))
+    except OSError:
+        pass
+
+
+class Diario:
+    """Registra los cambios de `data` respecto al último estado persistido."""
+
+    def __init__(self, ruta_guardado, data, seq=0):
+        self.ruta_guardado = ruta_guardado
+        self.ruta = ruta_diario(ruta_guardado)
+        self.seq = seq
+        # Se pide un checkpoint nuevo en el próximo guardado (p. ej. tras migrar
+        # un guardado viejo, para que el JSON en disco deje de crecer)
+        self.compactar_pronto = False
+        self.marcar(data)
+
+    def marcar(self, data):
+        # Línea base para el próximo diff. Del historial basta con el total de
+        # cada serie: los eventos nuevos son los últimos del buffer.
+        self._base = {k: copy.deepcopy(v) for k, v in data.items() if k != "historial"}
+        self._totales = {k: hist.total(data["historial"], k) for k in data.get("historial", {})}
+
+    def _diferencias(self, data):
+        registro = {}
+        cambios = {k: v for k, v in data.items()
+                   if k != "historial" and (k not in self._base or self._base[k] != v)}
+        if cambios:
+            registro["s"] = cambios
+
+        nuevos, reemplazos = {}, {}
+        historial = data.get("historial", {})
+        for clave, serie in historial.items():
+            previo = self._totales.get(clave, 0)
+            actual = hist.total(historial, clave)
+            if actual == previo:
+                continue
+            recientes = hist.recientes(historial, clave)
+            if previo < actual and actual - previo <= len(recientes):
+                nuevos[clave] = recientes[len(recientes) - (actual - previo):]
+            else:
+                # Se reinició o entraron más eventos de los que caben en el buffer
+                reemplazos[clave] = serie
+        if nuevos:
+            registro["h"] = nuevos
+        if reemplazos:
+            registro["hr"] = reemplazos
+        return registro
+
+    def registrar(self, data):
+        """Añade una línea con los cambios; compacta si el diario creció demasiado."""
+        if self.compactar_pronto or not os.path.exists(self.ruta_guardado):
+            self.compactar(data)
+            return
+
+        registro = self._diferencias(data)
+        if not registro:
+            return
+        self.seq += 1
+        registro["n"] = self.seq
+        linea = json.dumps(registro, separators=(",", ":")) + "\n"
+        tamano = archivo.anadir(self.ruta, linea)
+        self.marcar(data)
+
+        if tamano > UMBRAL_COMPACTACION:
+            self.compactar(data)
+
+    def compactar(self, data):
+        """Escribe un checkpoint con todo `data` y vacía el diario."""
+        checkpoint = dict(data)
+        checkpoint[CLAVE_SEQ] = self.seq
+        archivo.escribir_atomico(self.ruta_guardado, json.dumps(checkpoint, indent=4))
+        # Si se corta aquí, el checkpoint ya tiene CLAVE_SEQ y las líneas
+        # viejas del diario se saltan al cargar.
+        descartar(self.ruta_guardado)
+        self.compactar_pronto = False
+        self.marcar(data)
@@ -0,0 +1,58 @@
+"""
+Piezas de la pantalla de estado de +KOTA.
+
+Cada figura (forma, expresión, accesorio, color) se construye una sola vez y
+queda en una caché acotada; las barras se arman con segmentos precalculados.
+GeoPet.lineas_estado() junta las piezas y mostrar_estado() / kota shell las
+escriben de una vez.
+"""
+
+from functools import lru_cache
+
+RESET = '\033[0m'
+BOLD = '\033[1m'
+
+LARGO_BARRA = 20
+
+CARAS = {
+    "dormido": ("─   ─", "Z z z"), "feliz": ("‾ ‾", "^ ^"),
+    "contento": ("‾ ‾", "• •"), "neutral": ("─ ─", "• •"),
+    "triste": ("╲ ╱", "• •"), "enojado": ("╲ ╱", "◉ ◉"),
+    "cansado": ("_ _", "- -"), "hambriento": ("╱ ╲", "O O"),
+    "estresado": ("╲ ╱", "◎ ◎"), "congelado": ("❄️ ❄️", " ─ "), # Cara congelada
+}
+CARA_NEUTRAL = ("─ ─", "• •")
+
+# {acc} accesorio, {c} y {o} las dos filas de la cara
+FIGURAS = {
+    "triangle": "        △ {acc}\n       ╱ ╲\n      ╱{c}╲\n     ╱ {o} ╲\n    ╱       ╲\n   ╱─────────╲",
+    "square": "   ┌─────────┐ {acc}\n   │         │\n   │  {c}  │\n   │  {o}  │\n   │         │\n   └─────────┘",
+    "pentagon": "      ╱‾‾‾╲ {acc}\n     ╱     ╲\n    │  {c}  │\n    │  {o}  │\n     ╲     ╱\n      ╲___╱",
+    "hexagon": "     ╱‾‾‾‾‾╲ {acc}\n    ╱       ╲\n   │   {c}   │\n   │   {o}   │\n    ╲       ╱\n     ╲_____╱",
+    "circle": "     ╭─────╮ {acc}\n    ╱       ╲\n   │   {c}   │\n   │   {o}   │\n    ╲       ╱\n     ╰─────╯",
+}
+
+_LLENO = tuple("█" * i for i in range(LARGO_BARRA + 1))
+_VACIO = tuple("░" * i for i in range(LARGO_BARRA + 1))
+
+
+@lru_cache(maxsize=256)
+def sprite(forma, expresion, accesorio, color):
+    """
+    Líneas de la figura ya coloreada (tupla: se comparte entre llamadas).
+    Cada línea lleva su color y su RESET: el shell redibuja solo las filas
+    que cambian (la cara) y una fila suelta tiene que salir con color.
+    """
+    c, o = CARAS.get(expresion, CARA_NEUTRAL)
+    figura = FIGURAS.get(forma, FIGURAS["circle"]).format(acc=accesorio, c=c, o=o)
+    return tuple(f"{color}{BOLD}{linea}{RESET}" for linea in figura.split("\n"))
+
+
+@lru_cache(maxsize=1024)
+def _barra(nombre, lleno, porcentaje, color):
+    return f"{nombre:8} [{color}{_LLENO[lleno]}{_VACIO[LARGO_BARRA - lleno]}{RESET}] {porcentaje:3}%"
+
+
+def barra(nombre, valor, color):
+    lleno = max(0, min(LARGO_BARRA, int((valor / 100) * LARGO_BARRA)))
+    return _barra(nombre, lleno, int(valor), color)
@@ -0,0 +1,172 @@
+"""
+Estadísticas de `kota stats`, acumuladas según pasan las cosas.
+
+Cada acción suma en data["estadisticas"] en el momento en que ocurre, así que
+el informe no recorre el historial y cuesta lo mismo con una mascota de días
+que con una de años:
+
+    {
+        "desde": 1716..,                     # desde cuándo se cuenta
+        "comidas": {"manzana": 12, ...},     # por comida
+        "tipos_comida": {"saludable": 3, ...},
+        "juegos": {"rps": {"partidas": 9, "ganadas": 4, "empates": 2}, ...},
+        "paseos": {"total": 20, "racha": 3, "mejor_racha": 7, "ultimo_dia": 19870},
+        "sueno": {"ciclos": 5, "segundos": 123456.0, "inicio": None},
+        "monedas": {"ganadas": {"juegos": 120, ...}, "gastadas": {"comidas": 45, ...}},
+        "niveles": [[2, 1716..], ...],       # [nivel, cuándo se subió]
+    }
+
+Los días de la racha de paseos son días locales contados desde 1970. Todo es
+de tamaño fijo salvo `niveles`, que crece con el nivel (cada uno pide un 50%
+más de experiencia que el anterior).
+"""
+
+import time
+
+from kota import historial as hist
+
+RESULTADOS = {"usuario": "ganadas", "empate": "empates"}
+
+
+def nuevas(ahora=None):
+    return {
+        "desde": time.time() if ahora is None else ahora,
+        "comidas": {},
+        "tipos_comida": {},
+        "juegos": {},
+        "paseos": {"total": 0, "racha": 0, "mejor_racha": 0, "ultimo_dia": None},
+        "sueno": {"ciclos": 0, "segundos": 0.0, "inicio": None},
+        "monedas": {"ganadas": {}, "gastadas": {}},
+        "niveles": [],
+    }
+
+
+def dia(t):
+    """Día local de `t` como número (días desde el 1/1/1970)."""
+    return (int(t) + time.localtime(t).tm_gmtoff) // 86400
+
+
+def _sumar(contadores, clave, cantidad=1):
+    contadores[clave] = contadores.get(clave, 0) + cantidad
+
+
+def migrar(data, ahora=None):
+    """
+    Guardados sin estadísticas: las crea con lo que ya se puede saber (tipos de
+    comida, partidas, racha de los últimos días de paseos). Devuelve True si
+    había que crearlas.
+    """
+    if data.get("estadisticas"):
+        return False
+    # Las frecuencias por día cuentan desde ahora; los totales que ya había
+    # (tipos de comida, partidas, paseos) se copian
+    est = nuevas(ahora)
+    historial = data.get("historial", {})
+    p = data.get("personalidad", {})
+    for tipo in ("chatarra", "saludable", "premium"):
+        if p.get("comida_" + tipo):
+            est["tipos_comida"][tipo] = p["comida_" + tipo]
+    for juego, partidas in data.get("juegos_stats", {}).items():
+        if partidas:
+            est["juegos"][juego] = {"partidas": partidas, "ganadas": 0, "empates": 0}
+
+    # Rachas: solo se conocen los días que guarda el historial (por_dia)
+    paseos = est["paseos"]
+    paseos["total"] = hist.total(historial, "paseos")
+    serie = historial.get("paseos")
+    if isinstance(serie, dict):
+        for texto in sorted(serie["por_dia"]):
+            # A mano: time.strptime importa _strptime (locale, re...), ~15 ms
+            anio, mes, d = (int(x) for x in texto.split("-"))
+            _paseo_dia(paseos, dia(time.mktime((anio, mes, d, 12, 0, 0, 0, 0, -1))))
+
+    if data.get("estado_dormido"):
+        ciclos = hist.recientes(historial, "ciclos_sueno")
+        if ciclos:
+            est["sueno"]["inicio"] = hist.marca_tiempo(ciclos[-1])
+    data["estadisticas"] = est
+    return True
+
+
+# ==========================================================
+# EVENTOS
+# ==========================================================
+def comida(est, nombre, tipo, cantidad=1):
+    _sumar(est["comidas"], nombre, cantidad)
+    _sumar(est["tipos_comida"], tipo, cantidad)
+
+
+def partida(est, juego, resultado):
+    """resultado: "usuario", "ia" o "empate" (como en juego_rps)."""
+    juegos = est["juegos"].setdefault(juego, {"partidas": 0, "ganadas": 0, "empates": 0})
+    juegos["partidas"] += 1
+    if resultado in RESULTADOS:
+        juegos[RESULTADOS[resultado]] += 1
+
+
+def _paseo_dia(paseos, hoy):
+    ultimo = paseos["ultimo_dia"]
+    if ultimo == hoy:
+        return
+    paseos["racha"] = paseos["racha"] + 1 if ultimo == hoy - 1 else 1
+    paseos["mejor_racha"] = max(paseos["mejor_racha"], paseos["racha"])
+    paseos["ultimo_dia"] = hoy
+
+
+def paseo(est, t):
+    est["paseos"]["total"] += 1
+    _paseo_dia(est["paseos"], dia(t))
+
+
+def dormir(est, t):
+    est["sueno"]["inicio"] = t
+
+
+def despertar(est, t):
+    sueno = est["sueno"]
+    if sueno["inicio"] is not None:
+        sueno["ciclos"] += 1
+        sueno["segundos"] += max(0.0, t - sueno["inicio"])
+    sueno["inicio"] = None
+
+
+def monedas(est, cantidad, motivo):
+    """Monedas ganadas (cantidad > 0) o gastadas (< 0), por motivo."""
+    if cantidad > 0:
+        _sumar(est["monedas"]["ganadas"], motivo, cantidad)
+    elif cantidad < 0:
+        _sumar(est["monedas"]["gastadas"], motivo, -cantidad)
+
+
+def nivel(est, nuevo, t):
+    est["niveles"].append([nuevo, t])
+
+
+# ==========================================================
+# INFORME
+# ==========================================================
+def resumen(est, ahora=None):
+    """Cifras derivadas para el informe (y para `kota batch`), sin recorrer nada."""
+    if ahora is None:
+        ahora = time.time()
+    dias = max(1.0, (ahora - est["desde"]) / 86400)
+    paseos, sueno = est["paseos"], est["sueno"]
+    # La racha sigue viva si hoy o ayer hubo paseo
+    racha = paseos["racha"] if paseos["ultimo_dia"] is not None and dia(ahora) - paseos["ultimo_dia"] <= 1 else 0
+    ganadas = sum(est["monedas"]["ganadas"].values())
+    gastadas = sum(est["monedas"]["gastadas"].values())
+    return {
+        "dias": dias,
+        "comidas": sum(est["comidas"].values()),
+        "comidas_por_dia": {n: c / dias for n, c in est["comidas"].items()},
+        "partidas": sum(j["partidas"] for j in est["juegos"].values()),
+        "paseos": paseos["total"],
+        "racha": racha,
+        "mejor_racha": paseos["mejor_racha"],
+        "ciclos_sueno": sueno["ciclos"],
+        "sueno_medio_h": sueno["segundos"] / sueno["ciclos"] / 3600 if sueno["ciclos"] else 0.0,
+        "durmiendo_desde": sueno["inicio"],
+        "monedas_ganadas": ganadas,
+        "monedas_gastadas": gastadas,
+        "niveles": len(est["niveles"]),
+    }
@@ -0,0 +1,257 @@
+"""
+Modo flota: muchas mascotas en un solo archivo, guardadas por columnas.
+
+Cada estadística es un array.array con una posición por mascota, y tick()
+aplica el decaimiento de kota/simulacion.py y los límites de check_limites a
+todas a la vez, columna por columna, sin crear un GeoPet por mascota.
+
+Archivo (mascotas_flota.bin):
+    "KFLT", versión (uint16), cantidad (uint32)
+    columnas de float64 y de int8, en el orden de COLUMNAS_REALES / COLUMNAS_BANDERAS
+    nombres: largo (uint32) + nombres UTF-8 separados por "\\n"
+"""
+
+import heapq
+import json
+import struct
+import sys
+import time
+from array import array
+
+from kota import archivo
+from kota.reglas import ESTRES_MAXIMO, REGLAS_ESTRES
+from kota.simulacion import (ENERGIA_DESPIERTO, ENERGIA_DORMIDO, ENERGIA_NOCTURNA,
+                             FUGA_AFECTO, FUGA_MALTRATO, HAMBRE_DESPIERTO, HAMBRE_DORMIDO,
+                             MIN_HORAS, NOCHE_FIN, PENALIZACION_NOCTURNA, PRIVACION_DESPIERTO,
+                             PRIVACION_DORMIDO)
+
+VERSION = 1
+_MAGIC = b"KFLT"
+_CABECERA = struct.Struct("<4sHI")
+
+COLUMNAS_REALES = ("hambre", "energia", "afecto", "estres", "privacion_sueno",
+                   "maltrato_psicologico", "maltrato_acumulado", "ultima_conexion")
+COLUMNAS_BANDERAS = ("dormido", "congelado", "escapado")
+
+
+class Flota:
+    def __init__(self):
+        for col in COLUMNAS_REALES:
+            setattr(self, col, array('d'))
+        for col in COLUMNAS_BANDERAS:
+            setattr(self, col, array('b'))
+        self.nombres = []
+        self._indice = None
+        self._desfases = {}
+
+    def __len__(self):
+        return len(self.nombres)
+
+    # ------------------------------------------------------------------
+    # Altas y búsqueda
+    # ------------------------------------------------------------------
+    def agregar(self, nombre, data):
+        """Añade una mascota a partir de un dict con la forma de GeoPet.data."""
+        # Los nombres van separados por saltos de línea en el archivo
+        nombre = nombre.replace("\n", " ").strip() or "Mascota"
+        base, n = nombre, 2
+        while nombre in self.indice():
+            nombre = f"{base}-{n}"
+            n += 1
+        p = data.get("personalidad", {})
+        valores = {
+            "hambre": data.get("hambre", 100.0),
+            "energia": data.get("energia", 100.0),
+            "afecto": data.get("afecto", 50.0),
+            "estres": p.get("estres", 0),
+            "privacion_sueno": p.get("privacion_sueno", 0),
+            "maltrato_psicologico": p.get("maltrato_psicologico", 0),
+            "maltrato_acumulado": data.get("maltrato_acumulado", 0),
+            "ultima_conexion": data.get("ultima_conexion", time.time()),
+        }
+        for col in COLUMNAS_REALES:
+            getattr(self, col).append(float(valores[col]))
+        self.dormido.append(bool(data.get("estado_dormido", False)))
+        self.congelado.append(bool(data.get("congelado", False)))
+        self.escapado.append(data.get("status", "vivo") != "vivo")
+        self._indice[nombre] = len(self.nombres)
+        self.nombres.append(nombre)
+        return nombre
+
+    def indice(self):
+        # Se construye al primer uso: tick y top no lo necesitan
+        if self._indice is None:
+            self._indice = {nombre: i for i, nombre in enumerate(self.nombres)}
+        return self._indice
+
+    def buscar(self, nombre):
+        """Dict con las columnas de la mascota, o None si no existe."""
+        i = self.indice().get(nombre)
+        return None if i is None else self.fila(i)
+
+    def fila(self, i):
+        fila = {"nombre": self.nombres[i]}
+        for col in COLUMNAS_REALES + COLUMNAS_BANDERAS:
+            fila[col] = getattr(self, col)[i]
+        return fila
+
+    # ------------------------------------------------------------------
+    # Simulación
+    # ------------------------------------------------------------------
+    def tick(self, ahora=None):
+        """
+        Avanza todas las mascotas hasta `ahora` (como procesar_tiempo_offline +
+        check_limites + actualizar_personalidad). Devuelve cuántas escaparon.
+        """
+        ahora = time.time() if ahora is None else ahora
+        # Listas de Python: iterar un array.array crea un float nuevo por elemento
+        ultima = self.ultima_conexion.tolist()
+        dormido = self.dormido.tolist()
+        energia_inicial = self.energia.tolist()
+        afecto = self.afecto.tolist()
+        maltrato = self.maltrato_acumulado.tolist()
+
+        horas = [(ahora - t) / 3600 for t in ultima]
+        activa = [not c and not e and h >= MIN_HORAS
+                  for c, e, h in zip(self.congelado, self.escapado, horas)]
+
+        # Decaimiento según esté dormida o despierta. Los límites van con
+        # comparaciones en vez de max()/min(): es la parte más caliente.
+        hambre = [v - h * (HAMBRE_DORMIDO if d else HAMBRE_DESPIERTO) if a else v
+                  for v, h, d, a in zip(self.hambre, horas, dormido, activa)]
+        energia = [v + h * (ENERGIA_DORMIDO if d else ENERGIA_DESPIERTO) if a else v
+                   for v, h, d, a in zip(energia_inicial, horas, dormido, activa)]
+        privacion = [v + h * (PRIVACION_DORMIDO if d else PRIVACION_DESPIERTO) if a else v
+                     for v, h, d, a in zip(self.privacion_sueno, horas, dormido, activa)]
+        hambre = [0.0 if x < 0.0 else 100.0 if x > 100.0 else x for x in hambre]
+        energia = [0.0 if x < 0.0 else 100.0 if x > 100.0 else x for x in energia]
+        privacion = [0.0 if x < 0.0 else 100.0 if x > 100.0 else x for x in privacion]
+
+        # Penalización nocturna (simulacion.noches_entre): las 00:00 en
+        # (desde, ahora] y, si la energía cruza el umbral en este tick y de
+        # noche, esa noche
+        horas_locales = self._horas_locales
+        fin_dia = horas_locales(ahora) // 24
+        segundos_por_punto = 3600 / -ENERGIA_DESPIERTO
+        candidatas = [i for i, (a, d) in enumerate(zip(activa, dormido)) if a and not d]
+        for i in candidatas:
+            e = energia_inicial[i]
+            desde = ultima[i]
+            cruza = e >= ENERGIA_NOCTURNA
+            if cruza:
+                desde += (e - ENERGIA_NOCTURNA) * segundos_por_punto
+                if desde > ahora:
+                    continue
+            h = horas_locales(desde)
+            noches = int(fin_dia - h // 24) + (1 if cruza and h % 24 < NOCHE_FIN else 0)
+            if noches > 0:
+                afecto[i] -= PENALIZACION_NOCTURNA * noches
+                maltrato[i] += PENALIZACION_NOCTURNA * noches
+
+        afecto = [-100.0 if x < -100.0 else 100.0 if x > 100.0 else x for x in afecto]
+        # simulacion.estres(): los términos de reglas.ESTRES, columna a columna,
+        # y el límite de check_limites
+        columnas = {"hambre": hambre, "energia": energia, "afecto": afecto,
+                    "privacion_sueno": privacion, "maltrato_psicologico": self.maltrato_psicologico}
+        estres = [0] * len(afecto)
+        for _, entrada, op, umbral, puntos in REGLAS_ESTRES.terminos:
+            if entrada not in columnas:
+                raise ValueError(f"la flota no tiene la columna {entrada} (reglas.ESTRES)")
+            columna = columnas[entrada]
+            if op == "<":
+                estres = [e + puntos if x < umbral else e for e, x in zip(estres, columna)]
+            elif op == ">":
+                estres = [e + puntos if x > umbral else e for e, x in zip(estres, columna)]
+            else:
+                estres = [e + x * umbral for e, x in zip(estres, columna)]
+        tope = float(ESTRES_MAXIMO)
+        estres = [0.0 if x < 0.0 else tope if x > tope else x for x in estres]
+
+        antes = sum(self.escapado)
+        escapado = [1 if (x or (a and (af < FUGA_AFECTO or m > FUGA_MALTRATO))) else 0
+                    for x, a, af, m in zip(self.escapado, activa, afecto, maltrato)]
+        conexion = [ahora if a else t for t, a in zip(ultima, activa)]
+
+        self.hambre = array('d', hambre)
+        self.energia = array('d', energia)
+        self.privacion_sueno = array('d', privacion)
+        self.afecto = array('d', afecto)
+        self.maltrato_acumulado = array('d', maltrato)
+        self.estres = array('d', estres)
+        self.escapado = array('b', escapado)
+        self.ultima_conexion = array('d', conexion)
+        return sum(escapado) - antes
+
+    def _horas_locales(self, t):
+        # Como simulacion._horas_locales pero con el desfase horario cacheado por
+        # hora UTC: con miles de mascotas, localtime() por cada una sale caro.
+        hora = int(t // 3600)
+        desfase = self._desfases.get(hora)
+        if desfase is None:
+            desfase = self._desfases[hora] = time.localtime(t).tm_gmtoff
+        return (t + desfase) / 3600
+
+    def top(self, campo="estres", n=10, mayores=True):
+        """Las `n` mascotas vivas con el valor más alto (o más bajo) de `campo`."""
+        columna = getattr(self, campo)
+        vivas = (i for i in range(len(columna)) if not self.escapado[i])
+        elegir = heapq.nlargest if mayores else heapq.nsmallest
+        return [self.fila(i) for i in elegir(n, vivas, key=columna.__getitem__)]
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+    def codificar(self):
+        partes = [_CABECERA.pack(_MAGIC, VERSION, len(self))]
+        for col in COLUMNAS_REALES + COLUMNAS_BANDERAS:
+            columna = getattr(self, col)
+            if sys.byteorder == "big":
+                columna = array(columna.typecode, columna)
+                columna.byteswap()
+            partes.append(columna.tobytes())
+        nombres = "\n".join(self.nombres).encode("utf-8")
+        partes.append(struct.pack("<I", len(nombres)))
+        partes.append(nombres)
+        return b"".join(partes)
+
+    @classmethod
+    def decodificar(cls, bloque):
+        magic, version, n = _CABECERA.unpack_from(bloque)
+        if magic != _MAGIC or version != VERSION:
+            raise ValueError("No es un archivo de flota de +KOTA compatible")
+        flota = cls()
+        pos = _CABECERA.size
+        for col in COLUMNAS_REALES + COLUMNAS_BANDERAS:
+            columna = getattr(flota, col)
+            largo = n * columna.itemsize
+            columna.frombytes(bloque[pos:pos + largo])
+            if sys.byteorder == "big":
+                columna.byteswap()
+            pos += largo
+        (largo,) = struct.unpack_from("<I", bloque, pos)
+        pos += 4
+        texto = bloque[pos:pos + largo].decode("utf-8")
+        flota.nombres = texto.split("\n") if n else []
+        return flota
+
+    @classmethod
+    def cargar(cls, ruta):
+        try:
+            with open(ruta, 'rb') as f:
+                return cls.decodificar(f.read())
+        except FileNotFoundError:
+            return cls()
+
+    def guardar(self, ruta):
+        archivo.escribir_atomico(ruta, self.codificar())
+
+
+def leer_guardado(ruta):
+    """Lee un guardado individual (JSON o .kota) para importarlo a la flota."""
+    from kota import binario
+    with open(ruta, 'rb') as f:
+        bloque = f.read()
+    if binario.es_binario(bloque):
+        return binario.decodificar(bloque)
+    return json.loads(bloque.decode("utf-8"))
+
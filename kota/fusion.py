@@ -0,0 +1,144 @@
+"""
+Fusión a tres bandas del guardado (ver kota/cerrojo.py).
+
+Cuando dos procesos cargan la misma versión y guardan los dos, el segundo
+no pisa al primero: fusionar(base, mio, disco) aplica sobre lo que hay en
+disco solo lo que este proceso cambió respecto a lo que cargó.
+
+  - números: se suma la diferencia (monedas, exp, inventario, juegos_stats...)
+  - dicts: clave a clave; una clave que falta en un lado cuenta como 0 si el
+    otro es un número
+  - listas: si los dos lados solo añadieron al final, van las dos colas
+  - historial: los eventos nuevos de cada serie se registran sobre la de disco
+  - el resto (textos, booleanos): gana el cambio de este proceso
+
+Sumar diferencias puede romper lo que el juego nunca deja pasar, así que al
+final: monedas e inventario no bajan de 0, y nivel/exp/exp_max se fusionan
+juntos como experiencia total, volviendo a subir niveles con la curva de
+kota/motor.py.
+
+Todo es JSON (dicts, listas, números, textos), así que copiar() no necesita
+copy.deepcopy.
+"""
+
+from kota import historial as hist
+from kota import perezoso
+
+motor = perezoso.modulo("kota.motor")
+
+NIVEL = ("nivel", "exp", "exp_max")
+# Marcas de tiempo y rachas (kota/estadisticas.py): no se suman, se queda la mayor
+INSTANTES = ("ultima_conexion", "ultimo_dia", "racha", "mejor_racha")
+_FALTA = object()
+
+
+def copiar(valor):
+    if isinstance(valor, dict):
+        return {k: copiar(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [copiar(v) for v in valor]
+    return valor
+
+
+def _numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+def _fusionar_historial(base, mio, disco):
+    resultado = copiar(disco)
+    for nombre in set(mio) | set(disco):
+        previos = hist.total(base, nombre)
+        actual = hist.total(mio, nombre)
+        if actual == previos:
+            continue
+        recientes = hist.recientes(mio, nombre)
+        if previos < actual and actual - previos <= len(recientes):
+            for evento in recientes[len(recientes) - (actual - previos):]:
+                hist.registrar(resultado, nombre, copiar(evento))
+        else:
+            # Serie reiniciada o más eventos de los que caben: la de este proceso
+            resultado[nombre] = copiar(mio[nombre])
+    return resultado
+
+
+def _fusionar(base, mio, disco, clave=None):
+    if mio == base:
+        return copiar(disco)
+    if disco == base or disco is _FALTA:
+        return copiar(mio)
+    if clave in INSTANTES and _numero(mio) and _numero(disco):
+        return max(mio, disco)
+    if clave == "historial" and isinstance(mio, dict) and isinstance(disco, dict):
+        return _fusionar_historial(base if isinstance(base, dict) else {}, mio, disco)
+
+    valores = (base, mio, disco)
+    if all(v is _FALTA or _numero(v) for v in valores) and mio is not _FALTA:
+        b = 0 if base is _FALTA else base
+        return disco + (mio - b)
+    if all(isinstance(v, dict) for v in (mio, disco)):
+        base = base if isinstance(base, dict) else {}
+        resultado = {}
+        for k in list(disco) + [k for k in mio if k not in disco]:
+            b, m, d = base.get(k, _FALTA), mio.get(k, _FALTA), disco.get(k, _FALTA)
+            if m is _FALTA and _numero(b) and (d is _FALTA or _numero(d)):
+                m = 0
+            if m is _FALTA and k in base:
+                # Este proceso la borró; se respeta si el disco no la tocó
+                if d == b:
+                    continue
+                resultado[k] = copiar(d)
+                continue
+            v = _fusionar(b, m, d, k)
+            if v is not _FALTA:
+                resultado[k] = v
+        return resultado
+    if all(isinstance(v, list) for v in valores):
+        n = len(base)
+        if mio[:n] == base and disco[:n] == base:
+            return copiar(disco) + copiar(mio[n:])
+    if mio is _FALTA:
+        return _FALTA
+    return copiar(mio)
+
+
+def _exp_total(d):
+    """Experiencia acumulada desde nivel 1 y exp 0."""
+    total, exp_max = d["exp"], motor.EXP_MAX_INICIAL
+    for _ in range(int(d["nivel"]) - 1):
+        total += exp_max
+        exp_max = motor.siguiente_exp_max(exp_max)
+    return total
+
+
+def _fusionar_nivel(base, mio, disco, resultado):
+    if not all(isinstance(d, dict) and all(_numero(d.get(k)) for k in NIVEL) for d in (base, mio, disco)):
+        return
+    if all(mio[k] == base[k] for k in NIVEL) or all(disco[k] == base[k] for k in NIVEL):
+        # Solo subió un lado: ya viene entero de ese lado
+        return
+    exp = max(0, _exp_total(disco) + _exp_total(mio) - _exp_total(base))
+    nivel, exp_max = 1, motor.EXP_MAX_INICIAL
+    while exp >= exp_max:
+        exp -= exp_max
+        nivel += 1
+        exp_max = motor.siguiente_exp_max(exp_max)
+    resultado.update(nivel=nivel, exp=exp, exp_max=exp_max)
+
+
+def _sin_negativos(resultado):
+    if _numero(resultado.get("monedas")):
+        resultado["monedas"] = max(0, resultado["monedas"])
+    for items in (resultado.get("inventario") or {}).values():
+        if isinstance(items, dict):
+            for nombre, cantidad in items.items():
+                if _numero(cantidad) and cantidad < 0:
+                    items[nombre] = 0
+
+
+def fusionar(base, mio, disco):
+    """Nuevo estado: `disco` más lo que cambió de `base` a `mio`."""
+    resultado = _fusionar(base, mio, disco)
+    if isinstance(resultado, dict):
+        _fusionar_nivel(base, mio, disco, resultado)
+        _sin_negativos(resultado)
+    return resultado
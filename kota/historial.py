@@ -0,0 +1,112 @@
+"""
+Historial acotado de la mascota.
+
+Cada serie de `historial` (alimentaciones, paseos, ciclos_sueno,
+sesiones_juego) guarda solo los últimos CAPACIDAD eventos en un buffer
+circular y resume todo lo anterior en contadores:
+
+    {
+        "buf": [...],             # buffer circular (tamaño fijo, CAPACIDAD)
+        "pos": 3,                 # próxima posición a sobrescribir
+        "total": 1520,            # eventos registrados desde siempre
+        "por_hora": [0] * 24,     # eventos por hora del día
+        "por_dia": {"2024-05-01": 3, ...},   # últimos DIAS días
+    }
+
+Así el guardado no crece con la edad de la mascota y contar paseos para la
+evolución es O(1). Es un dict normal para que json.dump y el diario lo
+traten igual que el resto de `self.data`.
+"""
+
+import time
+
+CAPACIDAD = 32
+DIAS = 60
+SERIES = ("alimentaciones", "sesiones_juego", "ciclos_sueno", "paseos")
+
+
+def serie_vacia():
+    return {"buf": [], "pos": 0, "total": 0, "por_hora": [0] * 24, "por_dia": {}}
+
+
+def nuevo():
+    return {nombre: serie_vacia() for nombre in SERIES}
+
+
+def marca_tiempo(evento):
+    """Instante de un evento: los de alimentación/paseo son floats, el resto dicts."""
+    if isinstance(evento, dict):
+        return evento.get("inicio", evento.get("t", 0))
+    return evento
+
+
+def _agregar(serie, evento):
+    buf = serie["buf"]
+    if len(buf) < CAPACIDAD:
+        buf.append(evento)
+    else:
+        buf[serie["pos"]] = evento
+        serie["pos"] = (serie["pos"] + 1) % CAPACIDAD
+    serie["total"] += 1
+
+    local = time.localtime(marca_tiempo(evento))
+    serie["por_hora"][local.tm_hour] += 1
+    dia = time.strftime("%Y-%m-%d", local)
+    por_dia = serie["por_dia"]
+    if dia in por_dia:
+        por_dia[dia] += 1
+    else:
+        por_dia[dia] = 1
+        # Los días entran en orden: el más viejo es el primero del dict
+        while len(por_dia) > DIAS:
+            del por_dia[next(iter(por_dia))]
+
+
+def registrar(historial, nombre, evento):
+    serie = historial.get(nombre)
+    if not isinstance(serie, dict):
+        serie = historial[nombre] = _desde_lista(serie or [])
+    _agregar(serie, evento)
+
+
+def total(historial, nombre):
+    serie = historial.get(nombre)
+    if serie is None:
+        return 0
+    if isinstance(serie, list):
+        return len(serie)
+    return serie["total"]
+
+
+def recientes(historial, nombre):
+    """Últimos eventos de la serie, del más viejo al más nuevo."""
+    serie = historial.get(nombre)
+    if not serie:
+        return []
+    if isinstance(serie, list):
+        return serie[-CAPACIDAD:]
+    buf, pos = serie["buf"], serie["pos"]
+    return buf[pos:] + buf[:pos]
+
+
+def _desde_lista(eventos):
+    serie = serie_vacia()
+    for evento in eventos:
+        _agregar(serie, evento)
+    return serie
+
+
+def migrar(historial):
+    """
+    Convierte en el sitio las series del formato viejo (listas sin límite).
+    Devuelve True si había algo que convertir.
+    """
+    migrado = False
+    for nombre in SERIES:
+        serie = historial.get(nombre)
+        if serie is None:
+            historial[nombre] = serie_vacia()
+        elif isinstance(serie, list):
+            historial[nombre] = _desde_lista(serie)
+            migrado = True
+    return migrado
@@ -0,0 +1,88 @@
+"""
+Minijuegos de `kota jugar`, uno por módulo.
+
+JUEGOS solo tiene nombres y rutas: el código de cada juego se importa la
+primera vez que se juega (cargar()), así que añadir uno no cambia lo que
+cuestan `kota estado` ni la línea de estado. Cada módulo tiene:
+
+    TITULO                      cabecera de la partida
+    jugar(partida, eleccion)    juega una partida y devuelve un Resultado, o
+                                None si se abandonó (sin premio ni coste)
+
+`eleccion` es la jugada ya escrita en la línea de comandos ("R", "5 1 9"...)
+o None para preguntar. El juego solo toca data["ia_memory"] (lo que aprende
+del jugador) y escribe y pregunta a través de la Partida; afecto, monedas,
+experiencia y juegos_stats los pone Motor.registrar_partida() (kota/motor.py)
+con el Resultado, igual para todos.
+"""
+
+import sys
+
+# nombre: (módulo, jugada sin preguntar o None si solo es interactivo, descripción)
+JUEGOS = {
+    "rps": ("kota.juegos.rps", "<R|P|T>", "Piedra, papel o tijera"),
+    "pares": ("kota.juegos.pares", "<P|N> <dedos>", "Pares o nones"),
+    "adivina": ("kota.juegos.adivina", None, "Adivina el número del 1 al 100"),
+    "tictactoe": ("kota.juegos.tictactoe", "<casillas>", "Tres en raya"),
+}
+
+
+def cargar(nombre):
+    """El módulo del juego `nombre`, o None si no existe."""
+    if nombre not in JUEGOS:
+        return None
+    ruta = JUEGOS[nombre][0]
+    __import__(ruta)
+    return sys.modules[ruta]
+
+
+def sin_preguntar(nombre):
+    """True si `nombre` se puede jugar con la jugada en la línea de comandos."""
+    return nombre in JUEGOS and JUEGOS[nombre][1] is not None
+
+
+class SinColor:
+    """Como la clase Color de +KOTA.py, sin códigos ANSI."""
+    RESET = BOLD = RED = GREEN = YELLOW = BLUE = MAGENTA = CYAN = WHITE = GRAY = ""
+
+
+def _rendirse(pregunta):
+    # Sin nadie que conteste: "0" abandona en todos los juegos
+    return "0"
+
+
+def _callar(*args, **kwargs):
+    pass
+
+
+class Partida:
+    """
+    Lo que un juego ve de la mascota. Por defecto sin terminal (kota/motor.py):
+    no escribe nada y cada pregunta se contesta rindiéndose; GeoPet pasa
+    Color, input y print.
+    """
+
+    def __init__(self, data, rng, color=SinColor, preguntar=_rendirse, mostrar=_callar):
+        self.data = data
+        self.ia = data["ia_memory"]
+        self.rng = rng
+        self.color = color
+        self.preguntar = preguntar
+        self.mostrar = mostrar
+        # Sin terminal no hace falta ni armar lo que se dibuja
+        self.en_pantalla = mostrar is not _callar
+
+
+class Resultado:
+    """
+    Fin de una partida. ganador: "usuario", "ia" o "empate"; el resto son
+    cambios que se suman a la mascota (hambre y energía suelen ser negativos).
+    """
+
+    def __init__(self, ganador, monedas, exp=0, afecto=0, hambre=0, energia=0):
+        self.ganador = ganador
+        self.monedas = monedas
+        self.exp = exp
+        self.afecto = afecto
+        self.hambre = hambre
+        self.energia = energia
@@ -0,0 +1,44 @@
+"""
+Adivina el número (kota jugar adivina).
+
+La mascota piensa un número del 1 al 100 y contesta "más alto" o "más bajo";
+hay INTENTOS, justo los que necesita una búsqueda binaria, y el premio crece
+con los intentos que sobran.
+"""
+
+from kota.juegos import Resultado
+
+TITULO = "🔢 Adivina el Número"
+MAXIMO = 100
+INTENTOS = 7
+
+
+def jugar(partida, eleccion=None):
+    """`eleccion` ("50 25 37"): primeros intentos ya escritos; luego pregunta."""
+    c = partida.color
+    secreto = partida.rng.randint(1, MAXIMO)
+    pendientes = eleccion.split() if eleccion else []
+    partida.mostrar(f"{c.GRAY}{partida.data['nombre']} piensa un número del 1 al {MAXIMO}. "
+                    f"Tienes {INTENTOS} intentos (0 para rendirte).{c.RESET}")
+    intento = 0
+    while intento < INTENTOS:
+        if pendientes:
+            texto = pendientes.pop(0)
+        else:
+            texto = partida.preguntar(f"Intento {intento + 1}/{INTENTOS}: ").strip()
+        if texto == "0":
+            partida.mostrar(f"{c.YELLOW}Partida abandonada.{c.RESET}")
+            return None
+        if not texto.isdigit() or not 1 <= int(texto) <= MAXIMO:
+            partida.mostrar(f"{c.RED}Número no válido.{c.RESET}")
+            continue
+        intento += 1
+        numero = int(texto)
+        if numero == secreto:
+            sobran = INTENTOS - intento
+            partida.mostrar(f"{c.GREEN}¡Era el {secreto}! ({intento} intentos){c.RESET}")
+            return Resultado("usuario", 5 + 3 * sobran, exp=15 + 2 * sobran, afecto=3,
+                             hambre=-1, energia=-3)
+        partida.mostrar("Más alto ⬆️" if numero < secreto else "Más bajo ⬇️")
+    partida.mostrar(f"Era el {secreto}.")
+    return Resultado("ia", 1, exp=3, hambre=-1, energia=-3)
@@ -0,0 +1,64 @@
+"""
+Pares o nones (kota jugar pares).
+
+El jugador apuesta a pares o a nones y saca de 0 a 5 dedos; la mascota saca
+los suyos a la vez y gana la apuesta según la paridad de la suma. Como la
+suma depende de los dos, la mascota solo gana más de la mitad si adivina la
+paridad de los dedos del jugador: ia_memory["par_non_bias"] es un contador
+saturado en [-SESGO_MAX, SESGO_MAX] que sube cuando el jugador saca un número
+par de dedos y baja cuando saca impar. Con el contador a un lado la mascota
+juega como si el jugador fuera a repetir esa paridad; al tope, unas pocas
+partidas al revés bastan para que cambie de idea.
+"""
+
+from kota.juegos import Resultado
+
+TITULO = "🖐️  Pares o Nones"
+SESGO_MAX = 3
+DEDOS = range(6)
+
+
+def dedos_mascota(ia, apuesta, rng):
+    """Dedos de la mascota para que la suma no tenga la paridad de `apuesta` ("P"/"N")."""
+    sesgo = ia.get("par_non_bias", 0)
+    if not sesgo:
+        return rng.choice(DEDOS)
+    # Paridad que se espera del jugador (0 par, 1 impar) y la que busca la mascota
+    esperada = 0 if sesgo > 0 else 1
+    buscada = 1 if apuesta == "P" else 0
+    return rng.choice([d for d in DEDOS if (d + esperada) % 2 == buscada])
+
+
+def aprender(ia, dedos):
+    sesgo = ia.get("par_non_bias", 0) + (1 if dedos % 2 == 0 else -1)
+    ia["par_non_bias"] = max(-SESGO_MAX, min(SESGO_MAX, sesgo))
+
+
+def _leer(texto):
+    """("P" o "N", dedos) de "p 3", "nones 2"...; None si no se entiende."""
+    texto = texto.strip().upper()
+    cifras = [ch for ch in texto if ch.isdigit()]
+    if not texto or texto[0] not in "PN" or len(cifras) != 1 or int(cifras[0]) not in DEDOS:
+        return None
+    return texto[0], int(cifras[0])
+
+
+def jugar(partida, eleccion=None):
+    c = partida.color
+    if eleccion is None:
+        apuesta = partida.preguntar(f"¿{c.GREEN}P{c.RESET}ares o {c.GREEN}N{c.RESET}ones? ")
+        dedos = partida.preguntar("Dedos (0-5): ")
+        eleccion = f"{apuesta.strip()[:1]} {dedos}"
+    jugada = _leer(eleccion)
+    if jugada is None:
+        return None
+    apuesta, dedos = jugada
+    suyos = dedos_mascota(partida.ia, apuesta, partida.rng)
+    aprender(partida.ia, dedos)
+
+    suma = dedos + suyos
+    partida.mostrar(f"\nTú: {dedos}  +  {partida.data['nombre']}: {suyos}  =  {suma} "
+                    f"({'par' if suma % 2 == 0 else 'impar'})")
+    if (suma % 2 == 0) == (apuesta == "P"):
+        return Resultado("usuario", 10, exp=12, afecto=4, hambre=-1, energia=-2)
+    return Resultado("ia", 2, exp=4, afecto=-1, hambre=-1, energia=-2)
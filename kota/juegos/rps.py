@@ -0,0 +1,151 @@
+"""
+Piedra, papel o tijera contra un rival adaptativo (kota jugar rps).
+
+Predice la próxima jugada del jugador con varias tablas de n-gramas y saca la
+que le gana. Cada modelo mira un contexto distinto de las últimas rondas:
+
+    ("jugador", k)   las últimas k jugadas del jugador (k = 0..ORDEN)
+    ("ronda", k)     las últimas k rondas completas, jugador y rival
+                     (k = 1..ORDEN_RONDAS): pilla a quien reacciona a lo que
+                     sacó el rival ("si pierdo, cambio")
+
+Todo vive en data["ia_memory"] con tamaño fijo, se jueguen las rondas que se
+jueguen:
+
+    rps_history    las últimas rondas, "RT" = el jugador sacó R y el rival T
+    rps_tabla      conteos: para cada modelo y contexto, cuántas veces siguió
+                   R, P o T
+    rps_aciertos   aciertos recientes de cada modelo (con olvido); se hace
+                   caso al que mejor viene prediciendo
+
+Cuando los conteos de un contexto pasan de TECHO se dividen a la mitad: los
+números no crecen y lo reciente pesa más, así que si el jugador cambia de
+costumbre el rival se entera en unas pocas rondas. Elegir y aprender tocan un
+contexto por modelo: O(1) por ronda.
+"""
+
+from kota.juegos import Resultado
+
+TITULO = "✊ Piedra Papel Tijera"
+
+JUGADAS = "RPT"
+# GANA_A[x] es la jugada que le gana a x
+GANA_A = {"R": "P", "P": "T", "T": "R"}
+ORDEN = 3
+ORDEN_RONDAS = 1
+TECHO = 30
+OLVIDO = 0.9
+# Rival desconocido (rondas de antes de guardar la jugada del rival)
+DESCONOCIDA = "?"
+
+MODELOS = tuple([("jugador", k) for k in range(ORDEN + 1)]
+                + [("ronda", k) for k in range(1, ORDEN_RONDAS + 1)])
+
+_INDICE = {j: i for i, j in enumerate(JUGADAS)}
+_INICIO = []
+TAMANO = 0
+for _tipo, _k in MODELOS:
+    _INICIO.append(TAMANO)
+    TAMANO += (3 if _tipo == "jugador" else 9) ** _k * 3
+MEMORIA = max(ORDEN, ORDEN_RONDAS)
+
+
+def _celda(m, historia):
+    """Índice de los tres conteos del modelo `m` en el contexto actual, o None."""
+    tipo, k = MODELOS[m]
+    if len(historia) < k:
+        return None
+    c = 0
+    for ronda in historia[len(historia) - k:] if k else ():
+        c = c * 3 + _INDICE[ronda[0]]
+        if tipo == "ronda":
+            if ronda[1] not in _INDICE:
+                return None
+            c = c * 3 + _INDICE[ronda[1]]
+    return _INICIO[m] + c * 3
+
+
+def preparar(ia):
+    """
+    Crea la tabla si falta. Un rps_history de versiones anteriores (solo las
+    jugadas del jugador, sin límite) se pasa por aprender() una vez.
+    """
+    tabla = ia.get("rps_tabla")
+    if isinstance(tabla, list) and len(tabla) == TAMANO:
+        return
+    anteriores = [r[0] for r in ia.get("rps_history", []) if r and r[0] in _INDICE]
+    ia["rps_tabla"] = [0] * TAMANO
+    ia["rps_aciertos"] = [0.0] * len(MODELOS)
+    ia["rps_history"] = []
+    for jugada in anteriores:
+        aprender(ia, jugada)
+
+
+def _predicciones(ia):
+    """(modelo, jugada más frecuente) de cada modelo que ya vio su contexto actual."""
+    historia, tabla = ia["rps_history"], ia["rps_tabla"]
+    for m in range(len(MODELOS)):
+        i = _celda(m, historia)
+        if i is None:
+            continue
+        conteos = tabla[i:i + 3]
+        if any(conteos):
+            yield m, JUGADAS[conteos.index(max(conteos))]
+
+
+def elegir(ia, rng):
+    """Jugada del rival: la que le gana a la predicción del modelo más fiable."""
+    preparar(ia)
+    aciertos = ia["rps_aciertos"]
+    mejor, prediccion = None, None
+    for m, jugada in _predicciones(ia):
+        # A igualdad, el último modelo (más contexto)
+        if mejor is None or aciertos[m] >= mejor:
+            mejor, prediccion = aciertos[m], jugada
+    if prediccion is None:
+        return rng.choice(JUGADAS)
+    return GANA_A[prediccion]
+
+
+def aprender(ia, jugada, rival=None):
+    """Cuenta la jugada del jugador en el contexto de cada modelo y los puntúa."""
+    preparar(ia)
+    historia, tabla, aciertos = ia["rps_history"], ia["rps_tabla"], ia["rps_aciertos"]
+    for m, prediccion in _predicciones(ia):
+        aciertos[m] = round(aciertos[m] * OLVIDO + (prediccion == jugada), 4)
+    for m in range(len(MODELOS)):
+        i = _celda(m, historia)
+        if i is None:
+            continue
+        tabla[i + _INDICE[jugada]] += 1
+        if tabla[i] + tabla[i + 1] + tabla[i + 2] > TECHO:
+            tabla[i] //= 2
+            tabla[i + 1] //= 2
+            tabla[i + 2] //= 2
+    historia.append(jugada + (rival if rival in _INDICE else DESCONOCIDA))
+    del historia[:-MEMORIA]
+
+
+# ==========================================================
+# PARTIDA
+# ==========================================================
+SIMBOLOS = {"R": "✊", "P": "🖐️", "T": "✌️"}
+
+
+def jugar(partida, eleccion=None):
+    c = partida.color
+    if eleccion is None:
+        eleccion = partida.preguntar(f"Elige ({c.GREEN}R{c.RESET}, {c.GREEN}P{c.RESET}, {c.GREEN}T{c.RESET}): ")
+    eleccion = eleccion.strip().upper()
+    if not eleccion or eleccion[0] not in _INDICE:
+        return None
+    eleccion = eleccion[0]
+    rival = elegir(partida.ia, partida.rng)
+    aprender(partida.ia, eleccion, rival)
+    partida.mostrar(f"\nTú: {SIMBOLOS[eleccion]}  VS  CPU: {SIMBOLOS[rival]}")
+
+    if eleccion == rival:
+        return Resultado("empate", 5, hambre=-1, energia=-2)
+    if GANA_A[rival] == eleccion:
+        return Resultado("usuario", 15, exp=20, afecto=6, hambre=-1, energia=-2)
+    return Resultado("ia", 3, exp=5, afecto=-1, hambre=-1, energia=-2)
@@ -0,0 +1,265 @@
+"""
+Tres en raya contra una tabla de juego perfecto (kota jugar tictactoe).
+
+El árbol completo se resuelve una vez con minimax y se guarda el valor de
+cada posición alcanzable, reducida por simetría (las 8 rotaciones y
+reflejos del tablero valen lo mismo): 765 posiciones de 2 bytes en
+ruta_tabla(), la caché del usuario ($XDG_CACHE_HOME o ~/.cache), no el
+directorio desde el que se juega. Se carga la primera vez que se juega; si falta, está corrupto o es
+de otra versión se vuelve a resolver (unos 50 ms) y se reescribe.
+
+    tablero    lista de 9 casillas, 0 vacía, 1 X, 2 O (X empieza siempre)
+    valor      para quien mueve: 1 gana, 0 tablas, -1 pierde con juego perfecto
+
+Elegir jugada mira el valor de cada casilla libre en la tabla (como mucho 9
+consultas): no hay búsqueda durante la partida. Con `error` > 0 la mascota
+a veces juega una casilla cualquiera (ver dificultad()).
+
+Formato: b"KTTT", versión (uint16), número de posiciones (uint16) y, por
+cada una, código * 3 + valor + 1 (uint16, little endian). El código es el
+tablero en base 3 (casilla 0 = cifra menos significativa), el menor de sus
+8 simétricos.
+"""
+
+import os
+import struct
+import sys
+from array import array
+
+from kota import archivo
+from kota.juegos import Resultado
+
+TITULO = "#️⃣  Tres en Raya"
+
+ARCHIVO = "tictactoe.bin"
+VERSION = 1
+MAGIC = b"KTTT"
+_CABECERA = struct.Struct("<4sHH")
+
+LINEAS = ((0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6))
+
+
+def _simetrias():
+    """Las 8 permutaciones de casillas: 4 rotaciones, con y sin reflejo."""
+    rotar = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+    reflejar = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+    resultado, p = [], tuple(range(9))
+    for _ in range(4):
+        resultado.append(p)
+        resultado.append(tuple(p[i] for i in reflejar))
+        p = tuple(p[i] for i in rotar)
+    return resultado
+
+
+SIMETRIAS = _simetrias()
+_POTENCIAS = [3 ** i for i in range(9)]
+
+# Tabla cargada: {código canónico: valor}
+_tabla = None
+# valoraciones() ya calculadas: {tablero: {casilla: valor}}
+_valoraciones = {}
+
+
+def canonico(tablero):
+    return min(sum(tablero[p[i]] * _POTENCIAS[i] for i in range(9)) for p in SIMETRIAS)
+
+
+def turno(tablero):
+    """1 (X) o 2 (O): a quién le toca."""
+    return 1 if tablero.count(1) == tablero.count(2) else 2
+
+
+def ganador(tablero):
+    """1 o 2 si alguien hizo tres en raya, 0 si no."""
+    for a, b, c in LINEAS:
+        if tablero[a] and tablero[a] == tablero[b] == tablero[c]:
+            return tablero[a]
+    return 0
+
+
+def terminado(tablero):
+    return bool(ganador(tablero)) or 0 not in tablero
+
+
+def libres(tablero):
+    return [i for i in range(9) if not tablero[i]]
+
+
+# ==========================================================
+# RESOLVER
+# ==========================================================
+def resolver():
+    """Minimax sobre todo el árbol: {código canónico: valor para quien mueve}."""
+    tabla = {}
+
+    def valor(tablero):
+        codigo = canonico(tablero)
+        if codigo in tabla:
+            return tabla[codigo]
+        if ganador(tablero):
+            # Acaba de ganar el otro
+            resultado = -1
+        elif 0 not in tablero:
+            resultado = 0
+        else:
+            ficha = turno(tablero)
+            resultado = -1
+            for i in libres(tablero):
+                tablero[i] = ficha
+                resultado = max(resultado, -valor(tablero))
+                tablero[i] = 0
+        tabla[codigo] = resultado
+        return resultado
+
+    valor([0] * 9)
+    return tabla
+
+
+def codificar(tabla):
+    datos = array("H", (codigo * 3 + valor + 1 for codigo, valor in sorted(tabla.items())))
+    if sys.byteorder != "little":
+        datos.byteswap()
+    return _CABECERA.pack(MAGIC, VERSION, len(datos)) + datos.tobytes()
+
+
+def decodificar(bloque):
+    """La tabla de un bloque del archivo, o None si no es válido."""
+    if len(bloque) < _CABECERA.size:
+        return None
+    magic, version, n = _CABECERA.unpack_from(bloque)
+    if magic != MAGIC or version != VERSION or len(bloque) != _CABECERA.size + 2 * n:
+        return None
+    datos = array("H")
+    datos.frombytes(bloque[_CABECERA.size:])
+    if sys.byteorder != "little":
+        datos.byteswap()
+    return {x // 3: x % 3 - 1 for x in datos}
+
+
+def ruta_tabla():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "kota", ARCHIVO)
+
+
+def tabla(ruta=None):
+    """La tabla resuelta: de memoria, de `ruta` (ruta_tabla()) o resolviendo (y guardándola)."""
+    global _tabla
+    if _tabla is not None:
+        return _tabla
+    ruta = ruta or ruta_tabla()
+    try:
+        with open(ruta, "rb") as f:
+            _tabla = decodificar(f.read())
+    except OSError:
+        _tabla = None
+    if _tabla is None:
+        _tabla = resolver()
+        try:
+            # Es una caché: sin fsync, y si no se puede escribir se resuelve otra vez
+            os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+            archivo.escribir_atomico(ruta, codificar(_tabla), sincronizar=False)
+        except OSError:
+            pass
+    return _tabla
+
+
+# ==========================================================
+# JUGAR
+# ==========================================================
+def valoraciones(tablero, ruta=None):
+    """{casilla libre: valor para quien mueve si juega ahí}."""
+    clave = tuple(tablero)
+    if clave in _valoraciones:
+        return _valoraciones[clave]
+    t = tabla(ruta)
+    ficha = turno(tablero)
+    resultado = {}
+    for i in libres(tablero):
+        tablero[i] = ficha
+        if ganador(tablero):
+            resultado[i] = 1
+        else:
+            resultado[i] = -t[canonico(tablero)]
+        tablero[i] = 0
+    # Como mucho unos 4500 tableros sin terminar: en una simulación larga
+    # (kota/motor.py) cada posición se valora una sola vez
+    _valoraciones[clave] = resultado
+    return resultado
+
+
+ERROR_MAX = 0.7
+
+
+def dificultad(estres, energia):
+    """
+    Probabilidad de que la mascota juegue una casilla al azar: descansada y
+    tranquila no falla; estresada o agotada, hasta ERROR_MAX.
+    """
+    error = 0.6 * estres / 100 + 0.4 * max(0, 60 - energia) / 60
+    return max(0.0, min(ERROR_MAX, error))
+
+
+def elegir(tablero, rng, error=0.0, ruta=None):
+    """Casilla para quien mueve: una de las mejores, salvo despiste (`error`)."""
+    opciones = valoraciones(tablero, ruta)
+    if rng.random() < error:
+        return rng.choice(sorted(opciones))
+    mejor = max(opciones.values())
+    return rng.choice([i for i, v in sorted(opciones.items()) if v == mejor])
+
+
+# ==========================================================
+# PARTIDA
+# ==========================================================
+def dibujar(partida, tablero, usuario):
+    if not partida.en_pantalla:
+        return
+    c = partida.color
+    fichas = {usuario: f"{c.GREEN}X{c.RESET}", 3 - usuario: f"{c.MAGENTA}O{c.RESET}"}
+    filas = []
+    for fila in range(3):
+        celdas = [fichas.get(tablero[i], f"{c.GRAY}{i + 1}{c.RESET}")
+                  for i in range(fila * 3, fila * 3 + 3)]
+        filas.append(" " + " │ ".join(celdas))
+    partida.mostrar("\n" + "\n ──┼───┼──\n".join(filas) + "\n")
+
+
+def jugar(partida, eleccion=None):
+    """
+    La mascota se despista más cuanto más estresada o cansada está.
+    `eleccion` ("5 1 9"): casillas ya elegidas, sin preguntar.
+    """
+    c, data = partida.color, partida.data
+    error = dificultad(data["personalidad"]["estres"], data["energia"])
+    partida.mostrar(f"{c.GRAY}Tú eres X y {data['nombre']} es O. "
+                    f"Concentración: {(1 - error) * 100:.0f}%{c.RESET}")
+    tablero = [0] * 9
+    # Empieza uno cada vez; la ficha 1 es siempre la del que empieza
+    usuario = 1 if data["juegos_stats"].get("tictactoe", 0) % 2 == 0 else 2
+    pendientes = list(eleccion.replace(" ", "")) if eleccion is not None else None
+    while not terminado(tablero):
+        if turno(tablero) != usuario:
+            tablero[elegir(tablero, partida.rng, error)] = 3 - usuario
+            continue
+        dibujar(partida, tablero, usuario)
+        if pendientes is None:
+            texto = partida.preguntar("Casilla (1-9, 0 para rendirte): ").strip()
+        else:
+            texto = pendientes.pop(0) if pendientes else "0"
+        if texto == "0":
+            partida.mostrar(f"{c.YELLOW}Partida abandonada.{c.RESET}")
+            return None
+        if not texto.isdigit() or not 1 <= int(texto) <= 9 or tablero[int(texto) - 1]:
+            partida.mostrar(f"{c.RED}Casilla no válida.{c.RESET}")
+            if pendientes is not None:
+                return None
+            continue
+        tablero[int(texto) - 1] = usuario
+    dibujar(partida, tablero, usuario)
+
+    ficha = ganador(tablero)
+    if ficha == usuario:
+        return Resultado("usuario", 30, exp=40, afecto=8, hambre=-2, energia=-4)
+    if ficha:
+        return Resultado("ia", 3, exp=5, afecto=-1, hambre=-2, energia=-4)
+    return Resultado("empate", 8, exp=10, afecto=2, hambre=-2, energia=-4)
@@ -0,0 +1,53 @@
+"""
+Formato de la línea de estado que se muestra al abrir una terminal.
+Lo comparten +KOTA_STATUS.py y el daemon de +KOTA.py.
+"""
+
+# Colores ANSI
+C_RESET = '\033[0m'
+C_CYAN = '\033[96m'
+C_GREEN = '\033[92m'
+C_YELLOW = '\033[93m'
+C_RED = '\033[91m'
+C_MAGENTA = '\033[95m'
+C_BOLD = '\033[1m'
+
+def get_color(valor, es_inverso=False):
+    if es_inverso:
+        if valor < 30: return C_GREEN
+        if valor < 60: return C_YELLOW
+        return C_RED
+    else:
+        if valor > 70: return C_GREEN
+        if valor > 30: return C_YELLOW
+        return C_RED
+
+def linea_estado(c):
+    """`c` son los campos de snapshot.campos() con el tiempo ya simulado."""
+    nombre = c["nombre"]
+    if c["congelado"]:
+        return f"   ❄️  {C_BOLD}{nombre}{C_RESET}  ::  {C_CYAN}[CONGELADO EN CRIOSTASIS]{C_RESET}"
+
+    hambre = c["hambre"]
+    energia = c["energia"]
+    estres = c["estres"]
+    afecto = (c["afecto"] + 100) / 2
+
+    if c["status"] != "vivo":
+        estado_icon = "💀"
+        estado_txt = f"{C_RED}Muerto{C_RESET}"
+    elif c["estado_dormido"]:
+        estado_icon = "💤"
+        estado_txt = f"{C_CYAN}Dormido{C_RESET}"
+    else:
+        estado_icon = "●"
+        estado_txt = f"{C_GREEN}Activo{C_RESET}"
+
+    return (
+        f"   {estado_icon} {C_BOLD}{nombre}{C_RESET}  ::  "
+        f"🍖 {get_color(hambre)}{int(hambre)}%{C_RESET}  "
+        f"⚡ {get_color(energia)}{int(energia)}%{C_RESET}  "
+        f"🧠 {get_color(estres, True)}{int(estres)}%{C_RESET}  "
+        f"❤️  {C_MAGENTA}{int(afecto)}%{C_RESET}  "
+        f"[{estado_txt}]"
+    )
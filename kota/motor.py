@@ -0,0 +1,607 @@
+"""
+Reglas de +KOTA sin terminal ni disco.
+
+Motor tiene todo lo que cambia a la mascota (el paso del tiempo, comer, usar
+pociones, pasear, dormir, jugar, comprar, niveles y evolución) y nada de lo
+que la muestra o la guarda. Lo que pasa lo cuenta con emitir(suceso, **datos):
+
+    GeoPet (+KOTA.py)   hereda de Motor: escribe cada suceso en la terminal,
+                        pregunta con input() y guarda en disco
+    simular()           juega una lista de acciones sin pantalla, esperas ni
+                        preguntas, y devuelve el estado final y la traza
+
+El reloj (una función que devuelve el instante, como time.time) y el azar
+(un random.Random, o el módulo random) se pasan al crear el Motor: con un
+Reloj y una semilla, las mismas acciones dan siempre el mismo resultado.
+
+Sucesos (suceso: datos):
+
+    rechazo       accion, motivo (congelado, dormido, debil, cansado,
+                  desvelado, sin_monedas, sin_item, no_existe, no_congelado)
+                  y a veces nombre, categoria
+    compra        categoria, nombre, precio, cantidad
+    comida        nombre, tipo, hambre (total), cantidad
+    pocion        nombre, cantidad; congelacion y revive, si fue una de esas
+    caricia       reaccion (rechaza, tolera, encanta)
+    paseo, duerme, despierta, desequipa, descongelacion
+    equipa, renombre                      nombre
+    partida       juego, titulo (empieza); gana, pierde, empate: juego, monedas
+    nivel         nivel, bonus
+    evolucion     forma
+    escapo
+"""
+
+import time
+
+from kota import perezoso
+
+estadisticas = perezoso.modulo("kota.estadisticas")
+historial = perezoso.modulo("kota.historial")
+juegos = perezoso.modulo("kota.juegos")
+random = perezoso.modulo("random")
+reglas = perezoso.modulo("kota.reglas")
+simulacion = perezoso.modulo("kota.simulacion")
+
+# --- CATÁLOGO DE TIENDA (MODIFICADO) ---
+TIENDA_ITEMS = {
+    "comidas": {
+        "manzana": {"precio": 5, "hambre": 30, "tipo": "comun", "emoji": "🍎"},
+        "pizza": {"precio": 15, "hambre": 60, "tipo": "chatarra", "emoji": "🍕"},
+        "ensalada": {"precio": 12, "hambre": 45, "tipo": "saludable", "emoji": "🥗"},
+        "sushi": {"precio": 25, "hambre": 80, "tipo": "premium", "emoji": "🍣"},
+        "dulce": {"precio": 8, "hambre": 20, "tipo": "chatarra", "emoji": "🍬"},
+    },
+    "pociones": {
+        "energia_menor": {"precio": 20, "energia": 40, "emoji": "⚡"},
+        "energia_mayor": {"precio": 40, "energia": 80, "emoji": "🔋"},
+        "anti_estres": {"precio": 35, "estres": -50, "emoji": "😌"},
+        # MODIFICADO: full_revive ya no da afecto, solo restaura necesidades físicas
+        "full_revive": {"precio": 100, "hambre": 100, "energia": 100, "estres": -100, "emoji": "💊"},
+        # NUEVO ITEM: Crio-Cápsula
+        "crio_capsula": {"precio": 100, "emoji": "❄️", "desc": "Congela el estado de tu mascota"}
+    },
+    "accesorios": {
+        "sombrero": {"precio": 50, "emoji": "🎩", "tipo": "cabeza"},
+        "gafas": {"precio": 40, "emoji": "🕶️", "tipo": "cara"},
+        "corbata": {"precio": 35, "emoji": "👔", "tipo": "cuello"},
+        "corona": {"precio": 80, "emoji": "👑", "tipo": "cabeza"},
+        "bufanda": {"precio": 45, "emoji": "🧣", "tipo": "cuello"},
+    }
+}
+
+# Curva de niveles: exp para pasar del nivel 1 y cómo crece en cada subida
+EXP_MAX_INICIAL = 100
+
+
+def siguiente_exp_max(exp_max):
+    return int(exp_max * 1.5)
+
+
+# Suceso de registrar_partida() según quién ganó
+PARTIDAS = {"usuario": "gana", "ia": "pierde", "empate": "empate"}
+
+
+def nuevo(ahora=None):
+    """Datos de una mascota recién creada (la forma de GeoPet.data)."""
+    return {
+        "nombre": "Ente",
+        "hambre": 100.0,
+        "energia": 100.0,
+        "afecto": 50.0,
+        "ultima_conexion": time.time() if ahora is None else ahora,
+        "estado_dormido": False,
+        "congelado": False,  # NUEVO ESTADO
+        "maltrato_acumulado": 0,
+        "juegos_stats": {"rps": 0, "tictactoe": 0, "pares": 0, "adivina": 0},
+        "ia_memory": {
+            "rps_history": [],
+            "par_non_bias": 0
+        },
+        "status": "vivo",
+        "personalidad": {
+            "alimentacion_frecuencia": 0,
+            "privacion_sueno": 0,
+            "juego_favorito": "neutral",
+            "hambre_critica_count": 0,
+            "sobrealimentacion": 0,
+            "maltrato_psicologico": 0,
+            "amor_recibido": 0,
+            "estres": 0,
+            "comida_chatarra": 0,
+            "comida_saludable": 0,
+            "comida_premium": 0,
+        },
+        "historial": historial.nuevo(),
+        # Agregados de kota stats (kota/estadisticas.py); los crea
+        # estadisticas.migrar() al cargar
+        "estadisticas": {},
+        "nivel": 1,
+        "exp": 0,
+        "exp_max": EXP_MAX_INICIAL,
+        "monedas": 100,
+        "inventario": {
+            "comidas": {},
+            "pociones": {},
+            "accesorios": {}
+        },
+        "accesorio_equipado": None,
+        "forma_evolucion": "basico",
+    }
+
+
+class Reloj:
+    """Reloj simulado: vale lo que se le diga y solo avanza con avanzar()."""
+
+    def __init__(self, t=0.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+    def avanzar(self, segundos):
+        self.t += segundos
+
+
+class Motor:
+    # Quién contesta lo que pregunte un juego (pregunta -> texto). None: nadie,
+    # y cada pregunta cuenta como rendirse; los jugadores simulados de
+    # kota/balance.py ponen el suyo
+    preguntar = None
+
+    def __init__(self, data=None, reloj=None, rng=None, sucesos=None):
+        """
+        data: dict como el de nuevo() (si falta, una mascota nueva); reloj y
+        rng: ver arriba (por defecto time.time y random); sucesos: lista a la
+        que se añade (t, suceso, datos) por cada suceso, o None para no trazar.
+        """
+        self.reloj = reloj or time.time
+        self.rng = rng or random
+        self.sucesos = sucesos
+        self.cambios = False
+        self.n_cambios = 0
+        # Reglas de kota/reglas.py: cada evaluación solo recalcula lo que cambió
+        self.puntos_evolucion = reglas.REGLAS_EVOLUCION.evaluador()
+        self.puntos_estres = reglas.REGLAS_ESTRES.evaluador()
+        if data is None:
+            data = nuevo(self.reloj())
+            data["estadisticas"] = estadisticas.nuevas(self.reloj())
+        self.data = data
+
+    def emitir(self, suceso, **datos):
+        if self.sucesos is not None:
+            self.sucesos.append((self.reloj(), suceso, datos))
+
+    def marcar_cambios(self):
+        self.cambios = True
+        self.n_cambios += 1
+
+    def rechazar(self, accion, motivo, **datos):
+        self.emitir("rechazo", accion=accion, motivo=motivo, **datos)
+
+    # ==========================================================
+    # TIEMPO Y LÍMITES
+    # ==========================================================
+    def avanzar(self, ahora=None):
+        """Aplica el tiempo transcurrido hasta `ahora` (el reloj) y pone al día la personalidad."""
+        self.procesar_tiempo_offline(ahora)
+        self.actualizar_personalidad()
+
+    def procesar_tiempo_offline(self, ahora=None, simular=False):
+        # Si está congelado, no procesar nada
+        if self.data.get("congelado", False):
+            return
+
+        # El modelo (tasas por hora, penalización nocturna) está en kota/simulacion.py
+        if ahora is None:
+            ahora = self.reloj()
+        p = self.data["personalidad"]
+        estado = simulacion.avanzar({
+            "hambre": self.data["hambre"],
+            "energia": self.data["energia"],
+            "afecto": self.data["afecto"],
+            "privacion_sueno": p["privacion_sueno"],
+            "maltrato_acumulado": self.data["maltrato_acumulado"],
+            "estado_dormido": self.data["estado_dormido"],
+        }, self.data["ultima_conexion"], ahora)
+
+        for key in ("hambre", "energia", "afecto", "maltrato_acumulado"):
+            self.data[key] = estado[key]
+        p["privacion_sueno"] = estado["privacion_sueno"]
+        # El reloj avanza con el estado: procesar otra vez (kota shell) no vuelve
+        # a contar el mismo tramo. Los tramos cortos se acumulan hasta contar.
+        if (ahora - self.data["ultima_conexion"]) / 3600 >= simulacion.MIN_HORAS:
+            self.data["ultima_conexion"] = ahora
+
+        if simular:
+            self.limitar_valores()
+        else:
+            self.check_limites()
+
+    def check_limites(self):
+        self.limitar_valores()
+        if (self.data["afecto"] < simulacion.FUGA_AFECTO
+                or self.data["maltrato_acumulado"] > simulacion.FUGA_MALTRATO):
+            self.escapar()
+
+    def limitar_valores(self):
+        self.data["hambre"] = max(0, min(100, self.data["hambre"]))
+        self.data["energia"] = max(0, min(100, self.data["energia"]))
+        self.data["afecto"] = max(-100, min(100, self.data["afecto"]))
+
+        for key in ["privacion_sueno", "estres", "maltrato_psicologico"]:
+            if key in self.data["personalidad"]:
+                self.data["personalidad"][key] = max(0, min(100,
+                    self.data["personalidad"][key]))
+
+    def escapar(self):
+        self.data["status"] = "escapado"
+        self.emitir("escapo")
+        self.marcar_cambios()
+
+    # ==========================================================
+    # SISTEMA DE NIVELES Y EXPERIENCIA
+    # ==========================================================
+    def ganar_exp(self, cantidad):
+        if self.data.get("congelado", False): return
+
+        self.data["exp"] += cantidad
+        while self.data["exp"] >= self.data["exp_max"]:
+            self.data["exp"] -= self.data["exp_max"]
+            self.data["nivel"] += 1
+            self.data["exp_max"] = siguiente_exp_max(self.data["exp_max"])
+            estadisticas.nivel(self.data["estadisticas"], self.data["nivel"], self.reloj())
+            monedas_bonus = self.data["nivel"] * 20
+            self.emitir("nivel", nivel=self.data["nivel"], bonus=monedas_bonus)
+            self.data["monedas"] += monedas_bonus
+            estadisticas.monedas(self.data["estadisticas"], monedas_bonus, "nivel")
+            self.data["energia"] = min(100, self.data["energia"] + 20)
+            self.data["hambre"] = min(100, self.data["hambre"] + 20)
+        self.determinar_evolucion()
+
+    def determinar_evolucion(self):
+        # Puntos de cada forma: reglas.EVOLUCION
+        forma_anterior = self.data["forma_evolucion"]
+        forma = "basico"
+        if self.data["nivel"] >= reglas.EVOLUCION_NIVEL:
+            puntos = self.puntos_evolucion.evaluar(self.data)
+            mejor = max(puntos, key=puntos.get)
+            if puntos[mejor] > reglas.EVOLUCION_PUNTOS:
+                forma = mejor
+        self.data["forma_evolucion"] = forma
+
+        if forma_anterior != forma and self.data["nivel"] >= reglas.EVOLUCION_NIVEL:
+            self.emitir("evolucion", forma=forma)
+
+    def actualizar_personalidad(self):
+        p = self.data["personalidad"]
+        p["estres"] = min(reglas.ESTRES_MAXIMO, self.puntos_estres.evaluar(self.data)["estres"])
+
+        stats = self.data["juegos_stats"]
+        if sum(stats.values()) > 5:
+            p["juego_favorito"] = max(stats, key=stats.get)
+        if self.data["hambre"] < 20:
+            p["hambre_critica_count"] += 0.01
+
+    # ==========================================================
+    # TIENDA E INVENTARIO
+    # ==========================================================
+    def comprar(self, categoria, nombre, cantidad=1):
+        """
+        Compra sin menús, todas las unidades de una vez (las que den las
+        monedas). Devuelve cuántas se compraron.
+        """
+        if self.check_congelado("comprar"): return 0
+        item = TIENDA_ITEMS.get(categoria, {}).get(nombre)
+        if item is None:
+            self.rechazar("comprar", "no_existe", nombre=nombre, categoria=categoria)
+            return 0
+        precio = item["precio"]
+        comprados = min(cantidad, self.data["monedas"] // precio) if precio else cantidad
+
+        if comprados > 0:
+            self.data["monedas"] -= precio * comprados
+            estadisticas.monedas(self.data["estadisticas"], -precio * comprados, categoria)
+            inventario = self.data["inventario"][categoria]
+            inventario[nombre] = inventario.get(nombre, 0) + comprados
+            self.emitir("compra", categoria=categoria, nombre=nombre, precio=precio, cantidad=comprados)
+            self.marcar_cambios()
+        if comprados < cantidad:
+            self.rechazar("comprar", "sin_monedas", nombre=nombre)
+        return comprados
+
+    # ==========================================================
+    # USO DE ITEMS
+    # ==========================================================
+    def alimentar(self, nombre, cantidad=1):
+        return self.usar("comidas", nombre, cantidad)
+
+    def usar(self, categoria, nombre, cantidad=1):
+        """
+        Usa `cantidad` unidades de un item del inventario (las que haya) como
+        una sola actualización. Devuelve cuántas se usaron.
+        """
+        if self.check_congelado("usar"): return 0
+        if self.data["estado_dormido"]:
+            self.rechazar("usar", "dormido")
+            return 0
+        disponibles = self.data["inventario"][categoria].get(nombre, 0)
+        if nombre not in TIENDA_ITEMS[categoria] or disponibles <= 0:
+            self.rechazar("usar", "sin_item", nombre=nombre)
+            return 0
+        usados = self._consumir_item(categoria, nombre, min(cantidad, disponibles))
+        if min(cantidad, disponibles) < cantidad:
+            self.rechazar("usar", "sin_item", nombre=nombre)
+        return usados
+
+    def _consumir_item(self, categoria, nombre, cantidad=1):
+        """Aplica `cantidad` unidades de golpe; devuelve las que se gastaron."""
+        # Los efectos solo suman o solo restan y los límites se aplican al
+        # final: da lo mismo que usar las unidades de una en una
+        item = TIENDA_ITEMS[categoria][nombre]
+        if nombre in ("crio_capsula", "full_revive"):
+            cantidad = 1  # repetirlas no cambia nada
+        self.data["inventario"][categoria][nombre] -= cantidad
+
+        if categoria == "comidas":
+            self._usar_comida_efecto(nombre, item, cantidad)
+        elif categoria == "pociones":
+            self._usar_pocion_efecto(nombre, item, cantidad)
+
+        if nombre != "crio_capsula": # Congelar no da XP inmediata
+            self.ganar_exp(15 * cantidad)
+
+        self.actualizar_personalidad()
+        self.check_limites()
+        self.determinar_evolucion()
+        self.marcar_cambios()
+        return cantidad
+
+    def _usar_comida_efecto(self, nombre, item, cantidad=1):
+        self.data["hambre"] += item["hambre"] * cantidad
+        self.data["afecto"] += 3 * cantidad
+        tipo = item.get("tipo", "comun")
+        if tipo == "chatarra": self.data["personalidad"]["comida_chatarra"] += cantidad
+        elif tipo == "saludable": self.data["personalidad"]["comida_saludable"] += cantidad
+        elif tipo == "premium": self.data["personalidad"]["comida_premium"] += cantidad
+        ahora = self.reloj()
+        for _ in range(cantidad):
+            historial.registrar(self.data["historial"], "alimentaciones", ahora)
+        estadisticas.comida(self.data["estadisticas"], nombre, tipo, cantidad)
+        self.emitir("comida", nombre=nombre, tipo=tipo, hambre=item["hambre"] * cantidad, cantidad=cantidad)
+
+    def _usar_pocion_efecto(self, nombre, item, cantidad=1):
+        self.emitir("pocion", nombre=nombre, cantidad=cantidad)
+
+        if nombre == "crio_capsula":
+            self.data["congelado"] = True
+            self.emitir("congelacion")
+
+        elif nombre == "full_revive":
+            self.data["hambre"] = 100
+            self.data["energia"] = 100
+            self.data["personalidad"]["estres"] = 0
+            self.data["personalidad"]["privacion_sueno"] = 0
+            self.emitir("revive")
+
+        else:
+            if "energia" in item:
+                self.data["energia"] += item["energia"] * cantidad
+            if "estres" in item:
+                self.data["personalidad"]["estres"] += item["estres"] * cantidad
+
+    # ==========================================================
+    # ACCIONES
+    # ==========================================================
+    def check_congelado(self, accion=None):
+        if self.data.get("congelado", False):
+            self.rechazar(accion, "congelado")
+            return True
+        return False
+
+    def descongelar(self):
+        if not self.data.get("congelado", False):
+            self.rechazar("descongelar", "no_congelado")
+            return False
+
+        self.data["congelado"] = False
+        self.data["ultima_conexion"] = self.reloj() # Reiniciar reloj
+        self.marcar_cambios()
+        self.emitir("descongelacion")
+        return True
+
+    def renombrar(self, nuevo_nombre):
+        if self.check_congelado("renombrar"): return
+        self.data["nombre"] = nuevo_nombre
+        self.marcar_cambios()
+        self.emitir("renombre", nombre=nuevo_nombre)
+
+    def acariciar(self):
+        if self.check_congelado("acariciar"): return
+        if self.data["estado_dormido"]:
+            self.rechazar("acariciar", "dormido")
+            return
+
+        if self.data["afecto"] < -20:
+            self.emitir("caricia", reaccion="rechaza")
+            self.data["afecto"] += 0.5
+        elif self.data["afecto"] < 20:
+            self.emitir("caricia", reaccion="tolera")
+            self.data["afecto"] += 2
+            self.data["personalidad"]["estres"] -= 2
+        else:
+            self.emitir("caricia", reaccion="encanta")
+            self.data["afecto"] += 4
+            self.data["personalidad"]["estres"] -= 5
+            self.data["personalidad"]["amor_recibido"] += 1
+
+        self.ganar_exp(10)
+        self.actualizar_personalidad()
+        self.check_limites()
+        self.marcar_cambios()
+
+    def pasear(self):
+        if self.check_congelado("pasear"): return
+        if self.data["estado_dormido"]:
+            self.rechazar("pasear", "dormido")
+            return
+        if self.data["energia"] < 10 or self.data["hambre"] < 10:
+            self.rechazar("pasear", "debil")
+            return
+
+        self.data["energia"] -= 10
+        self.data["hambre"] -= 5
+        self.data["afecto"] += 15
+        self.data["personalidad"]["estres"] -= 25
+
+        ahora = self.reloj()
+        historial.registrar(self.data["historial"], "paseos", ahora)
+        estadisticas.paseo(self.data["estadisticas"], ahora)
+
+        self.emitir("paseo")
+        self.ganar_exp(25)
+        self.actualizar_personalidad()
+        self.check_limites()
+        self.marcar_cambios()
+
+    def dormir(self):
+        if self.check_congelado("dormir"): return
+        if not self.data["estado_dormido"]:
+            if self.data["energia"] > 80:
+                self.rechazar("dormir", "desvelado")
+                return
+            self.data["estado_dormido"] = True
+            ahora = self.reloj()
+            historial.registrar(self.data["historial"], "ciclos_sueno", {
+                "inicio": ahora,
+                "energia_inicio": self.data["energia"]
+            })
+            estadisticas.dormir(self.data["estadisticas"], ahora)
+            self.emitir("duerme")
+        else:
+            self.data["estado_dormido"] = False
+            estadisticas.despertar(self.data["estadisticas"], self.reloj())
+            self.emitir("despierta")
+        self.marcar_cambios()
+
+    def equipar_accesorio(self, nombre):
+        if self.check_congelado("equipar"): return False
+        if nombre not in self.data["inventario"]["accesorios"] or self.data["inventario"]["accesorios"][nombre] == 0:
+            self.rechazar("equipar", "sin_item", nombre=nombre)
+            return False
+        self.data["accesorio_equipado"] = nombre
+        self.marcar_cambios()
+        self.emitir("equipa", nombre=nombre)
+        return True
+
+    def desequipar_accesorio(self):
+        if self.check_congelado("desequipar"): return False
+        self.data["accesorio_equipado"] = None
+        self.marcar_cambios()
+        self.emitir("desequipa")
+        return True
+
+    # ==========================================================
+    # JUEGOS
+    # ==========================================================
+    def partida(self):
+        """Lo que ve un juego: sin terminal ni colores; las preguntas, a self.preguntar."""
+        if self.preguntar is None:
+            return juegos.Partida(self.data, self.rng)
+        return juegos.Partida(self.data, self.rng, preguntar=self.preguntar)
+
+    def jugar(self, tipo_juego, eleccion=None):
+        if self.check_congelado("jugar"): return
+        if self.data["estado_dormido"]:
+            self.rechazar("jugar", "dormido")
+            return
+        if self.data["energia"] < 5:
+            self.rechazar("jugar", "cansado")
+            return
+
+        # Cada juego es un módulo de kota/juegos/, importado al jugarlo
+        juego = juegos.cargar(tipo_juego)
+        if juego is None:
+            self.rechazar("jugar", "no_existe", nombre=tipo_juego, categoria="juegos")
+            return
+        self.emitir("partida", juego=tipo_juego, titulo=juego.TITULO)
+        resultado = juego.jugar(self.partida(), eleccion)
+        if resultado is not None:
+            self.registrar_partida(tipo_juego, resultado)
+
+    def registrar_partida(self, juego, resultado):
+        """Fin de una partida (un juegos.Resultado): premio, juegos_stats, historial y estadísticas."""
+        ahora = self.reloj()
+        self.emitir(PARTIDAS[resultado.ganador], juego=juego, monedas=resultado.monedas)
+        self.data["afecto"] += resultado.afecto
+        if resultado.exp:
+            self.ganar_exp(resultado.exp)
+        self.data["hambre"] += resultado.hambre
+        self.data["energia"] += resultado.energia
+        self.data["monedas"] += resultado.monedas
+        self.data["juegos_stats"][juego] = self.data["juegos_stats"].get(juego, 0) + 1
+        historial.registrar(self.data["historial"], "sesiones_juego",
+                            {"t": ahora, "juego": juego, "gano": resultado.ganador == "usuario"})
+        estadisticas.partida(self.data["estadisticas"], juego, resultado.ganador)
+        estadisticas.monedas(self.data["estadisticas"], resultado.monedas, "juegos")
+        self.marcar_cambios()
+
+
+# ==========================================================
+# SIMULACIÓN
+# ==========================================================
+# Acciones de simular(): nombre -> método de Motor
+ACCIONES = {
+    "alimentar": "alimentar",
+    "usar": "usar",
+    "comprar": "comprar",
+    "acariciar": "acariciar",
+    "pasear": "pasear",
+    "dormir": "dormir",
+    "jugar": "jugar",
+    "equipar": "equipar_accesorio",
+    "desequipar": "desequipar_accesorio",
+    "descongelar": "descongelar",
+    "renombrar": "renombrar",
+}
+
+
+def _politica(acciones):
+    siguientes = iter(acciones)
+    return lambda motor: next(siguientes, None)
+
+
+def simular(acciones, data=None, inicio=None, semilla=0, trazar=True, limite=None):
+    """
+    Juega sin pantalla, esperas, preguntas ni disco. Cada acción es
+    (segundos, accion, *args): pasan `segundos` (como entre dos comandos:
+    decaimiento y personalidad) y se llama al método de ACCIONES.
+
+    `acciones` es una lista (o cualquier iterable) de acciones, o una función
+    que recibe el Motor y devuelve la siguiente según el estado (None para
+    terminar). Se para también si la mascota se va de casa o tras `limite`
+    acciones. El tiempo empieza en `inicio` (por defecto, ahora); `data` (un
+    guardado ya cargado) se modifica en su sitio.
+
+    Devuelve el Motor: .data es el estado final, .sucesos la traza
+    [(t, suceso, datos)] (None con trazar=False) y .pasos las acciones jugadas.
+    """
+    reloj = Reloj(time.time() if inicio is None else inicio)
+    if data is not None:
+        data["ultima_conexion"] = reloj()
+        estadisticas.migrar(data, reloj())
+    motor = Motor(data, reloj, random.Random(semilla), [] if trazar else None)
+    siguiente = acciones if callable(acciones) else _politica(acciones)
+    motor.pasos = 0
+    while motor.data["status"] == "vivo" and (limite is None or motor.pasos < limite):
+        accion = siguiente(motor)
+        if accion is None:
+            break
+        espera, nombre, *args = accion
+        if espera:
+            reloj.avanzar(espera)
+            motor.avanzar()
+            if motor.data["status"] != "vivo":
+                break
+        getattr(motor, ACCIONES[nombre])(*args)
+        motor.pasos += 1
+    return motor
@@ -0,0 +1,70 @@
+"""
+Redibujado incremental de la terminal para `kota shell`.
+
+Pantalla recuerda el último cuadro y solo reescribe las filas que cambiaron,
+colocando el cursor con secuencias ANSI. Cada cuadro sale en una sola
+escritura (os.write) y nunca se lanza `clear`.
+"""
+
+import os
+
+# Pantalla alternativa: al salir la terminal queda como estaba
+ENTRAR = "\033[?1049h\033[H\033[2J"
+SALIR = "\033[?1049l"
+LIMPIAR = "\033[H\033[2J"
+# Lo mismo que hace `clear`: también vacía el historial de la terminal
+BORRAR = LIMPIAR + "\033[3J"
+
+
+def _ir(fila):
+    return f"\033[{fila};1H"
+
+
+class Pantalla:
+    def __init__(self, fd=1):
+        self.fd = fd
+        self.filas = []
+        self.limpiar = False
+        self.escrituras = 0
+
+    def escribir(self, texto):
+        datos = texto.encode("utf-8")
+        self.escrituras += 1
+        while datos:
+            n = os.write(self.fd, datos)
+            datos = datos[n:]
+
+    def invalidar(self):
+        # Alguien escribió por su cuenta (un menú interactivo): el próximo cuadro va entero
+        self.filas = []
+        self.limpiar = True
+
+    def _cambios(self, filas):
+        partes = [LIMPIAR] if self.limpiar else []
+        for i, fila in enumerate(filas):
+            if i >= len(self.filas) or self.filas[i] != fila:
+                partes.append(f"{_ir(i + 1)}{fila}\033[K")
+        return partes
+
+    def dibujar(self, filas, prompt):
+        """Cuadro completo: filas que cambiaron, el resto borrado y el prompt debajo."""
+        partes = self._cambios(filas)
+        partes.append(f"{_ir(len(filas) + 1)}\033[J{prompt}")
+        self.escribir("".join(partes))
+        self.filas = list(filas)
+        self.limpiar = False
+
+    def refrescar(self, filas):
+        """
+        Actualiza las filas sin mover el cursor (el usuario puede estar
+        escribiendo en el prompt). Si cambió el número de filas no hace nada:
+        el prompt se movería. Devuelve True si hubo que escribir.
+        """
+        if self.limpiar or len(filas) != len(self.filas):
+            return False
+        partes = self._cambios(filas)
+        if not partes:
+            return False
+        self.escribir("\0337" + "".join(partes) + "\0338")
+        self.filas = list(filas)
+        return True
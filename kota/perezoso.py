@@ -0,0 +1,31 @@
+"""
+Importación perezosa para +KOTA.py.
+
+modulo() devuelve un sustituto que importa el módulo real al usar el primer
+atributo, así que `kota ayuda` o `kota completar` no pagan json, sockets ni
+nada de lo que no van a usar. Es un proxy mínimo a propósito: importlib.util
+(LazyLoader) cuesta más de lo que ahorra en un arranque tan corto.
+"""
+
+import sys
+
+
+class modulo:
+    def __init__(self, nombre):
+        self._nombre = nombre
+        self._modulo = None
+
+    def __getattr__(self, atributo):
+        # Solo se llama para lo que no está en el propio sustituto. Lo que se
+        # pide se copia en él, así que la segunda vez cuesta lo mismo que un
+        # atributo normal (kota/motor.py los usa en cada acción simulada); por
+        # eso no vale para variables del módulo que este reasigna después
+        if self._modulo is None:
+            __import__(self._nombre)
+            self._modulo = sys.modules[self._nombre]
+        valor = getattr(self._modulo, atributo)
+        self.__dict__[atributo] = valor
+        return valor
+
+    def __repr__(self):
+        return f"<módulo perezoso {self._nombre}>"
@@ -0,0 +1,187 @@
+"""
+Reglas de evolución y de estrés como datos.
+
+Cada regla es una lista de términos que se suman:
+
+    (entrada, "<", umbral, puntos)    `puntos` si entrada < umbral
+    (entrada, ">", umbral, puntos)    `puntos` si entrada > umbral
+    (entrada, "*", factor)            entrada * factor
+
+Las entradas son los nombres de ENTRADAS (lo que se puede leer del guardado).
+Para cambiar el balance basta con tocar EVOLUCION o ESTRES: se compilan una
+sola vez (Reglas) y cada Evaluador recuerda de qué valores salieron
+los últimos puntos de cada grupo, así que al volver a evaluar solo suma los
+grupos con alguna entrada cambiada.
+
+Para probar un cambio sin tocar este archivo, `kota balance` acepta
+"reglas.<grupo>.<i>.<umbral|puntos>" (el término i del grupo, desde 0, con
+Reglas.cambiar()) y "reglas.<CONSTANTE>" en sus parámetros y barridos.
+"""
+
+from kota import perezoso
+
+historial = perezoso.modulo("kota.historial")
+
+# Cómo se lee cada entrada de un guardado `d` (expresiones de Python: se
+# compilan dentro del evaluador)
+ENTRADAS = {
+    "hambre": 'd["hambre"]',
+    "energia": 'd["energia"]',
+    "afecto": 'd["afecto"]',
+    "privacion_sueno": 'd["personalidad"].get("privacion_sueno", 0)',
+    "maltrato_psicologico": 'd["personalidad"].get("maltrato_psicologico", 0)',
+    "comida_saludable": 'd["personalidad"].get("comida_saludable", 0)',
+    "comida_chatarra": 'd["personalidad"].get("comida_chatarra", 0)',
+    "comida_premium": 'd["personalidad"].get("comida_premium", 0)',
+    "paseos": 'historial.total(d["historial"], "paseos")',
+    "juegos_mentales": 'd["juegos_stats"].get("tictactoe", 0) + d["juegos_stats"].get("adivina", 0)',
+    "accesorio": '1 if d["accesorio_equipado"] else 0',
+}
+
+# determinar_evolucion(): desde EVOLUCION_NIVEL gana la forma con más puntos,
+# si pasa de EVOLUCION_PUNTOS (a igualdad, la primera); si no, "basico"
+EVOLUCION = {
+    "atletico": [
+        ("paseos", ">", 10, 30),
+        ("comida_saludable", ">", 15, 25),
+        ("energia", ">", 70, 15),
+    ],
+    "intelectual": [
+        ("juegos_mentales", ">", 15, 40),
+        ("comida_chatarra", "<", 5, 20),
+        ("afecto", ">", 60, 15),
+    ],
+    "premium": [
+        ("comida_premium", ">", 10, 40),
+        ("afecto", ">", 80, 25),
+        ("accesorio", ">", 0, 20),
+    ],
+    "rebelde": [
+        ("comida_chatarra", ">", 20, 35),
+        ("privacion_sueno", ">", 40, 25),
+        ("afecto", "<", 20, 30),
+    ],
+}
+EVOLUCION_NIVEL = 5
+EVOLUCION_PUNTOS = 50
+
+# simulacion.estres() y actualizar_personalidad(), hasta ESTRES_MAXIMO
+ESTRES = {
+    "estres": [
+        ("hambre", "<", 30, 30),
+        ("energia", "<", 30, 20),
+        ("afecto", "<", 0, 30),
+        ("privacion_sueno", "*", 1),
+        ("maltrato_psicologico", "*", 5),
+    ],
+}
+ESTRES_MAXIMO = 100
+
+
+class Reglas:
+    """
+    Reglas compiladas. grupos: {nombre: [términos]}, como EVOLUCION.
+    terminos: [(grupo, entrada, op, umbral, puntos)], en orden (puntos es
+    None en los de "*"); ValueError si alguno no se entiende.
+
+    evaluador() las compila a una función que lee cada entrada una vez y, por
+    grupo, compara la tupla de sus entradas con la de la última evaluación:
+    solo si cambió vuelve a sumar sus términos (en su orden, así que da lo
+    mismo que sumarlos desde cero).
+    """
+
+    def __init__(self, grupos):
+        self.grupos = list(grupos)
+        self.terminos = []
+        for grupo, terminos in grupos.items():
+            for termino in terminos:
+                if len(termino) == 3 and termino[1] == "*":
+                    termino = (*termino, None)
+                if (len(termino) != 4 or termino[0] not in ENTRADAS or termino[1] not in ("<", ">", "*")
+                        or not all(isinstance(x, (int, float)) for x in termino[2:] if x is not None)):
+                    raise ValueError(f"término no válido en {grupo}: {termino!r}")
+                self.terminos.append((grupo, *termino))
+        # Se compila al crear el primer Evaluador: el monitor solo usa puntuar()
+        self.funcion = None
+
+    def _compilar(self):
+        entradas = list(dict.fromkeys(t[1] for t in self.terminos))
+        nombre = {entrada: f"e{i}" for i, entrada in enumerate(entradas)}
+        lineas = ["def evaluar(d, claves, puntos):"]
+        lineas += [f"    {nombre[e]} = {ENTRADAS[e]}" for e in entradas]
+        for g, grupo in enumerate(self.grupos):
+            terminos = [t for t in self.terminos if t[0] == grupo]
+            # De qué entradas depende el grupo
+            clave = ", ".join(dict.fromkeys(nombre[t[1]] for t in terminos))
+            suma = " + ".join(["0"] + [
+                f"{v} * {umbral!r}" if op == "*" else f"({puntos!r} if {v} {op} {umbral!r} else 0)"
+                for _, entrada, op, umbral, puntos in terminos for v in [nombre[entrada]]])
+            lineas += [f"    k = ({clave},)",
+                       f"    if claves[{g}] != k:",
+                       f"        claves[{g}] = k",
+                       f"        puntos[{grupo!r}] = {suma}"]
+        lineas.append("    return puntos")
+        espacio = {"historial": historial}
+        exec(compile("\n".join(lineas), f"<reglas {', '.join(self.grupos)}>", "exec"), espacio)
+        return espacio["evaluar"]
+
+    def _indice(self, grupo, i):
+        indices = [n for n, t in enumerate(self.terminos) if t[0] == grupo]
+        if not 0 <= i < len(indices):
+            raise ValueError(f"{grupo} no tiene término {i}")
+        return indices[i]
+
+    def termino(self, grupo, i):
+        """{"umbral": ..., "puntos": ...} del término `i` de `grupo` (en los de "*", umbral es el factor)."""
+        _, _, _, umbral, puntos = self.terminos[self._indice(grupo, i)]
+        return {"umbral": umbral, "puntos": puntos}
+
+    def cambiar(self, grupo, i, campo, valor):
+        """Cambia el umbral o los puntos de un término; los Evaluador nuevos ya lo usan."""
+        n = self._indice(grupo, i)
+        g, entrada, op, umbral, puntos = self.terminos[n]
+        if campo not in ("umbral", "puntos") or (campo == "puntos" and op == "*"):
+            raise ValueError(f"{grupo}.{i} no tiene {campo}")
+        if not isinstance(valor, (int, float)) or isinstance(valor, bool):
+            raise ValueError(f"{grupo}.{i}.{campo}: se esperaba un número")
+        if campo == "umbral":
+            umbral = valor
+        else:
+            puntos = valor
+        self.terminos[n] = (g, entrada, op, umbral, puntos)
+        # Se vuelve a compilar con el próximo evaluador()
+        self.funcion = None
+
+    def puntuar(self, valores):
+        """{grupo: puntos} desde cero, con `valores` = {entrada: valor}; sin compilar."""
+        puntos = dict.fromkeys(self.grupos, 0)
+        for grupo, entrada, op, umbral, p in self.terminos:
+            x = valores[entrada]
+            if op == "*":
+                puntos[grupo] += x * umbral
+            elif x < umbral if op == "<" else x > umbral:
+                puntos[grupo] += p
+        return puntos
+
+    def evaluador(self):
+        if self.funcion is None:
+            self.funcion = self._compilar()
+        return Evaluador(self)
+
+
+class Evaluador:
+    """Puntos de unas Reglas sobre un guardado, recalculando solo los grupos cuyas entradas cambiaron."""
+
+    def __init__(self, reglas):
+        self.funcion = reglas.funcion
+        self.claves = [None] * len(reglas.grupos)
+        self.puntos = dict.fromkeys(reglas.grupos, 0)
+
+    def evaluar(self, data):
+        """{grupo: puntos} para `data` (el dict es del evaluador: no modificarlo)."""
+        return self.funcion(data, self.claves, self.puntos)
+
+
+# Motor crea un Evaluador de cada una
+REGLAS_EVOLUCION = Reglas(EVOLUCION)
+REGLAS_ESTRES = Reglas(ESTRES)
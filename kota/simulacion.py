@@ -0,0 +1,177 @@
+"""
+Modelo de decaimiento de +KOTA, compartido por +KOTA.py (procesar_tiempo_offline)
+y +KOTA_STATUS.py.
+
+avanzar() calcula en forma cerrada el estado tras un intervalo: el coste es el
+mismo para un minuto que para un mes de ausencia. La penalización nocturna
+(despierto y con energía < 15 entre las 00:00 y las 06:59) se aplica una vez
+por noche, en un instante concreto: a las 00:00, o cuando la energía cruza el
+umbral si eso pasa ya de noche. Un intervalo (inicio, fin] cobra las noches
+cuyo instante cae dentro, así que partir una ausencia en muchos tramos
+(kota shell, comandos seguidos) cuesta lo mismo que un solo tramo.
+"""
+
+import math
+from datetime import datetime, timedelta
+
+from kota import reglas
+
+# Por hora
+HAMBRE_DESPIERTO = 4.2
+ENERGIA_DESPIERTO = -4.2
+PRIVACION_DESPIERTO = 1.0
+HAMBRE_DORMIDO = 0.5
+ENERGIA_DORMIDO = 50.0
+PRIVACION_DORMIDO = -5.0
+
+# Intervalos más cortos no cuentan (evita ruido entre comandos seguidos)
+MIN_HORAS = 0.02
+
+NOCHE_FIN = 7            # la noche va de las 00:00 a las 06:59
+ENERGIA_NOCTURNA = 15
+PENALIZACION_NOCTURNA = 5
+
+_EPOCA_LOCAL = datetime(1970, 1, 1)
+
+# Avisos de `kota vigilar`
+UMBRALES = (30, 20, 10)
+# check_limites(): la mascota se va si se cumple cualquiera de las dos
+FUGA_AFECTO = -90
+FUGA_MALTRATO = 300
+
+
+def limitar(valor, minimo, maximo):
+    return max(minimo, min(maximo, valor))
+
+
+def _horas_locales(t):
+    # Horas desde 1970 en hora local, para contar noches en O(1)
+    return (datetime.fromtimestamp(t) - _EPOCA_LOCAL).total_seconds() / 3600
+
+
+def noches_entre(inicio, fin, cruce=None):
+    """
+    Noches penalizadas en (inicio, fin]. cruce: cuándo baja la energía del
+    umbral, si es en este intervalo (None: ya estaba por debajo al empezar).
+    Cuentan las 00:00 posteriores al cruce y, si el cruce es de noche, esa noche.
+    """
+    if cruce is not None:
+        if cruce > fin:
+            return 0
+        inicio = cruce
+    a = _horas_locales(inicio)
+    b = _horas_locales(fin)
+    # Medianoches (múltiplos de 24) en (a, b]
+    noches = max(0, math.floor(b / 24) - math.floor(a / 24))
+    if cruce is not None and a % 24 < NOCHE_FIN:
+        noches += 1
+    return noches
+
+
+def avanzar(estado, inicio, fin):
+    """
+    Devuelve una copia de `estado` tras pasar de `inicio` a `fin` (timestamps).
+    Usa las claves hambre, energia, afecto, privacion_sueno, maltrato_acumulado,
+    estado_dormido y congelado; las demás se copian tal cual.
+    """
+    nuevo = dict(estado)
+    horas = (fin - inicio) / 3600
+    if nuevo.get("congelado", False) or horas < MIN_HORAS:
+        return nuevo
+
+    energia = nuevo["energia"]
+    if nuevo["estado_dormido"]:
+        nuevo["hambre"] -= horas * HAMBRE_DORMIDO
+        nuevo["energia"] += horas * ENERGIA_DORMIDO
+        nuevo["privacion_sueno"] = nuevo.get("privacion_sueno", 0) + horas * PRIVACION_DORMIDO
+    else:
+        nuevo["hambre"] -= horas * HAMBRE_DESPIERTO
+        nuevo["energia"] += horas * ENERGIA_DESPIERTO
+        nuevo["privacion_sueno"] = nuevo.get("privacion_sueno", 0) + horas * PRIVACION_DESPIERTO
+
+        # Despierto la energía solo baja: si ya estaba bajo el umbral, la
+        # noche del cruce se cobró en el tramo en el que cruzó
+        noches = noches_entre(inicio, fin, _cruce(energia, inicio))
+        if noches:
+            nuevo["afecto"] -= PENALIZACION_NOCTURNA * noches
+            nuevo["maltrato_acumulado"] = nuevo.get("maltrato_acumulado", 0) + PENALIZACION_NOCTURNA * noches
+
+    nuevo["hambre"] = limitar(nuevo["hambre"], 0, 100)
+    nuevo["energia"] = limitar(nuevo["energia"], 0, 100)
+    nuevo["afecto"] = limitar(nuevo["afecto"], -100, 100)
+    nuevo["privacion_sueno"] = limitar(nuevo["privacion_sueno"], 0, 100)
+    return nuevo
+
+
+def estres(hambre, energia, afecto, privacion_sueno, maltrato_psicologico):
+    """Estrés según reglas.ESTRES (sin recordar nada entre llamadas)."""
+    puntos = reglas.REGLAS_ESTRES.puntuar({
+        "hambre": hambre, "energia": energia, "afecto": afecto,
+        "privacion_sueno": privacion_sueno, "maltrato_psicologico": maltrato_psicologico,
+    })
+    return min(reglas.ESTRES_MAXIMO, puntos["estres"])
+
+
+def _cruce(energia, inicio):
+    """Cuándo baja (despierta) la energía del umbral nocturno; None si ya está por debajo."""
+    if energia < ENERGIA_NOCTURNA:
+        return None
+    return inicio + (energia - ENERGIA_NOCTURNA) / -ENERGIA_DESPIERTO * 3600
+
+
+def _noche_n(inicio, cruce, n):
+    """Instante en que noches_entre(inicio, t, cruce) llega a n (n >= 1)."""
+    desde = inicio
+    if cruce is not None:
+        desde = cruce
+        if datetime.fromtimestamp(cruce).hour < NOCHE_FIN:
+            # La noche en la que cruza se cobra en el cruce
+            if n == 1:
+                return cruce
+            n -= 1
+    # n-ésima medianoche posterior a `desde`
+    local = datetime.fromtimestamp(desde)
+    dia = datetime(local.year, local.month, local.day) + timedelta(days=n)
+    return dia.timestamp()
+
+
+def fuga(estado, inicio):
+    """
+    Instante en que, si nadie la atiende, se cumple la condición de fuga de
+    check_limites() (o `inicio` si ya se cumple). None si no llega a pasar:
+    dormida o congelada, solo la penalización nocturna baja el afecto.
+    """
+    afecto = estado["afecto"]
+    maltrato = estado.get("maltrato_acumulado", 0)
+    if afecto < FUGA_AFECTO or maltrato > FUGA_MALTRATO:
+        return inicio
+    if estado.get("congelado", False) or estado["estado_dormido"]:
+        return None
+    noches = min(math.floor((afecto - FUGA_AFECTO) / PENALIZACION_NOCTURNA),
+                 math.floor((FUGA_MALTRATO - maltrato) / PENALIZACION_NOCTURNA)) + 1
+    return _noche_n(inicio, _cruce(estado["energia"], inicio), noches)
+
+
+def cruces(estado, inicio, umbrales=UMBRALES):
+    """
+    Cuándo cruza cada umbral de hambre y energía (y cuándo se iría de casa)
+    un `estado` guardado en `inicio`, sin que nadie la atienda. Lista de
+    (instante, clave, umbral) ordenada por instante; clave es "hambre",
+    "energia" o "fuga". Los cruces que ya pasaron salen con instante <= inicio.
+    Es lo mismo que avanzar() pero despejando el tiempo: las tasas son constantes.
+    """
+    if estado.get("congelado", False):
+        return []
+    if estado["estado_dormido"]:
+        tasas = {"hambre": HAMBRE_DORMIDO}
+    else:
+        tasas = {"hambre": HAMBRE_DESPIERTO, "energia": -ENERGIA_DESPIERTO}
+    eventos = []
+    for clave, tasa in tasas.items():
+        for umbral in umbrales:
+            eventos.append((inicio + (estado[clave] - umbral) / tasa * 3600, clave, umbral))
+    t = fuga(estado, inicio)
+    if t is not None:
+        eventos.append((t, "fuga", None))
+    eventos.sort(key=lambda e: e[0])
+    return eventos
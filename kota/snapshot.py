@@ -0,0 +1,114 @@
+"""
+Instantánea de estado (sidecar) para el monitor de terminal.
+
++KOTA.py la escribe junto al guardado en cada guardar_datos(); contiene solo
+los campos escalares que necesita +KOTA_STATUS.py, en un bloque binario de
+tamaño fijo, así que leerla cuesta lo mismo tenga el historial 10 o 10 millones
+de eventos.
+"""
+
+import os
+import struct
+
+from kota import archivo
+
+VERSION = 2
+_MAGIC = b"KSNP"
+
+# magic, versión, dormido, congelado, hambre, energia, afecto, estres,
+# privacion_sueno, maltrato_psicologico, ultima_conexion, mtime_ns y tamaño
+# del guardado, status, nombre
+_FORMATO = struct.Struct("<4sB??xdddddddqq16s64s")
+TAMANO = _FORMATO.size
+
+
+def ruta_snapshot(ruta_guardado):
+    return os.path.splitext(ruta_guardado)[0] + ".snap"
+
+
+def _texto(valor, largo):
+    crudo = str(valor).encode("utf-8")[:largo]
+    # No cortar un carácter multibyte a la mitad
+    return crudo.decode("utf-8", "ignore").encode("utf-8")
+
+
+def campos(data):
+    """Extrae del guardado completo los mismos campos que guarda la instantánea."""
+    p = data.get("personalidad", {})
+    return {
+        "nombre": data.get("nombre", "Mascota"),
+        "hambre": float(data.get("hambre", 100)),
+        "energia": float(data.get("energia", 100)),
+        "afecto": float(data.get("afecto", 0)),
+        "estres": float(p.get("estres", 0)),
+        "privacion_sueno": float(p.get("privacion_sueno", 0)),
+        "maltrato_psicologico": float(p.get("maltrato_psicologico", 0)),
+        "status": data.get("status", "vivo"),
+        "estado_dormido": bool(data.get("estado_dormido", False)),
+        "congelado": bool(data.get("congelado", False)),
+        "ultima_conexion": float(data.get("ultima_conexion", 0)),
+    }
+
+
+def escribir(ruta_guardado, data):
+    """Escribe la instantánea de `data`, ligada al guardado tal como está en disco."""
+    st = os.stat(ruta_guardado)
+    c = campos(data)
+    bloque = _FORMATO.pack(
+        _MAGIC, VERSION,
+        c["estado_dormido"], c["congelado"],
+        c["hambre"], c["energia"], c["afecto"], c["estres"],
+        c["privacion_sueno"], c["maltrato_psicologico"],
+        c["ultima_conexion"],
+        st.st_mtime_ns, st.st_size,
+        _texto(c["status"], 16),
+        _texto(c["nombre"], 64),
+    )
+    # Es una caché: si se pierde en un corte, el monitor lee el guardado
+    archivo.escribir_atomico(ruta_snapshot(ruta_guardado), bloque, sincronizar=False)
+
+
+def leer(ruta_guardado):
+    """
+    Devuelve un dict con los campos escalares, o None si la instantánea
+    falta, está corrupta o no corresponde a la versión actual del guardado.
+    """
+    try:
+        with open(ruta_snapshot(ruta_guardado), "rb") as f:
+            bloque = f.read(TAMANO + 1)
+        st = os.stat(ruta_guardado)
+    except OSError:
+        return None
+    if len(bloque) != TAMANO:
+        return None
+
+    (magic, version, dormido, congelado, hambre, energia, afecto, estres,
+     privacion_sueno, maltrato_psicologico, ultima_conexion, mtime_ns, tamano,
+     status, nombre) = _FORMATO.unpack(bloque)
+    if magic != _MAGIC or version != VERSION:
+        return None
+    # El guardado cambió después de escribir la instantánea (otra versión
+    # del programa, edición manual...): está obsoleta.
+    if mtime_ns != st.st_mtime_ns or tamano != st.st_size:
+        return None
+
+    return {
+        "nombre": nombre.rstrip(b"\0").decode("utf-8", "replace"),
+        "hambre": hambre,
+        "energia": energia,
+        "afecto": afecto,
+        "estres": estres,
+        "privacion_sueno": privacion_sueno,
+        "maltrato_psicologico": maltrato_psicologico,
+        "status": status.rstrip(b"\0").decode("utf-8", "replace"),
+        "estado_dormido": dormido,
+        "congelado": congelado,
+        "ultima_conexion": ultima_conexion,
+    }
+
+
+def borrar(ruta_guardado):
+    try:
+        os.remove(ruta_snapshot(ruta_guardado))
+    except OSError:
+        pass
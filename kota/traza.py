@@ -0,0 +1,216 @@
+"""
+Trazas por fase de los comandos de +KOTA (opcional).
+
+Con KOTA_TRACE=1 (o `kota --trace <comando>`) cada proceso añade una línea a
+kota_trace.jsonl al terminar:
+
+    {"t": 1716.., "comando": "alimentar", "almacen": "json", "total_ms": 41.2,
+     "fases": {"importar": {"ms": 9.8, "n": 1, "leidos": 61234, "escritos": 0,
+                            "guardado": 22585}, "cargar": {...}, ...}}
+
+Fases: importar (desde la primera línea de +KOTA.py), cargar, procesar
+(tiempo offline), comando, pantalla y guardar. El tiempo de una fase no
+incluye el de las fases anidadas (la pantalla dentro del comando), así que
+las fases suman casi el total. Los bytes salen de /proc/self/io (todo lo que
+leyó o escribió el proceso, terminal incluida; en importar, desde que
+arrancó el intérprete); donde no existe quedan en 0. `guardado` es el tamaño
+en disco del guardado al cerrar la fase.
+
+KOTA_TRACE también puede ser la ruta del archivo de trazas. `kota trace
+summary` las resume por comando y fase. Desactivado, cada punto de medida
+cuesta una comparación.
+"""
+
+import math
+import os
+import time
+
+ARCHIVO = "kota_trace.jsonl"
+FASES = ("importar", "cargar", "procesar", "comando", "pantalla", "guardar")
+
+_activa = False
+_ruta = ARCHIVO
+_tamano = None
+_comando = None
+_inicio = 0.0
+_fases = {}
+# Fases abiertas: [nombre, t0, leídos0, escritos0, ms_hijos, leídos_hijos, escritos_hijos]
+_pila = []
+# /proc/self/io cuenta también lo que se lee de él mismo
+_leidos_propios = 0
+_hay_proc = True
+
+
+def ruta_env():
+    """Archivo de trazas según KOTA_TRACE, o None si está desactivado."""
+    valor = os.environ.get("KOTA_TRACE", "")
+    if valor in ("", "0"):
+        return None
+    return ARCHIVO if valor == "1" else valor
+
+
+def activa():
+    return _activa
+
+
+def _io():
+    global _leidos_propios, _hay_proc
+    if not _hay_proc:
+        return 0, 0
+    try:
+        with open("/proc/self/io", "rb") as f:
+            contenido = f.read()
+    except OSError:
+        _hay_proc = False
+        return 0, 0
+    campos = dict(linea.split(b": ") for linea in contenido.splitlines())
+    # rchar todavía no incluye esta lectura, sí las anteriores
+    leidos = int(campos[b"rchar"]) - _leidos_propios
+    _leidos_propios += len(contenido)
+    return leidos, int(campos[b"wchar"])
+
+
+def activar(comando, desde, ruta=ARCHIVO, tamano=None):
+    """
+    Empieza a trazar `comando`. `desde` es el perf_counter() de la primera
+    línea del script (fase importar); tamano() da el tamaño del guardado.
+    """
+    global _activa, _ruta, _tamano, _comando, _inicio
+    _activa, _ruta, _tamano, _comando, _inicio = True, ruta, tamano, comando, desde
+    _fases.clear()
+    del _pila[:]
+    leidos, escritos = _io()
+    # Sin tamaño del guardado: mirarlo ahora importaría los módulos del
+    # guardado fuera de toda fase
+    _sumar("importar", time.perf_counter() - desde, leidos, escritos, guardado=False)
+
+
+def _sumar(nombre, segundos, leidos, escritos, guardado=True):
+    fase = _fases.get(nombre)
+    if fase is None:
+        fase = _fases[nombre] = {"ms": 0.0, "n": 0, "leidos": 0, "escritos": 0}
+    fase["ms"] += segundos * 1000
+    fase["n"] += 1
+    fase["leidos"] += leidos
+    fase["escritos"] += escritos
+    if guardado and _tamano is not None:
+        fase["guardado"] = _tamano()
+
+
+def _empezar(nombre):
+    leidos, escritos = _io()
+    _pila.append([nombre, time.perf_counter(), leidos, escritos, 0.0, 0, 0])
+
+
+def _terminar():
+    nombre, t0, leidos0, escritos0, ms_h, leidos_h, escritos_h = _pila.pop()
+    segundos = time.perf_counter() - t0
+    leidos, escritos = _io()
+    leidos, escritos = leidos - leidos0, escritos - escritos0
+    if _pila:
+        padre = _pila[-1]
+        padre[4] += segundos
+        padre[5] += leidos
+        padre[6] += escritos
+    _sumar(nombre, segundos - ms_h, leidos - leidos_h, escritos - escritos_h)
+
+
+class fase:
+    """with traza.fase("comando"): ... (no hace nada si no se traza)."""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        if _activa:
+            _empezar(self.nombre)
+
+    def __exit__(self, *exc):
+        if _activa:
+            _terminar()
+
+
+def medir(nombre):
+    """Decorador: cada llamada a la función cuenta como una fase `nombre`."""
+    def decorador(funcion):
+        def medida(*args, **kwargs):
+            if not _activa:
+                return funcion(*args, **kwargs)
+            _empezar(nombre)
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                _terminar()
+        medida.__name__ = funcion.__name__
+        medida.__doc__ = funcion.__doc__
+        medida.__wrapped__ = funcion
+        return medida
+    return decorador
+
+
+def cerrar(almacen=None):
+    """Añade el registro del proceso al archivo de trazas (una sola escritura)."""
+    global _activa
+    if not _activa:
+        return
+    _activa = False
+    total = time.perf_counter() - _inicio
+    import json
+
+    for f in _fases.values():
+        f["ms"] = round(f["ms"], 3)
+    registro = {
+        "t": time.time(), "comando": _comando, "almacen": almacen,
+        "total_ms": round(total * 1000, 3), "fases": _fases,
+    }
+    linea = (json.dumps(registro) + "\n").encode("utf-8")
+    # O_APPEND: las líneas de procesos simultáneos no se mezclan
+    fd = os.open(_ruta, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, linea)
+    finally:
+        os.close(fd)
+
+
+# ==========================================================
+# RESUMEN
+# ==========================================================
+def percentil(orden, q):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    return orden[max(0, min(len(orden) - 1, math.ceil(q * len(orden)) - 1))]
+
+
+def leer(ruta=ARCHIVO):
+    import json
+
+    registros = []
+    with open(ruta, encoding="utf-8") as f:
+        for linea in f:
+            try:
+                registros.append(json.loads(linea))
+            except ValueError:
+                # Línea cortada (proceso muerto a mitad de escritura)
+                continue
+    return registros
+
+
+def resumir(registros):
+    """
+    {comando: {"n": .., "total": [ms...], "fases": {fase: {"ms": [...],
+    "leidos": [...], "escritos": [...], "guardado": [...]}}}}
+    """
+    resumen = {}
+    for r in registros:
+        c = resumen.setdefault(r.get("comando"), {"n": 0, "total": [], "fases": {}})
+        c["n"] += 1
+        c["total"].append(r.get("total_ms", 0))
+        for nombre, f in r.get("fases", {}).items():
+            serie = c["fases"].setdefault(nombre, {"ms": [], "leidos": [], "escritos": [], "guardado": []})
+            for clave in serie:
+                if clave in f:
+                    serie[clave].append(f[clave])
+    return resumen
+
+
+def orden_fases(fases):
+    return sorted(fases, key=lambda f: (FASES.index(f) if f in FASES else len(FASES), f))
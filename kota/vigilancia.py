@@ -0,0 +1,102 @@
+"""
+Espera sin sondeo para `kota vigilar`.
+
+Observador(directorio, nombres).esperar(segundos) bloquea hasta que pasen
+`segundos` o cambie alguno de los archivos `nombres` del directorio del
+guardado, lo que ocurra antes. En Linux usa inotify (vía ctypes, sin
+dependencias): entre eventos el proceso no gasta CPU y los cambios de otros
+archivos del directorio no lo despiertan. Donde no hay inotify se despierta
+cada SONDEO segundos para que quien llama compare la firma del guardado.
+"""
+
+import os
+import select
+import struct
+import time
+
+SONDEO = 30.0
+
+# linux/inotify.h
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+# Los guardados se reemplazan con rename (archivo.escribir_atomico): se
+# vigila el directorio, no el archivo, que cambia de inodo en cada guardado
+MASCARA = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+# struct inotify_event: wd, mask, cookie, len; después `len` bytes de nombre
+EVENTO = struct.Struct("iIII")
+
+
+def _inotify(directorio):
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(directorio), MASCARA) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _nombres(datos):
+    """Nombres de archivo de los eventos leídos de inotify."""
+    i = 0
+    while i + EVENTO.size <= len(datos):
+        largo = EVENTO.unpack_from(datos, i)[3]
+        i += EVENTO.size
+        yield os.fsdecode(datos[i:i + largo].rstrip(b"\0"))
+        i += largo
+
+
+class Observador:
+    def __init__(self, directorio, nombres=None):
+        """nombres: archivos del directorio que interesan (None: cualquiera)."""
+        self.fd = _inotify(directorio)
+        self.nombres = None if nombres is None else set(nombres)
+
+    @property
+    def inotify(self):
+        return self.fd is not None
+
+    def esperar(self, segundos=None):
+        """
+        Duerme hasta `segundos` (None: sin límite). Devuelve True si puede que
+        haya cambiado algo (hay que mirar la firma), False si solo pasó el tiempo.
+        """
+        if segundos is not None:
+            segundos = max(0.0, segundos)
+        if self.fd is None:
+            if segundos is None or segundos > SONDEO:
+                time.sleep(SONDEO)
+                return True
+            time.sleep(segundos)
+            return False
+        limite = None if segundos is None else time.monotonic() + segundos
+        while True:
+            espera = None if limite is None else max(0.0, limite - time.monotonic())
+            if not select.select([self.fd], [], [], espera)[0]:
+                return False
+            # Vaciar la cola: basta con saber si tocó alguno de los nuestros
+            cambio = False
+            try:
+                while True:
+                    datos = os.read(self.fd, 65536)
+                    if not datos:
+                        break
+                    if self.nombres is None or not self.nombres.isdisjoint(_nombres(datos)):
+                        cambio = True
+            except BlockingIOError:
+                pass
+            if cambio:
+                return True
+
+    def cerrar(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None